@@ -0,0 +1,216 @@
+"""Vectorized detection of records that only contain private IP addresses."""
+
+import ipaddress
+from collections.abc import Iterable, Sequence
+
+import numpy
+import pandas
+
+# Same ranges as `ipaddress.IPv4Address.is_private`
+PRIVATE_IPV4_NETWORKS = (
+    "0.0.0.0/8",
+    "10.0.0.0/8",
+    "127.0.0.0/8",
+    "169.254.0.0/16",
+    "172.16.0.0/12",
+    "192.0.0.0/29",
+    "192.0.0.170/31",
+    "192.0.2.0/24",
+    "192.168.0.0/16",
+    "198.18.0.0/15",
+    "198.51.100.0/24",
+    "203.0.113.0/24",
+    "240.0.0.0/4",
+    "255.255.255.255/32",
+)
+
+_OCTET = r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+IPV4_PATTERN = rf"{_OCTET}\.{_OCTET}\.{_OCTET}\.{_OCTET}"
+
+
+def _to_ranges(networks: Iterable[ipaddress.IPv4Network]) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Convert IPv4 networks to arrays of first and last addresses as integers.
+
+    Args:
+        networks: Iterable[ipaddress.IPv4Network]
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    bounds = [(int(network.network_address), int(network.broadcast_address)) for network in networks]
+
+    return (
+        numpy.array([start for start, _ in bounds], dtype=numpy.uint32),
+        numpy.array([end for _, end in bounds], dtype=numpy.uint32),
+    )
+
+
+class PrivateIpFilter:
+    """
+    Detect, for a whole batch of records at once, the records in which all the IP addresses are private.
+
+    IPv4 addresses are converted to integers and tested against precomputed ranges with vector operations.
+    The less common IPv6 addresses are tested one by one.
+
+    The private ranges can be customized:
+    - `excluded_cidrs` are additional ranges considered as private (records with only such IPs are dropped)
+    - `included_cidrs` are ranges never considered as private, even if they belong to a private range
+    """
+
+    def __init__(self, included_cidrs: Sequence[str] = (), excluded_cidrs: Sequence[str] = ()) -> None:
+        """
+        Initialize PrivateIpFilter.
+
+        Args:
+            included_cidrs: Sequence[str]
+            excluded_cidrs: Sequence[str]
+        """
+        included = [ipaddress.ip_network(cidr, strict=False) for cidr in included_cidrs]
+        excluded = [ipaddress.ip_network(cidr, strict=False) for cidr in excluded_cidrs]
+
+        self._private_v4 = _to_ranges(
+            [ipaddress.IPv4Network(cidr) for cidr in PRIVATE_IPV4_NETWORKS]
+            + [network for network in excluded if isinstance(network, ipaddress.IPv4Network)]
+        )
+        self._included_v4 = _to_ranges([network for network in included if isinstance(network, ipaddress.IPv4Network)])
+        self._excluded_v6 = [network for network in excluded if isinstance(network, ipaddress.IPv6Network)]
+        self._included_v6 = [network for network in included if isinstance(network, ipaddress.IPv6Network)]
+
+    @staticmethod
+    def _in_ranges(values: numpy.ndarray, ranges: tuple[numpy.ndarray, numpy.ndarray]) -> numpy.ndarray:
+        """
+        Test which values belong to at least one of the ranges.
+
+        Args:
+            values: numpy.ndarray
+            ranges: tuple[numpy.ndarray, numpy.ndarray]
+
+        Returns:
+            numpy.ndarray: array of booleans
+        """
+        starts, ends = ranges
+        result = numpy.zeros(len(values), dtype=bool)
+        for start, end in zip(starts, ends):
+            result |= (values >= start) & (values <= end)
+
+        return result
+
+    def _ipv4_public_mask(self, octets: pandas.DataFrame) -> numpy.ndarray:
+        """
+        Test which IPv4 addresses, given as four octet columns, are public.
+
+        Args:
+            octets: pandas.DataFrame
+
+        Returns:
+            numpy.ndarray: array of booleans
+        """
+        values = octets.astype(numpy.uint32).to_numpy()
+        addresses = (values[:, 0] << 24) | (values[:, 1] << 16) | (values[:, 2] << 8) | values[:, 3]
+
+        return ~self._in_ranges(addresses, self._private_v4) | self._in_ranges(addresses, self._included_v4)
+
+    def _is_public_ipv6(self, value: str) -> bool:
+        """
+        Test if the value is a public IPv6 address. Values that are not IPv6 addresses are not public.
+
+        Args:
+            value: str
+
+        Returns:
+            bool:
+        """
+        try:
+            address = ipaddress.IPv6Address(value)
+        except ValueError:
+            return False
+
+        if any(address in network for network in self._included_v6):
+            return True
+
+        return not (address.is_private or any(address in network for network in self._excluded_v6))
+
+    def _public_mask(self, values: pandas.Series) -> numpy.ndarray:
+        """
+        Test which values are public IP addresses. Values that are not IP addresses are not public.
+
+        The same addresses are repeated a lot in flow logs, so each distinct value is tested only once.
+
+        Args:
+            values: pandas.Series
+
+        Returns:
+            numpy.ndarray: array of booleans
+        """
+        codes, uniques = pandas.factorize(values.astype("string"))
+        uniques = pandas.Series(uniques, dtype="string")
+        unique_result = numpy.zeros(len(uniques) + 1, dtype=bool)
+
+        ipv4_octets = uniques.str.extract(f"^{IPV4_PATTERN}$")
+        is_ipv4 = ipv4_octets[0].notna().to_numpy()
+        if is_ipv4.any():
+            unique_result[:-1][is_ipv4] = self._ipv4_public_mask(ipv4_octets[is_ipv4])
+
+        is_ipv6 = uniques.str.contains(":", regex=False).fillna(False).to_numpy(dtype=bool)
+        if is_ipv6.any():
+            unique_result[:-1][is_ipv6] = [self._is_public_ipv6(value) for value in uniques[is_ipv6]]
+
+        # missing values are coded -1 and map to the last item, always False
+        return unique_result[codes]
+
+    def private_only_rows(self, df: pandas.DataFrame, columns: Sequence[str]) -> numpy.ndarray:
+        """
+        Find the rows of the dataframe where the given columns contain no public IP address.
+
+        Missing columns and values that are not IP addresses are ignored.
+
+        Args:
+            df: pandas.DataFrame
+            columns: Sequence[str]
+
+        Returns:
+            numpy.ndarray: array of booleans, one per row
+        """
+        has_public = numpy.zeros(len(df), dtype=bool)
+        for column in columns:
+            if column in df.columns:
+                has_public |= self._public_mask(df[column])
+
+        return ~has_public
+
+    def private_only_lines(self, lines: Sequence[str], separator: str = " ") -> numpy.ndarray:
+        """
+        Find the lines where no token, split by the separator, is a public IP address.
+
+        Tokens that are not IP addresses are ignored.
+
+        Args:
+            lines: Sequence[str]
+            separator: str
+
+        Returns:
+            numpy.ndarray: array of booleans, one per line
+        """
+        if len(lines) == 0:
+            return numpy.zeros(0, dtype=bool)
+
+        tokens = pandas.Series(lines, dtype="string").str.split(separator).explode()
+        tokens = tokens[tokens.str.contains(r"^(?:\d|[0-9A-Fa-f:.]*:)", regex=True).fillna(False)]
+
+        public_rows = tokens.index.to_numpy()[self._public_mask(tokens)]
+
+        return numpy.bincount(public_rows, minlength=len(lines)) == 0
+
+    def is_private_only(self, line: str, separator: str = " ") -> bool:
+        """
+        Test if a single line contains no public IP address.
+
+        Args:
+            line: str
+            separator: str
+
+        Returns:
+            bool:
+        """
+        return bool(self.private_only_lines([line], separator)[0])
@@ -0,0 +1,88 @@
+"""Columnar conversion of Parquet content to NDJSON records."""
+
+import asyncio
+import re
+from collections.abc import AsyncGenerator, Iterator
+from typing import IO
+
+import pandas
+import pyarrow.parquet
+
+DEFAULT_BATCH_SIZE = 65536
+
+# pandas escapes the forward slashes: unescape them, unless the backslash is itself escaped
+_ESCAPED_SLASH = re.compile(r"(\\+)/")
+
+
+def _unescape_slash(match: re.Match[str]) -> str:
+    """
+    Remove the escaping backslash before a slash, if any.
+
+    Args:
+        match: re.Match[str]
+
+    Returns:
+        str:
+    """
+    backslashes = match.group(1)
+    if len(backslashes) % 2 == 1:
+        backslashes = backslashes[:-1]
+
+    return f"{backslashes}/"
+
+
+def dataframe_to_ndjson(df: pandas.DataFrame) -> list[str]:
+    """
+    Serialize each row of the dataframe to a JSON record, column by column, without building a dict per row.
+
+    Args:
+        df: pandas.DataFrame
+
+    Returns:
+        list[str]:
+    """
+    if df.empty or len(df.columns) == 0:
+        return []
+
+    content = df.to_json(orient="records", lines=True, force_ascii=False, double_precision=15)
+    if "\\/" in content:
+        content = _ESCAPED_SLASH.sub(_unescape_slash, content)
+
+    # do not use `splitlines`: unicode line separators may be kept unescaped in JSON strings
+    return [record for record in content.split("\n") if record]
+
+
+def _iter_batches(source: IO[bytes], batch_size: int) -> Iterator[pandas.DataFrame]:
+    """
+    Iterate over the Parquet content by batches of rows, one row group after the other.
+
+    Args:
+        source: IO[bytes]
+        batch_size: int
+
+    Yields:
+        pandas.DataFrame:
+    """
+    parquet_file = pyarrow.parquet.ParquetFile(source)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield batch.to_pandas()
+
+
+async def iter_parquet_batches(
+    source: IO[bytes], batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncGenerator[pandas.DataFrame, None]:
+    """
+    Iterate over the Parquet content by batches of rows, so only one batch is kept in memory.
+
+    The batches are decoded in a worker thread to not block the event loop.
+
+    Args:
+        source: IO[bytes]: seekable Parquet content
+        batch_size: int
+
+    Yields:
+        pandas.DataFrame:
+    """
+    batches = _iter_batches(source, batch_size)
+    while (df := await asyncio.to_thread(next, batches, None)) is not None:
+        yield df
@@ -1,16 +1,13 @@
 """Aws s3 wrapper."""
 
-import asyncio
-import io
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from aiofiles.threadpool.binary import AsyncBufferedReader
 from loguru import logger
 from pydantic.v1 import Field
 from sekoia_automation.aio.helpers.aws.client import AwsClient, AwsConfiguration
 
-from aws_helpers.utils import AsyncReader, async_gzip_open, is_gzip_compressed
+from aws_helpers.utils import AsyncReader, AsyncStreamingReader
 
 
 class S3Configuration(AwsConfiguration):
@@ -33,35 +30,29 @@ class S3Wrapper(AwsClient[S3Configuration]):
         super().__init__(configuration)
 
     @asynccontextmanager
-    async def read_key(
-        self, key: str, bucket: str | None = None, loop: asyncio.AbstractEventLoop | None = None
-    ) -> AsyncGenerator[AsyncReader, None]:
+    async def read_key(self, key: str, bucket: str | None = None) -> AsyncGenerator[AsyncReader, None]:
         """
         Reads text file from S3 bucket.
 
+        The object is streamed: its body is read and, if gzip compressed, decompressed chunk by chunk
+        as the reader is consumed.
+
         Args:
             key: str
             bucket: str | None: if not provided, then use default bucket from configuration
 
         Yields:
-            str:
+            AsyncReader:
         """
         bucket = bucket or self._configuration.bucket
 
-        if loop is None:
-            loop = asyncio.get_running_loop()
-
         logger.info(f"Reading object {key} from bucket {bucket}")
 
         async with self.get_client("s3") as s3:
             response = await s3.get_object(Bucket=bucket, Key=key)
             async with response["Body"] as stream:
-                with io.BytesIO(await stream.read()) as content:
-                    if is_gzip_compressed(content.getbuffer()):
-                        async_reader = await async_gzip_open(content, loop=loop)
-                    else:
-                        async_reader = AsyncBufferedReader(content, loop=loop, executor=None)
-                    try:
-                        yield async_reader
-                    finally:
-                        await async_reader.close()
+                async_reader = AsyncStreamingReader(stream)
+                try:
+                    yield async_reader
+                finally:
+                    await async_reader.close()
@@ -1,9 +1,14 @@
 import asyncio
+import codecs
 import gzip
+import json
+import tempfile
+import zlib
 from abc import abstractmethod
+from collections.abc import AsyncGenerator
 from concurrent.futures import Executor
 from functools import partial
-from typing import Any, BinaryIO, Protocol
+from typing import IO, Any, BinaryIO, Protocol
 from urllib.parse import unquote
 
 from aiofiles.threadpool.binary import AsyncBufferedReader
@@ -60,6 +65,266 @@ class AsyncReader(Protocol):
         return NotImplemented
 
 
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncStreamingReader:
+    """
+    Async reader that decompresses a body incrementally, chunk by chunk, as it arrives.
+
+    Gzip compression is detected from the magic number of the first chunk. Concatenated gzip members
+    are supported. Content that is not compressed is returned as is.
+    """
+
+    def __init__(self, body: AsyncReader, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initialize AsyncStreamingReader.
+
+        Args:
+            body: AsyncReader: the raw body, e.g. the `Body` of a S3 `get_object` response
+            chunk_size: int
+        """
+        self._body = body
+        self._chunk_size = chunk_size
+        self._decompressor: Any = None
+        self._is_compressed: bool | None = None
+        self._buffer = bytearray()
+        self._body_exhausted = False
+
+    async def _read_raw_chunk(self) -> bytes:
+        """
+        Read the next raw chunk from the body and decompress it if necessary.
+
+        Returns:
+            bytes: may be empty while the body is not exhausted
+        """
+        raw = await self._body.read(self._chunk_size)
+        if not raw:
+            self._body_exhausted = True
+            if self._decompressor is not None:
+                return bytes(self._decompressor.flush())
+
+            return b""
+
+        if self._is_compressed is None:
+            self._is_compressed = is_gzip_compressed(raw)
+
+        if not self._is_compressed:
+            return bytes(raw)
+
+        result = bytearray()
+        data = bytes(raw)
+        while data:
+            if self._decompressor is None:
+                self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
+            result += self._decompressor.decompress(data)
+            if not self._decompressor.eof:
+                break
+
+            # the gzip member is complete: the remaining bytes belong to the next member
+            data = self._decompressor.unused_data
+            self._decompressor = None
+
+        return bytes(result)
+
+    async def read(self, size: int = -1, /) -> bytes:
+        """
+        Read up to `size` decompressed bytes. Read the whole remaining content if `size` is negative.
+
+        Args:
+            size: int
+
+        Returns:
+            bytes: empty once the content is exhausted
+        """
+        while not self._body_exhausted and (size < 0 or len(self._buffer) < size):
+            self._buffer += await self._read_raw_chunk()
+
+        if size < 0 or size >= len(self._buffer):
+            result = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            result = bytes(self._buffer[:size])
+            del self._buffer[:size]
+
+        return result
+
+    async def close(self) -> None:
+        """Release the buffered content."""
+        self._buffer.clear()
+
+
+async def iter_chunks(stream: AsyncReader, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncGenerator[bytes, None]:
+    """
+    Iterate over the content of the stream by chunks.
+
+    Args:
+        stream: AsyncReader
+        chunk_size: int
+
+    Yields:
+        bytes:
+    """
+    while chunk := await stream.read(chunk_size):
+        yield chunk
+
+
+async def iter_lines(
+    stream: AsyncReader, separator: str = "\n", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncGenerator[str, None]:
+    """
+    Iterate over the records of the stream split by the separator, without loading the whole content.
+
+    Empty records are skipped.
+
+    Args:
+        stream: AsyncReader
+        separator: str
+        chunk_size: int
+
+    Yields:
+        str:
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    remaining = ""
+
+    async for chunk in iter_chunks(stream, chunk_size):
+        remaining += decoder.decode(chunk)
+        *records, remaining = remaining.split(separator)
+        for record in records:
+            if len(record) > 0:
+                yield record
+
+    remaining += decoder.decode(b"", final=True)
+    for record in remaining.split(separator):
+        if len(record) > 0:
+            yield record
+
+
+async def iter_json_array(
+    stream: AsyncReader, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncGenerator[Any, None]:
+    """
+    Iterate over the items of the array stored under `key` of the top-level JSON object of the stream.
+
+    Items are decoded one at a time, so only one item (plus one chunk) is kept in memory.
+    Nothing is yielded if the content is empty or if the key is missing.
+
+    Args:
+        stream: AsyncReader
+        key: str
+        chunk_size: int
+
+    Yields:
+        Any:
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    async def fill() -> bool:
+        """Append the next chunk to the buffer. Return False once the stream is exhausted."""
+        nonlocal buffer, position, exhausted
+        if exhausted:
+            return False
+
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            exhausted = True
+            buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+
+        position = 0
+        return True
+
+    async def next_token() -> str | None:
+        """Skip whitespaces and return the next significant character without consuming it."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+
+            if position < len(buffer):
+                return buffer[position]
+
+            if not await fill():
+                return None
+
+    async def decode_value() -> Any:
+        """Decode the JSON value starting at the current position."""
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # a value ending with the buffer may be truncated (e.g. numbers)
+                if end < len(buffer) or exhausted:
+                    position = end
+                    return value
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+
+            await fill()
+
+    if await next_token() != "{":
+        return
+
+    position += 1
+    while (token := await next_token()) not in ("}", None):
+        if token == ",":
+            position += 1
+            continue
+
+        name = await decode_value()
+        if await next_token() != ":":
+            raise ValueError("Invalid JSON content: missing colon after the object key")
+
+        position += 1
+        if name != key:
+            await next_token()
+            await decode_value()
+            continue
+
+        if await next_token() != "[":
+            return
+
+        position += 1
+        while (token := await next_token()) not in ("]", None):
+            if token == ",":
+                position += 1
+                continue
+
+            yield await decode_value()
+
+        return
+
+
+async def spool_stream(stream: AsyncReader, max_size: int = 64 * DEFAULT_CHUNK_SIZE) -> IO[bytes]:
+    """
+    Copy the stream into a spooled temporary file.
+
+    The content stays in memory up to `max_size` bytes and is written to disk beyond.
+    Useful for formats, such as Parquet, that need random access to the content.
+
+    Args:
+        stream: AsyncReader
+        max_size: int
+
+    Returns:
+        IO[bytes]: the spooled file, positioned at its beginning. The caller is responsible for closing it.
+    """
+    spooled_file = tempfile.SpooledTemporaryFile(max_size=max_size)
+    async for chunk in iter_chunks(stream):
+        spooled_file.write(chunk)
+
+    spooled_file.seek(0)
+    return spooled_file
+
+
 # mypy: ignore-errors
 async def async_gzip_open(
     file: BinaryIO,
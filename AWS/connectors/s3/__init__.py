@@ -1,5 +1,6 @@
 """Package for all s3 connectors impl."""
 
+import asyncio
 import os
 from abc import ABCMeta
 from asyncio import BoundedSemaphore
@@ -36,6 +37,7 @@ class AbstractAwsS3QueuedConnector(AbstractAwsConnector, metaclass=ABCMeta):
         self.sqs_visibility_timeout = int(os.getenv("AWS_SQS_VISIBILITY_TIMEOUT", 60))
         self.s3_max_fetch_concurrency = int(os.getenv("AWS_S3_MAX_CONCURRENCY_FETCH", 10000))
         self.s3_fetch_concurrency_sem = BoundedSemaphore(self.s3_max_fetch_concurrency)
+        self.records_queue_size = int(os.getenv("AWS_RECORDS_QUEUE_SIZE", self.limit_of_events_to_push))
 
     def _parse_content(self, stream: AsyncReader) -> AsyncGenerator[str, None]:  # pragma: no cover
         """
@@ -63,12 +65,64 @@ class AbstractAwsS3QueuedConnector(AbstractAwsConnector, metaclass=ABCMeta):
             "object", {}
         ).get("key")
 
+    async def _fetch_object_records(self, notification: dict[str, Any], queue: asyncio.Queue[str | None]) -> None:
+        """
+        Read the S3 object referenced by the notification and put its records into the queue.
+
+        The read is bounded by `s3_fetch_concurrency_sem`. Errors are logged and never propagated,
+        so that one failing object does not interrupt the others.
+
+        Args:
+            notification: dict[str, Any]
+            queue: asyncio.Queue[str | None]
+        """
+        try:
+            s3_bucket, s3_key = self._get_object_from_notification(notification)
+
+            if s3_bucket is None:
+                raise ValueError("Bucket is undefined", notification)
+
+            if s3_key is None:
+                raise ValueError("Key is undefined", notification)
+
+            normalized_key = normalize_s3_key(s3_key)
+
+            stream: AsyncReader
+            async with (
+                self.s3_fetch_concurrency_sem,
+                self.s3_wrapper.read_key(bucket=s3_bucket, key=normalized_key) as stream,
+            ):
+                async for event in self._parse_content(stream):
+                    await queue.put(event)
+
+        except Exception as e:
+            self.log(
+                message=f"Failed to fetch content of {notification}: {str(e)}",
+                level="warning",
+            )
+
+    @staticmethod
+    async def _close_queue_when_done(fetchers: list[asyncio.Task[None]], queue: asyncio.Queue[str | None]) -> None:
+        """
+        Wait for all fetchers to complete and then mark the end of the queue.
+
+        Args:
+            fetchers: list[asyncio.Task[None]]
+            queue: asyncio.Queue[str | None]
+        """
+        await asyncio.gather(*fetchers)
+        await queue.put(None)
+
     async def next_batch(self, previous_processing_end: float | None = None) -> tuple[int, list[int]]:
         """
         Get next batch of messages.
 
         Contains main logic of the connector.
 
+        The S3 objects referenced by the SQS messages are read concurrently (bounded by
+        `AWS_S3_MAX_CONCURRENCY_FETCH`) while the parsed records are forwarded through a bounded queue.
+        The SQS messages are released only once all their objects have been read and forwarded.
+
         Args:
             previous_processing_end: float | None
 
@@ -105,36 +159,26 @@ class AbstractAwsS3QueuedConnector(AbstractAwsConnector, metaclass=ABCMeta):
                     continue_receiving = False
 
                 INCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(message_records))
-                for record in message_records:
-                    try:
-                        s3_bucket, s3_key = self._get_object_from_notification(record)
-
-                        if s3_bucket is None:
-                            raise ValueError("Bucket is undefined", record)
-
-                        if s3_key is None:
-                            raise ValueError("Key is undefined", record)
-
-                        normalized_key = normalize_s3_key(s3_key)
-
-                        stream: AsyncReader
-                        async with (
-                            self.s3_fetch_concurrency_sem,
-                            self.s3_wrapper.read_key(bucket=s3_bucket, key=normalized_key) as stream,
-                        ):
-                            async for event in self._parse_content(stream):
-                                records.append(event)
-
-                                if len(records) >= self.limit_of_events_to_push:
-                                    continue_receiving = False
-                                    result += len(await self.push_data_to_intakes(events=records))
-                                    records = []
-
-                    except Exception as e:
-                        self.log(
-                            message=f"Failed to fetch content of {record}: {str(e)}",
-                            level="warning",
-                        )
+
+                queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self.records_queue_size)
+                fetchers = [
+                    asyncio.create_task(self._fetch_object_records(record, queue)) for record in message_records
+                ]
+                closer = asyncio.create_task(self._close_queue_when_done(fetchers, queue))
+
+                try:
+                    while (event := await queue.get()) is not None:
+                        records.append(event)
+
+                        if len(records) >= self.limit_of_events_to_push:
+                            continue_receiving = False
+                            result += len(await self.push_data_to_intakes(events=records))
+                            records = []
+
+                    await closer
+                finally:
+                    for task in [*fetchers, closer]:
+                        task.cancel()
 
             if not records:
                 continue_receiving = False
@@ -2,7 +2,7 @@
 
 import time
 from abc import ABCMeta, abstractmethod
-from collections.abc import Generator, Sequence
+from collections.abc import Generator, Iterable
 from functools import cached_property
 from pathlib import Path
 from threading import Event, Thread
@@ -78,6 +78,8 @@ class AwsS3Worker(Thread, metaclass=ABCMeta):  # pragma: no cover
         """
         Get the marker from the previous run
 
+        The workers resume the listing after this key, so the objects already processed are not listed again.
+
         Returns:
             str | None:
         """
@@ -107,17 +109,57 @@ class AwsS3Worker(Thread, metaclass=ABCMeta):  # pragma: no cover
 
         return paginator.paginate(**kwargs)
 
+    def _list_level(self, prefix: str | None) -> tuple[list[str], list[str]]:
+        """
+        List the keys and the sub-prefixes directly under the prefix.
+
+        Args:
+            prefix: str | None
+
+        Returns:
+            tuple[list[str], list[str]]: the keys of the non-empty objects and the sub-prefixes
+        """
+        kwargs = {"Bucket": self.bucket_name, "Delimiter": "/"}
+        if prefix:
+            kwargs["Prefix"] = prefix
+
+        keys: list[str] = []
+        sub_prefixes: list[str] = []
+        for response in self.client.get_paginator("list_objects_v2").paginate(**kwargs):
+            keys.extend(obj["Key"] for obj in response.get("Contents", []) if obj["Size"] > 0)
+            sub_prefixes.extend(item["Prefix"] for item in response.get("CommonPrefixes", []))
+
+        return keys, sub_prefixes
+
+    def _find_last_key(self, prefix: str | None) -> str | None:
+        """
+        Find the most recent key under the prefix, without listing all the keys.
+
+        Keys are partitioned by date (YYYY/MM/DD), so the most recent key is either a key directly under the prefix
+        or a key of the greatest non-empty sub-prefix: only one partition per level is listed.
+
+        Args:
+            prefix: str | None
+
+        Returns:
+            str | None:
+        """
+        keys, sub_prefixes = self._list_level(prefix)
+        last_key = max(keys, default=None)
+
+        for sub_prefix in sorted(sub_prefixes, reverse=True):
+            if (candidate := self._find_last_key(sub_prefix)) is not None:
+                return max(candidate, last_key or "")
+
+        return last_key
+
     def get_last_key(self, marker: str | None) -> str | None:
         """
         Return the last known key in the bucket
         """
-        pages = self._list_of_objects(marker)
-        last_key = self.marker
-        for response in pages:
-            keys = (obj["Key"] for obj in response.get("Contents", []) if obj["Size"] > 0)
-            for key in keys:
-                if last_key is None or key > last_key:
-                    last_key = key
+        last_key = self._find_last_key(self.prefix)
+        if marker is not None and (last_key is None or marker > last_key):
+            return marker
 
         return last_key
 
@@ -138,97 +180,92 @@ class AwsS3Worker(Thread, metaclass=ABCMeta):  # pragma: no cover
             list_of_objects = [obj["Key"] for obj in response.get("Contents", []) if obj["Size"] > 0]
             yield from list_of_objects
 
-    def _fetch_events(self, bucket_name: str, objects: Generator[str, None, None]) -> Generator[Any, None, None]:
+    def _fetch_events(self, bucket_name: str, objects: Iterable[str]) -> Generator[tuple[str, list[Any]], None, None]:
         """
         Fetch events from the list of objects as a generator
 
+        Objects that can't be read or parsed are logged and skipped, with no events.
+
         Args:
             bucket_name: str
-            objects: Generator[str, None, None]
+            objects: Iterable[str]
 
         Yields:
-            Any:
+            tuple[str, list[Any]]: the key of each object and its events
         """
         for key in objects:
-            content = self._read_object(bucket_name, key)
+            try:
+                content = self._read_object(bucket_name, key)
+                events = self._parse_content(content)
+            except Exception as ex:
+                self.log_exception(ex, message=f"Failed to read the object {key} from {bucket_name}, skipping it")
+                events = []
 
-            yield from self._parse_content(content)
+            yield key, events
 
-    def _move_marker(self, objects: Generator[str, None, None]) -> Generator[str, None, None]:
+    def _send_chunk(self, records: list[Any]) -> None:
         """
-        Move the marker according the objects fetched
+        Forward a chunk of records.
 
         Args:
-            objects: Generator[str, None, None]
-
-        Yields:
-            str:
+            records: list[Any]
         """
-        for key in objects:
-            # move the marker to the next object
-            self.marker = key
-
-            # yield the key of the current object
-            yield key
+        self.log(message=f"forwarding {len(records)} records", level="info")
+        self.send_records(
+            records=records,
+            event_name=f"{self.trigger.name.lower().replace(' ', '-')}_{str(time.time())}",
+        )
 
-    @staticmethod
-    def _chunk_events(events: Sequence[Any], chunk_size: int) -> Generator[list[Any], None, None]:
+    def forward_events(self) -> None:
         """
-        Group events by chunk
-
-        Args:
-            events: Sequence[Any]
-            chunk_size: int
+        Forward the events of the objects created after the marker.
 
-        Yields:
-            list[Any]:
+        Events are streamed to `send_records` by chunks. The marker moves to an object once all its events
+        have been forwarded, or once it was read if it has no events.
         """
-        chunk: list[Any] = []
-
-        # iter over the events
-        for event in events:
-            # if the chnuk is full
-            if len(chunk) >= chunk_size:
-                # yield the current chunk and create a new one
-                yield chunk
-                chunk = []
-
-            # add the event to the current chunk
-            chunk.append(event)
+        chunk_size = self.configuration.chunk_size or 10000
 
-        # if the last chunk is not empty
-        if len(chunk) > 0:
-            # yield the last chunk
-            yield chunk
-
-    def forward_events(self) -> None:
         # get next objects
         objects = self._fetch_next_objects(self.marker)
 
         # get and forward events
         try:
-            events = self._fetch_events(self.bucket_name, self._move_marker(objects))
-            chunks = self._chunk_events(list(events), self.configuration.chunk_size or 10000)
-            for records in chunks:
-                self.log(message=f"forwarding {len(records)} records", level="info")
-                self.send_records(
-                    records=list(records),
-                    event_name=f"{self.trigger.name.lower().replace(' ', '-')}_{str(time.time())}",
-                )
+            chunk: list[Any] = []
+            # the objects whose events are in the chunk, with the size of the chunk once their events were added
+            pending_keys: list[tuple[str, int]] = []
+
+            for key, events in self._fetch_events(self.bucket_name, objects):
+                chunk.extend(events)
+                pending_keys.append((key, len(chunk)))
+
+                while len(chunk) >= chunk_size:
+                    self._send_chunk(chunk[:chunk_size])
+                    chunk = chunk[chunk_size:]
+
+                    # move the marker to the last object whose events are all forwarded
+                    while pending_keys and pending_keys[0][1] <= chunk_size:
+                        self.marker = pending_keys.pop(0)[0]
+                    pending_keys = [(pending_key, size - chunk_size) for pending_key, size in pending_keys]
+
+            if chunk:
+                self._send_chunk(chunk)
+
+            if pending_keys:
+                self.marker = pending_keys[-1][0]
         except Exception as ex:
             self.log_exception(ex, message=f"Failed to forward events from {self.bucket_name}")
 
+        self.commit_marker()
+
     def stop(self) -> None:
         self.alive.set()
 
     def run(self) -> None:
         self.log(message=f"{self.trigger.name} worker for '{self.prefix}' has started", level="info")
 
-        # get the last key on the Bucket from the marker
-        last_key = self.get_last_key(self.marker)
-        # if found, set the last key as the marker
-        if last_key:
-            self.marker = last_key
+        # resume from the checkpoint index. Without checkpoint, start from the most recent object of the bucket
+        if self.marker is None:
+            self.marker = self.get_last_key(None)
 
         self.log(
             message=f"Start fetching events from {self.marker} for '{self.prefix}'",
@@ -1,10 +1,10 @@
 """Contains AwsS3FlowLogsTrigger."""
 
-import ipaddress
 from collections.abc import AsyncGenerator
-from itertools import islice
+from functools import cached_property
 
-from aws_helpers.utils import AsyncReader
+from aws_helpers.ip_filter import PrivateIpFilter
+from aws_helpers.utils import AsyncReader, iter_lines
 from connectors.metrics import DISCARDED_EVENTS
 from connectors.s3 import AbstractAwsS3QueuedConnector, AwsS3QueuedConfiguration
 from connectors.s3.provider import AwsAccountProvider
@@ -16,6 +16,8 @@ class AwsS3FlowLogsConfiguration(AwsS3QueuedConfiguration):
     ignore_comments: bool = False
     skip_first: int = 0
     separator: str
+    included_cidrs: list[str] = []
+    excluded_cidrs: list[str] = []
 
 
 class BaseAwsS3FlowLogsTrigger:
@@ -24,8 +26,22 @@ class BaseAwsS3FlowLogsTrigger:
     configuration: AwsS3FlowLogsConfiguration
     name = "AWS S3 Flow Logs"
 
-    @staticmethod
-    def check_all_ips_are_private(input_str: str) -> bool:
+    # Number of records whose IPs are checked at once
+    filter_batch_size = 10000
+
+    @cached_property
+    def ip_filter(self) -> PrivateIpFilter:
+        """
+        Filter of records that contain only private IPs.
+
+        Returns:
+            PrivateIpFilter:
+        """
+        return PrivateIpFilter(
+            included_cidrs=self.configuration.included_cidrs, excluded_cidrs=self.configuration.excluded_cidrs
+        )
+
+    def check_all_ips_are_private(self, input_str: str) -> bool:
         """
         Check if all IPs in the input string are private
 
@@ -35,14 +51,48 @@ class BaseAwsS3FlowLogsTrigger:
         Returns:
             bool:
         """
-        ips = []
-        for ip in input_str.split(" "):
-            try:
-                ips.append(ipaddress.ip_address(ip))
-            except ValueError:  # if substring is not IP then just omit it
-                pass
+        return self.ip_filter.is_private_only(input_str)
+
+    async def _iter_public_records(self, stream: AsyncReader) -> AsyncGenerator[str, None]:
+        """
+        Iterate over the records that contain at least one public IP.
+
+        The IPs are checked by batches of records.
 
-        return all([ip.is_private for ip in ips])
+        Args:
+            stream: AsyncReader
+
+        Returns:
+             Generator:
+        """
+        batch: list[str] = []
+        async for record in iter_lines(stream, self.configuration.separator):
+            batch.append(record)
+
+            if len(batch) >= self.filter_batch_size:
+                for public_record in self._filter_private_records(batch):
+                    yield public_record
+
+                batch = []
+
+        for public_record in self._filter_private_records(batch):
+            yield public_record
+
+    def _filter_private_records(self, records: list[str]) -> list[str]:
+        """
+        Discard the records that contain only private IPs.
+
+        Args:
+            records: list[str]
+
+        Returns:
+            list[str]:
+        """
+        private_only = self.ip_filter.private_only_lines(records)
+        if private_only.any():
+            DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc(int(private_only.sum()))
+
+        return [record for record, is_private in zip(records, private_only) if not is_private]
 
     async def _parse_content(self, stream: AsyncReader) -> AsyncGenerator[str, None]:
         """
@@ -54,20 +104,15 @@ class BaseAwsS3FlowLogsTrigger:
         Returns:
              Generator:
         """
-        content = await stream.read()
-
-        records: list[str] = []
-        for record in content.decode("utf-8").split(self.configuration.separator):
-            if len(record) > 0:
-                if not self.check_all_ips_are_private(record):
-                    records.append(record)
-                else:
-                    DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc()
+        to_skip = self.configuration.skip_first
+        async for record in self._iter_public_records(stream):
+            if self.configuration.ignore_comments and record.strip().startswith("#"):
+                continue
 
-        if self.configuration.ignore_comments:  # pragma: no cover
-            records = [record for record in records if not record.strip().startswith("#")]
+            if to_skip > 0:
+                to_skip -= 1
+                continue
 
-        for record in list(islice(records, self.configuration.skip_first, None)):
             yield record
 
 
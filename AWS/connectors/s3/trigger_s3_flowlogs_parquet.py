@@ -1,44 +1,40 @@
 """Contains AwsS3ParquetRecordsTrigger."""
 
-import io
-import ipaddress
-from collections.abc import AsyncGenerator, Sequence
-from typing import Any
+from collections.abc import AsyncGenerator
+from functools import cached_property
 
-import orjson
-import pandas
-
-from aws_helpers.utils import AsyncReader
+from aws_helpers.ip_filter import PrivateIpFilter
+from aws_helpers.parquet import dataframe_to_ndjson, iter_parquet_batches
+from aws_helpers.utils import AsyncReader, spool_stream
 from connectors.metrics import DISCARDED_EVENTS
 from connectors.s3 import AbstractAwsS3QueuedConnector, AwsS3QueuedConfiguration
 from connectors.s3.provider import AwsAccountProvider
 
 
+class AwsS3FlowLogsParquetConfiguration(AwsS3QueuedConfiguration):
+    """AwsS3FlowLogsParquetRecordsTrigger configuration."""
+
+    included_cidrs: list[str] = []
+    excluded_cidrs: list[str] = []
+
+
 class BaseAwsS3FlowLogsParquetRecordsTrigger:
     """Implementation of AwsS3ParquetRecordsTrigger."""
 
-    configuration: AwsS3QueuedConfiguration
+    configuration: AwsS3FlowLogsParquetConfiguration
     name = "AWS S3 Parquet records"
 
-    def check_all_ips_are_private(self, record: dict[str, Any], names: Sequence[str]) -> bool:
+    @cached_property
+    def ip_filter(self) -> PrivateIpFilter:
         """
-        Check if all IPs in a record are private
-
-        Args:
-            input_str: str
+        Filter of records that contain only private IPs.
 
         Returns:
-            bool:
+            PrivateIpFilter:
         """
-        ips = []
-        for name in names:
-            if name in record:
-                try:
-                    ips.append(ipaddress.ip_address(record[name]))
-                except ValueError:  # if substring is not IP then just omit it
-                    pass
-
-        return all([ip.is_private for ip in ips])
+        return PrivateIpFilter(
+            included_cidrs=self.configuration.included_cidrs, excluded_cidrs=self.configuration.excluded_cidrs
+        )
 
     async def _parse_content(self, stream: AsyncReader) -> AsyncGenerator[str, None]:
         """
@@ -50,19 +46,21 @@ class BaseAwsS3FlowLogsParquetRecordsTrigger:
         Returns:
              Generator:
         """
-        content = await stream.read()
-        if len(content) == 0:
-            return
-
-        reader = io.BytesIO(content)
-        df = pandas.read_parquet(reader)
-
-        for record in df.to_dict(orient="records"):
-            if len(record) > 0:
-                if not self.check_all_ips_are_private(record, ("srcaddr", "dstaddr")):
-                    yield orjson.dumps(record).decode("utf-8")
-                else:
-                    DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc()
+        with await spool_stream(stream) as reader:
+            # skip empty objects
+            if reader.seek(0, 2) == 0:
+                return
+
+            reader.seek(0)
+            async for df in iter_parquet_batches(reader):
+                # drop the rows with only private IPs before serializing the records
+                private_only = self.ip_filter.private_only_rows(df, ("srcaddr", "dstaddr"))
+                if private_only.any():
+                    DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc(int(private_only.sum()))
+                    df = df[~private_only]
+
+                for record in dataframe_to_ndjson(df):
+                    yield record
 
 
 class AwsS3FlowLogsParquetRecordsTrigger(
@@ -1,9 +1,8 @@
 """Contains AwsS3LogsTrigger."""
 
 from collections.abc import AsyncGenerator
-from itertools import islice
 
-from aws_helpers.utils import AsyncReader
+from aws_helpers.utils import AsyncReader, iter_lines
 from connectors.s3 import AbstractAwsS3QueuedConnector, AwsS3QueuedConfiguration
 from connectors.s3.provider import AwsAccountProvider
 
@@ -32,14 +31,15 @@ class BaseAwsS3LogsTrigger:
         Returns:
              Generator:
         """
-        content = await stream.read()
+        to_skip = self.configuration.skip_first
+        async for record in iter_lines(stream, self.configuration.separator):
+            if self.configuration.ignore_comments and record.strip().startswith("#"):
+                continue
 
-        records = [record for record in content.decode("utf-8").split(self.configuration.separator) if len(record) > 0]
+            if to_skip > 0:
+                to_skip -= 1
+                continue
 
-        if self.configuration.ignore_comments:
-            records = [record for record in records if not record.strip().startswith("#")]
-
-        for record in list(islice(records, self.configuration.skip_first, None)):
             yield record
 
 
@@ -1,13 +1,12 @@
 """Contains AwsS3ParquetRecordsTrigger."""
 
-import io
 from collections.abc import AsyncGenerator
 from typing import Any
 
 import orjson
-import pandas
 
-from aws_helpers.utils import AsyncReader
+from aws_helpers.parquet import dataframe_to_ndjson, iter_parquet_batches
+from aws_helpers.utils import AsyncReader, spool_stream
 from connectors.s3 import AbstractAwsS3QueuedConnector
 from connectors.s3.provider import AwsAccountProvider
 
@@ -41,18 +40,15 @@ class BaseAwsS3OcsfTrigger:
         Returns:
              Generator:
         """
-        content = await stream.read()
-
-        if len(content) == 0:
-            return
-
-        reader = io.BytesIO(content)
-        df = pandas.read_parquet(reader)
-        records = orjson.loads(df.to_json(orient="records"))
-
-        for record in records:
-            if len(record) > 0:
-                yield orjson.dumps(record).decode("utf-8")
+        with await spool_stream(stream) as reader:
+            # skip empty objects
+            if reader.seek(0, 2) == 0:
+                return
+
+            reader.seek(0)
+            async for df in iter_parquet_batches(reader):
+                for record in dataframe_to_ndjson(df):
+                    yield record
 
 
 class AwsS3OcsfTrigger(BaseAwsS3OcsfTrigger, AbstractAwsS3QueuedConnector, AwsAccountProvider):
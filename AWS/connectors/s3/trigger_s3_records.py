@@ -5,7 +5,7 @@ from typing import Any
 
 import orjson
 
-from aws_helpers.utils import AsyncReader
+from aws_helpers.utils import AsyncReader, iter_json_array
 from connectors.s3 import AbstractAwsS3QueuedConnector
 from connectors.s3.provider import AwsAccountProvider
 
@@ -91,12 +91,7 @@ class BaseAwsS3RecordsTrigger:
         Returns:
              Generator:
         """
-        content = await stream.read()
-
-        if len(content) == 0:
-            return
-
-        for data in orjson.loads(content).get("Records", []):
+        async for data in iter_json_array(stream, "Records"):
             # https://docs.aws.amazon.com/awscloudtrail/latest/userguide/cloudtrail-log-file-examples.html
             # Go through each element in list and add to result_data if it is a valid payload based on this
             # https://github.com/SEKOIA-IO/automation-library/issues/346
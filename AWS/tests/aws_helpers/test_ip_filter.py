@@ -0,0 +1,99 @@
+"""Test private IP filter."""
+
+import ipaddress
+
+import pandas
+import pytest
+from faker import Faker
+
+from aws_helpers.ip_filter import PrivateIpFilter
+
+
+def reference_is_private_only(line: str) -> bool:
+    """
+    Check if all the IPs of the line are private, one by one.
+
+    Args:
+        line: str
+
+    Returns:
+        bool:
+    """
+    ips = []
+    for token in line.split(" "):
+        try:
+            ips.append(ipaddress.ip_address(token))
+        except ValueError:
+            pass
+
+    return all(ip.is_private for ip in ips)
+
+
+def test_private_only_lines_matches_ipaddress(session_faker: Faker):
+    """
+    Test PrivateIpFilter.private_only_lines against the ipaddress module.
+
+    Args:
+        session_faker: Faker
+    """
+    addresses = [
+        "10.0.0.1",
+        "172.31.39.167",
+        "192.168.1.1",
+        "8.8.8.8",
+        "79.124.62.82",
+        "255.255.255.255",
+        "256.1.1.1",
+        "01.2.3.4",
+        "::1",
+        "fe80::1",
+        "2a00:1450:4007:80f::200e",
+        "fd00::1",
+        "-",
+    ]
+    lines = [
+        " ".join(
+            ["2", "111111111111", "eni-0a479835a7588c9ca", *session_faker.random_elements(addresses, 2), "ACCEPT"]
+        )
+        for _ in range(500)
+    ] + ["version account-id interface-id srcaddr dstaddr", ""]
+
+    result = PrivateIpFilter().private_only_lines(lines)
+
+    assert result.tolist() == [reference_is_private_only(line) for line in lines]
+
+
+def test_private_only_lines_with_cidrs():
+    """Test PrivateIpFilter.private_only_lines with custom ranges."""
+    lines = ["2 10.0.0.1 10.1.0.1 ACCEPT", "2 10.0.0.1 8.8.8.8 ACCEPT", "2 2a00:1450::1 10.0.0.1 ACCEPT"]
+
+    ip_filter = PrivateIpFilter(included_cidrs=["10.1.0.0/16"], excluded_cidrs=["8.8.8.0/24", "2a00:1450::/32"])
+
+    assert ip_filter.private_only_lines(lines).tolist() == [False, True, True]
+    assert ip_filter.private_only_lines([]).tolist() == []
+
+
+def test_private_only_rows():
+    """Test PrivateIpFilter.private_only_rows."""
+    df = pandas.DataFrame(
+        {
+            "srcaddr": ["10.0.0.1", "8.8.8.8", None, "fd00::1", "10.0.0.2"],
+            "dstaddr": ["10.0.0.2", "10.0.0.1", None, "2a00:1450::1", "-"],
+            "action": ["ACCEPT"] * 5,
+        }
+    )
+
+    assert PrivateIpFilter().private_only_rows(df, ("srcaddr", "dstaddr", "missing")).tolist() == [
+        True,
+        False,
+        True,
+        False,
+        True,
+    ]
+
+
+@pytest.mark.parametrize("cidr", ["not-a-cidr", "10.0.0.0/33"])
+def test_invalid_cidrs(cidr: str):
+    """Test PrivateIpFilter rejects invalid ranges."""
+    with pytest.raises(ValueError):
+        PrivateIpFilter(included_cidrs=[cidr])
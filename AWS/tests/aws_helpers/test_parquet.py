@@ -0,0 +1,42 @@
+"""Test Parquet helpers."""
+
+import io
+
+import orjson
+import pandas
+import pytest
+
+from aws_helpers.parquet import dataframe_to_ndjson, iter_parquet_batches
+from tests.helpers import async_list
+
+
+def test_dataframe_to_ndjson():
+    """Test dataframe_to_ndjson produces the same records as orjson."""
+    df = pandas.DataFrame(
+        {
+            "path": ["/var/log", "C:\\/dir", "a\\\\/b", "é\u2028"],
+            "count": [1, 2, 3, 4],
+            "ratio": [0.1, 1.5, None, 1e-7],
+            "flag": [True, False, True, None],
+        }
+    )
+
+    result = dataframe_to_ndjson(df)
+
+    assert [orjson.loads(record) for record in result] == orjson.loads(df.to_json(orient="records"))
+    assert result[0] == '{"path":"/var/log","count":1,"ratio":0.1,"flag":true}'
+    assert dataframe_to_ndjson(pandas.DataFrame()) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_parquet_batches():
+    """Test iter_parquet_batches reads the content by batches."""
+    df = pandas.DataFrame({"srcaddr": [f"10.0.0.{i}" for i in range(10)], "bytes": range(10)})
+    content = io.BytesIO()
+    df.to_parquet(content, row_group_size=4)
+    content.seek(0)
+
+    batches = await async_list(iter_parquet_batches(content, batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert pandas.concat(batches, ignore_index=True).equals(df)
@@ -1,6 +1,7 @@
 """Test utils module."""
 
 import io
+import json
 from gzip import compress
 from unittest.mock import MagicMock
 
@@ -8,7 +9,18 @@ import aiofiles
 import pytest
 from faker import Faker
 
-from aws_helpers.utils import async_gzip_open, get_content, is_gzip_compressed, normalize_s3_key
+from aws_helpers.utils import (
+    AsyncStreamingReader,
+    async_gzip_open,
+    get_content,
+    is_gzip_compressed,
+    iter_chunks,
+    iter_json_array,
+    iter_lines,
+    normalize_s3_key,
+    spool_stream,
+)
+from tests.helpers import async_bytesIO, async_list
 
 
 def test_normalize_s3_key():
@@ -66,3 +78,56 @@ async def test_async_gzip_reader():
 
         reader = await async_gzip_open(io.BytesIO(await f.read()))
         assert await reader.read() == content
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_reader_decompresses_by_chunks():
+    content = b"first line\nsecond line\n" * 100
+    # two concatenated gzip members, read by small chunks
+    compressed = compress(content) + compress(content)
+
+    reader = AsyncStreamingReader(await async_bytesIO(compressed), chunk_size=16)
+    assert await reader.read(5) == content[:5]
+    assert await reader.read() == (content + content)[5:]
+    assert await reader.read() == b""
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_reader_uncompressed_content():
+    content = b"PAR1\x15\x04\x15\x08\x150cbPAR1"
+
+    reader = AsyncStreamingReader(await async_bytesIO(content), chunk_size=3)
+    assert await async_list(iter_chunks(reader, 4)) == [content[i : i + 4] for i in range(0, len(content), 4)]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines():
+    content = "line 1\n\nline é 2\nline 3".encode("utf-8")
+
+    # the chunk boundary falls in the middle of the multi-bytes character
+    assert await async_list(iter_lines(await async_bytesIO(content), "\n", chunk_size=9)) == [
+        "line 1",
+        "line é 2",
+        "line 3",
+    ]
+    assert await async_list(iter_lines(await async_bytesIO(b""), "\n")) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array():
+    records = [
+        {"eventName": f"Event{i}", "value": i * 1000, "nested": {"list": [1, "]", {"}": None}]}} for i in range(50)
+    ]
+    content = json.dumps({"Metadata": {"Records": ["not", "these"]}, "Records": records, "After": 1}).encode()
+
+    assert await async_list(iter_json_array(await async_bytesIO(content), "Records", chunk_size=7)) == records
+    assert await async_list(iter_json_array(await async_bytesIO(content), "Missing", chunk_size=7)) == []
+    assert await async_list(iter_json_array(await async_bytesIO(b""), "Records")) == []
+
+
+@pytest.mark.asyncio
+async def test_spool_stream():
+    content = b"data" * 100
+
+    with await spool_stream(await async_bytesIO(content), max_size=10) as spooled_file:
+        assert spooled_file.read() == content
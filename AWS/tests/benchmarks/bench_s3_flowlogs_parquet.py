@@ -0,0 +1,152 @@
+"""
+Micro-benchmark of the conversion of flow logs Parquet files to JSON records.
+
+Compare the former path (whole file loaded with `pandas.read_parquet`, `to_dict(orient="records")`
+and `orjson.dumps` per row) with the columnar path (row groups iterated with pyarrow and serialized
+to NDJSON batch by batch).
+
+Usage:
+    python -m tests.benchmarks.bench_s3_flowlogs_parquet [--rows 1000000]
+"""
+
+import argparse
+import ipaddress
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy
+import orjson
+import pandas
+
+from aws_helpers.ip_filter import PrivateIpFilter
+from aws_helpers.parquet import _iter_batches, dataframe_to_ndjson
+
+
+def generate_flowlogs(path: Path, rows: int) -> None:
+    """
+    Write a synthetic flow logs Parquet file, with a row group every 100k rows.
+
+    Args:
+        path: Path
+        rows: int
+    """
+    rng = numpy.random.default_rng(42)
+    private = rng.random(rows) < 0.5
+
+    def addresses(count: int) -> numpy.ndarray:
+        return numpy.array(
+            [str(ipaddress.IPv4Address(int(value))) for value in rng.integers(0, 2**32, count, dtype=numpy.uint64)]
+        )
+
+    srcaddr = addresses(rows)
+    srcaddr[private] = "10.0.0.1"
+    df = pandas.DataFrame(
+        {
+            "version": numpy.full(rows, 2, dtype=numpy.int32),
+            "account_id": "111111111111",
+            "interface_id": "eni-03ef80ddb18bc0997",
+            "srcaddr": srcaddr,
+            "dstaddr": "172.31.17.39",
+            "srcport": rng.integers(0, 65535, rows, dtype=numpy.int32),
+            "dstport": rng.integers(0, 65535, rows, dtype=numpy.int32),
+            "protocol": numpy.full(rows, 6, dtype=numpy.int32),
+            "packets": rng.integers(1, 100, rows, dtype=numpy.int64),
+            "bytes": rng.integers(40, 100000, rows, dtype=numpy.int64),
+            "start": rng.integers(1661950000, 1661960000, rows, dtype=numpy.int64),
+            "end": rng.integers(1661950000, 1661960000, rows, dtype=numpy.int64),
+            "action": rng.choice(["ACCEPT", "REJECT"], rows),
+            "log_status": "OK",
+        }
+    )
+    df.to_parquet(path, row_group_size=100000)
+
+
+def former_path(path: Path) -> int:
+    """
+    Convert the file as the triggers used to.
+
+    Args:
+        path: Path
+
+    Returns:
+        int: number of forwarded records
+    """
+    count = 0
+    df = pandas.read_parquet(path)
+    for record in df.to_dict(orient="records"):
+        ips = []
+        for name in ("srcaddr", "dstaddr"):
+            try:
+                ips.append(ipaddress.ip_address(record[name]))
+            except ValueError:
+                pass
+
+        if not all(ip.is_private for ip in ips):
+            orjson.dumps(record).decode("utf-8")
+            count += 1
+
+    return count
+
+
+def columnar_path(path: Path) -> int:
+    """
+    Convert the file with the columnar path.
+
+    Args:
+        path: Path
+
+    Returns:
+        int: number of forwarded records
+    """
+    count = 0
+    ip_filter = PrivateIpFilter()
+    with open(path, "rb") as source:
+        for df in _iter_batches(source, 65536):
+            df = df[~ip_filter.private_only_rows(df, ("srcaddr", "dstaddr"))]
+            count += len(dataframe_to_ndjson(df))
+
+    return count
+
+
+def measure(name: str, path: Path, results: multiprocessing.Queue) -> None:  # type: ignore[type-arg]
+    """
+    Measure the duration and the peak memory of a path, in its own process.
+
+    Args:
+        name: str
+        path: Path
+        results: multiprocessing.Queue
+    """
+    function = former_path if name == "former" else columnar_path
+    start = time.perf_counter()
+    count = function(path)
+    duration = time.perf_counter() - start
+    results.put((name, count, duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "flowlogs.parquet"
+        generate_flowlogs(path, args.rows)
+        print(f"{args.rows} rows, {path.stat().st_size / 1024 / 1024:.1f} MiB")
+
+        results: multiprocessing.Queue = multiprocessing.Queue()  # type: ignore[type-arg]
+        for name in ("former", "columnar"):
+            process = multiprocessing.Process(target=measure, args=(name, path, results))
+            process.start()
+            process.join()
+            name, count, duration, peak_rss = results.get()
+            print(
+                f"{name:>10}: {count} records in {duration:.2f}s ({count / duration:.0f} rec/s), peak RSS {peak_rss:.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
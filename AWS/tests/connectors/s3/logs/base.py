@@ -54,6 +54,32 @@ def s3_mock(s3_objects: dict) -> type:
     return S3Mock
 
 
+def s3_hierarchical_mock(s3_objects: dict, listed_prefixes: list) -> type:
+    class S3HierarchicalMock(S3MockBase):
+        def list_objects_v2(self, **kwargs):
+            prefix = kwargs.get("Prefix", "")
+            listed_prefixes.append(prefix)
+
+            keys = sorted(name for name in s3_objects if name.startswith(prefix))
+            if (delimiter := kwargs.get("Delimiter")) is None:
+                return {"Contents": [{"Key": name, "Size": len(s3_objects[name])} for name in keys]}
+
+            contents = [name for name in keys if delimiter not in name[len(prefix) :]]
+            common_prefixes = sorted(
+                {
+                    prefix + name[len(prefix) :].split(delimiter, 1)[0] + delimiter
+                    for name in keys
+                    if name not in contents
+                }
+            )
+            return {
+                "Contents": [{"Key": name, "Size": len(s3_objects[name])} for name in contents],
+                "CommonPrefixes": [{"Prefix": common_prefix} for common_prefix in common_prefixes],
+            }
+
+    return S3HierarchicalMock
+
+
 class S3MockNoContent(S3MockBase):
     def list_objects_v2(self, **kwargs):
         return {}
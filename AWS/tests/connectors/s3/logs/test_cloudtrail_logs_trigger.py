@@ -11,7 +11,7 @@ from sekoia_automation.storage import PersistentJSON
 from connectors import AwsModule
 from connectors.s3.logs.trigger_cloudtrail_logs import CloudTrailLogsTrigger, CloudTrailLogsWorker
 
-from .base import read_file, s3_mock
+from .base import read_file, s3_hierarchical_mock, s3_mock
 from .mock import mocked_client
 
 
@@ -453,3 +453,148 @@ def test_forward_events_integration(faker: Faker, aws_module: AwsModule, symphon
             for call in calls.values()
             for record in read_file(symphony_storage, call["directory"], call["event"]["records_path"])
         )
+
+
+def test_forward_events_by_chunks(
+    trigger: CloudTrailLogsTrigger, worker: CloudTrailLogsWorker, symphony_storage: Path, aws_mock
+):
+    """
+    Test forward events streams the events by chunks and moves the marker to the last object.
+
+    Args:
+        trigger: CloudTrailLogsTrigger
+        worker: CloudTrailLogsWorker
+        symphony_storage: Path
+        aws_mock:
+    """
+    trigger.configuration.chunk_size = 1
+    worker.send_records = Mock()
+
+    with mocked_client.handler_for("s3", S3Mock):
+        worker.forward_events()
+
+    expected_records = [record for obj in S3Objects.values() for record in orjson.loads(obj)["Records"]]
+    assert [call.kwargs["records"] for call in worker.send_records.call_args_list] == [
+        [record] for record in expected_records
+    ]
+
+    last_key = list(S3Objects.keys()).pop()
+    with worker.context as variables:
+        assert variables["marker"] == last_key
+
+
+def test_forward_events_skips_unreadable_objects(trigger: CloudTrailLogsTrigger, worker: CloudTrailLogsWorker):
+    """
+    Test the objects that can't be read are skipped, and the marker moves past them.
+
+    Args:
+        trigger: CloudTrailLogsTrigger
+        worker: CloudTrailLogsWorker
+    """
+    contents = {
+        "AWSLogs/2022/02/21/file_1.json.gz": orjson.dumps({"Records": [{"eventID": "1"}]}),
+        "AWSLogs/2022/02/21/file_2.json.gz": Exception("AccessDenied"),
+        "AWSLogs/2022/02/21/file_3.json.gz": b"not json",
+        "AWSLogs/2022/02/21/file_4.json.gz": orjson.dumps({"Records": [{"eventID": "4"}]}),
+    }
+
+    def read_object(bucket: str, key: str) -> bytes:
+        if isinstance(contents[key], Exception):
+            raise contents[key]
+        return contents[key]
+
+    worker._fetch_next_objects = Mock(return_value=iter(contents))
+    worker._read_object = Mock(side_effect=read_object)
+    worker.send_records = Mock()
+
+    worker.forward_events()
+
+    assert [call.kwargs["records"] for call in worker.send_records.call_args_list] == [
+        [{"eventID": "1"}, {"eventID": "4"}]
+    ]
+    assert trigger.log_exception.call_count == 2
+    assert worker.marker == "AWSLogs/2022/02/21/file_4.json.gz"
+
+
+def test_forward_events_marks_objects_without_events(trigger: CloudTrailLogsTrigger, worker: CloudTrailLogsWorker):
+    """
+    Test the marker moves past the objects without events, even the trailing ones.
+
+    Args:
+        trigger: CloudTrailLogsTrigger
+        worker: CloudTrailLogsWorker
+    """
+    trigger.configuration.chunk_size = 1
+    contents = {
+        "AWSLogs/2022/02/21/file_1.json.gz": orjson.dumps({"Records": []}),
+        "AWSLogs/2022/02/21/file_2.json.gz": orjson.dumps({"Records": [{"eventID": "2"}, {"eventID": "3"}]}),
+        "AWSLogs/2022/02/21/file_3.json.gz": orjson.dumps({"Records": []}),
+    }
+    worker._fetch_next_objects = Mock(return_value=iter(contents))
+    worker._read_object = Mock(side_effect=lambda bucket, key: contents[key])
+    worker.send_records = Mock()
+
+    worker.forward_events()
+
+    assert [call.kwargs["records"] for call in worker.send_records.call_args_list] == [
+        [{"eventID": "2"}],
+        [{"eventID": "3"}],
+    ]
+    assert worker.marker == "AWSLogs/2022/02/21/file_3.json.gz"
+
+
+def test_forward_events_marker_by_chunks(trigger: CloudTrailLogsTrigger, worker: CloudTrailLogsWorker):
+    """
+    Test the marker only moves to the objects whose events are all forwarded.
+
+    Args:
+        trigger: CloudTrailLogsTrigger
+        worker: CloudTrailLogsWorker
+    """
+    trigger.configuration.chunk_size = 2
+    contents = {
+        "AWSLogs/2022/02/21/file_1.json.gz": orjson.dumps({"Records": [{"eventID": "1"}]}),
+        "AWSLogs/2022/02/21/file_2.json.gz": orjson.dumps({"Records": [{"eventID": "2"}, {"eventID": "3"}]}),
+        "AWSLogs/2022/02/21/file_3.json.gz": orjson.dumps({"Records": [{"eventID": "4"}]}),
+    }
+    worker._fetch_next_objects = Mock(return_value=iter(contents))
+    worker._read_object = Mock(side_effect=lambda bucket, key: contents[key])
+
+    markers = []
+    worker.send_records = Mock(side_effect=lambda **kwargs: markers.append(worker.marker))
+
+    worker.forward_events()
+
+    # the marker is updated once the chunk is sent
+    assert markers == [None, "AWSLogs/2022/02/21/file_1.json.gz"]
+    assert worker.marker == "AWSLogs/2022/02/21/file_3.json.gz"
+
+
+def test_get_last_key_lists_only_last_partitions(worker: CloudTrailLogsWorker, aws_mock):
+    """
+    Test get last key lists only the most recent partition of each level.
+
+    Args:
+        worker: CloudTrailLogsWorker
+        aws_mock:
+    """
+    worker.prefix = "AWSLogs/111111111111/CloudTrail/eu-west-2/"
+    s3_objects = {
+        f"{worker.prefix}{year}/{month:02d}/{day:02d}/file_{year}{month:02d}{day:02d}_{index}.json.gz": b"{}"
+        for year in (2021, 2022)
+        for month in range(1, 13)
+        for day in range(1, 29)
+        for index in range(3)
+    }
+    # the most recent partition is empty
+    s3_objects[f"{worker.prefix}2023/01/01/empty.json.gz"] = b""
+
+    listed_prefixes: list[str] = []
+    with mocked_client.handler_for("s3", s3_hierarchical_mock(s3_objects, listed_prefixes)):
+        assert worker.get_last_key(None) == f"{worker.prefix}2022/12/28/file_20221228_2.json.gz"
+        assert (
+            worker.get_last_key(f"{worker.prefix}2024/01/01/file.json.gz") == f"{worker.prefix}2024/01/01/file.json.gz"
+        )
+
+    # one listing per level for the last key, plus the empty partition
+    assert len(listed_prefixes) <= 2 * 8
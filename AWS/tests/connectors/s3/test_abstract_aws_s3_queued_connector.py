@@ -1,5 +1,6 @@
 """Contains tests for AbstractAwsS3QueuedConnector."""
 
+import asyncio
 import os
 from collections.abc import AsyncGenerator
 from pathlib import Path
@@ -294,3 +295,47 @@ async def test_abstract_aws_s3_queued_connector_next_batch_with_empty_data_in_s3
     result = await abstract_queued_connector.next_batch()
 
     assert result == (0, [message[1] for message in valid_messages])
+
+
+async def test_abstract_aws_s3_queued_connector_next_batch_fetches_objects_concurrently(
+    session_faker: Faker, abstract_queued_connector: AbstractAwsS3QueuedConnector, sqs_message: str
+):
+    """
+    Test AbstractAwsS3QueuedConnector next_batch reads S3 objects concurrently within the semaphore bound.
+
+    Args:
+        session_faker: Faker
+        abstract_queued_connector: AbstractAwsS3QueuedConnector
+        sqs_message: str
+    """
+    amount_of_messages = 10
+    max_concurrency = 3
+    abstract_queued_connector.s3_fetch_concurrency_sem = asyncio.BoundedSemaphore(max_concurrency)
+
+    sqs_messages = [(sqs_message, session_faker.pyint(min_value=5, max_value=100)) for _ in range(amount_of_messages)]
+    data_content = session_faker.word()
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def read_key():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        return await async_bytesIO(data_content.encode("utf-8"))
+
+    abstract_queued_connector.sqs_wrapper = MagicMock()
+    abstract_queued_connector.sqs_wrapper.receive_messages = MagicMock()
+    abstract_queued_connector.sqs_wrapper.receive_messages.return_value.__aenter__.return_value = sqs_messages
+
+    abstract_queued_connector.s3_wrapper = MagicMock()
+    abstract_queued_connector.s3_wrapper.read_key = MagicMock()
+    abstract_queued_connector.s3_wrapper.read_key.return_value.__aenter__.side_effect = read_key
+
+    result = await abstract_queued_connector.next_batch()
+
+    assert result == (amount_of_messages, [message[1] for message in sqs_messages])
+    assert max_in_flight == max_concurrency
@@ -154,3 +154,21 @@ async def test_aws_s3_logs_trigger_parse_header_with_tabs(connector: AwsS3CloudF
         assert decoded_records[0]["start_time"]
         assert decoded_records[0]["end_time"]
         assert decoded_records[0]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_aws_s3_logs_trigger_parse_unsorted_data(connector: AwsS3CloudFrontTrigger, test_data_3_2_1_3: bytes):
+    header, *rows = test_data_3_2_1_3.decode("utf-8").strip().split("\n")[1:]
+    # interleave the records of the different groups and make one of them differ on a non-key column
+    rows = [rows[0], rows[3], rows[5], rows[1], rows[4], rows[2].replace("\t484\t", "\t999\t")]
+    data = "\n".join(["#Version: 1.0", header, *rows]).encode("utf-8")
+
+    async with async_temporary_file(data) as stream:
+        decoded_records = [json.loads(record) async for record in connector._parse_content(stream)]
+
+        assert [record["count"] for record in decoded_records] == [3, 2, 1]
+        assert [record["start_time"] for record in decoded_records] == ["16:15:33", "20:15:33", "20:15:33"]
+        assert [record["end_time"] for record in decoded_records] == ["16:15:33", "20:15:33", "20:15:33"]
+        assert decoded_records[0]["sc-bytes"] == "_"
+        assert decoded_records[1]["sc-bytes"] == "484"
+        assert "time" not in decoded_records[0]
@@ -6,18 +6,36 @@ from pathlib import Path
 import aiofiles
 import orjson
 import pytest
+from faker import Faker
 
 from connectors import AwsModule
-from connectors.s3 import AwsS3QueuedConfiguration
-from connectors.s3.trigger_s3_flowlogs_parquet import AwsS3FlowLogsParquetRecordsTrigger
+from connectors.s3.trigger_s3_flowlogs_parquet import (
+    AwsS3FlowLogsParquetConfiguration,
+    AwsS3FlowLogsParquetRecordsTrigger,
+)
 from tests.helpers import async_list, async_temporary_file
 
 
+@pytest.fixture
+def aws_s3_flowlogs_parquet_config(faker: Faker, intake_key: str) -> AwsS3FlowLogsParquetConfiguration:
+    """
+    Create a configuration.
+
+    Args:
+        faker: Faker
+        intake_key: str
+
+    Returns:
+        AwsS3FlowLogsParquetConfiguration:
+    """
+    return AwsS3FlowLogsParquetConfiguration(intake_key=intake_key, queue_name=faker.word())
+
+
 @pytest.fixture
 def connector(
     aws_module: AwsModule,
     symphony_storage: Path,
-    aws_s3_queued_config: AwsS3QueuedConfiguration,
+    aws_s3_flowlogs_parquet_config: AwsS3FlowLogsParquetConfiguration,
 ) -> AwsS3FlowLogsParquetRecordsTrigger:
     """
     Create a connector.
@@ -25,14 +43,14 @@ def connector(
     Args:
         aws_module: AwsModule
         symphony_storage: Path
-        aws_s3_queued_config: AwsS3QueuedConfiguration
+        aws_s3_flowlogs_parquet_config: AwsS3FlowLogsParquetConfiguration
 
     Returns:
         AwsS3FlowLogsParquetRecordsTrigger:
     """
     connector = AwsS3FlowLogsParquetRecordsTrigger(module=aws_module, data_path=symphony_storage)
 
-    connector.configuration = aws_s3_queued_config
+    connector.configuration = aws_s3_flowlogs_parquet_config
 
     return connector
 
@@ -57,3 +75,28 @@ async def test_aws_s3_flowlogs_records_trigger_parse_content(connector: AwsS3Flo
 async def test_aws_s3_flowlogs_records_trigger_parse_empty_data(connector: AwsS3FlowLogsParquetRecordsTrigger):
     async with async_temporary_file(b"") as f:
         assert await async_list(connector._parse_content(f)) == []
+
+
+@pytest.mark.asyncio
+async def test_aws_s3_flowlogs_records_trigger_parse_content_with_cidrs(connector: AwsS3FlowLogsParquetRecordsTrigger):
+    """
+    Test AwsS3ParquetRecordsTrigger `_parse_content` with custom private ranges.
+
+    Args:
+        connector: AwsS3FlowLogsParquetRecordsTrigger
+    """
+    current_dir = path.dirname(__file__)
+
+    # consider every IPv4 address as private
+    connector.configuration.excluded_cidrs = ["0.0.0.0/0"]
+    async with aiofiles.open(f"{current_dir}/test_parquet.parquet", "rb") as f:
+        assert await async_list(connector._parse_content(f)) == []
+
+    # and keep a range of them
+    connector.configuration.included_cidrs = ["172.31.0.0/16"]
+    del connector.ip_filter
+    async with aiofiles.open(f"{current_dir}/test_parquet.parquet", "rb") as f:
+        result = await async_list(connector._parse_content(f))
+
+    assert len(result) > 0
+    assert all("172.31." in record for record in result)
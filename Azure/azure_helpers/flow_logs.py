@@ -0,0 +1,49 @@
+"""Helpers to expand the flow logs records into events."""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from dateutil.parser import isoparse
+
+
+@lru_cache(maxsize=4096)
+def parse_record_time(value: str) -> datetime:
+    """
+    Parse the time of a record, as an UTC datetime.
+
+    The records of a blob share a few distinct times, so the parsed values are cached.
+
+    Args:
+        value: str
+
+    Returns:
+        datetime:
+    """
+    try:
+        result = datetime.fromisoformat(value)
+    except ValueError:
+        result = isoparse(value)
+
+    return result.astimezone(timezone.utc)
+
+
+def encode_fields(fields: dict[str, Any], prefix: str = "") -> str:
+    """
+    Encode fields as the beginning of a JSON object, without the closing brace.
+
+    The fields shared by many events are encoded once, then completed for each event.
+
+    Args:
+        fields: dict[str, Any]
+        prefix: str: the beginning of the JSON object to extend, if any
+
+    Returns:
+        str:
+    """
+    encoded = orjson.dumps(fields).decode("utf-8")[:-1]
+    if not prefix:
+        return encoded
+
+    return f"{prefix},{encoded[1:]}"
@@ -1,3 +1,12 @@
+"""Helpers to read the content of the blobs."""
+
+import zlib
+from typing import Any
+
+# Window size to decode the gzip header and trailer
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
+
 def is_gzip_compressed(content: bytes) -> bool:
     """
     Check if the current object is compressed with gzip.
@@ -10,3 +19,62 @@ def is_gzip_compressed(content: bytes) -> bool:
     """
     # check the magic number
     return content[0:2] == b"\x1f\x8b"
+
+
+class BlobContentReader(object):
+    """
+    Accumulate the chunks of a blob, decompressing gzip content as the chunks are received.
+
+    The compression is detected on the first chunk.
+    """
+
+    def __init__(self, detect_compression: bool = True) -> None:
+        """
+        Initialize BlobContentReader.
+
+        Args:
+            detect_compression: bool: if False, the content is never decompressed
+        """
+        self._detect_compression = detect_compression
+        self._decompressor: Any = None
+        self._parts: list[bytes] = []
+        self.is_compressed = False
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Add a chunk of the blob.
+
+        Args:
+            chunk: bytes
+        """
+        if self.size == 0 and self._detect_compression and is_gzip_compressed(chunk):
+            self.is_compressed = True
+            self._decompressor = zlib.decompressobj(GZIP_WBITS)
+
+        self.size += len(chunk)
+
+        if not self.is_compressed:
+            self._parts.append(chunk)
+            return
+
+        # A gzip content can be made of several members
+        while chunk:
+            self._parts.append(self._decompressor.decompress(chunk))
+            if not self._decompressor.eof:
+                break
+
+            chunk = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(GZIP_WBITS)
+
+    def getvalue(self) -> bytes:
+        """
+        Get the content read so far, decompressed.
+
+        Returns:
+            bytes:
+        """
+        if self.is_compressed:
+            self._parts.append(self._decompressor.flush())
+
+        return b"".join(self._parts)
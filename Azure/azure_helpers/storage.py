@@ -1,11 +1,11 @@
 """Configs and wrapper to work with Azure Blob Storage."""
 
-from typing import Tuple
+from typing import AsyncGenerator, Tuple, Union
 
 import aiofiles
 from azure.core.async_paging import AsyncItemPaged
 from azure.storage.blob import BlobProperties
-from azure.storage.blob.aio import ContainerClient
+from azure.storage.blob.aio import BlobPrefix, ContainerClient
 from pydantic import BaseModel
 
 
@@ -58,17 +58,54 @@ class AzureBlobStorageWrapper(object):
 
         return self._client
 
-    def list_blobs(self) -> AsyncItemPaged[BlobProperties]:
+    def list_blobs(self, name_starts_with: str | None = None) -> AsyncItemPaged[BlobProperties]:
         """
-        List all blobs in container.
+        List all blobs in container, or only the ones whose name starts with the given prefix.
+
+        Args:
+            name_starts_with: str | None
 
         Returns:
             AsyncItemPaged[BlobProperties]:
         """
-        return self.client().list_blobs()
+        return self.client().list_blobs(name_starts_with=name_starts_with)
+
+    def walk_blobs(
+        self, name_starts_with: str | None = None, delimiter: str = "/"
+    ) -> AsyncItemPaged[Union[BlobProperties, BlobPrefix]]:
+        """
+        List one level of the virtual hierarchy of the container.
+
+        Virtual directories are returned as prefixes, whose name ends with the delimiter.
+
+        Args:
+            name_starts_with: str | None
+            delimiter: str
+
+        Returns:
+            AsyncItemPaged[Union[BlobProperties, BlobPrefix]]:
+        """
+        return self.client().walk_blobs(name_starts_with=name_starts_with, delimiter=delimiter)
+
+    async def stream_blob(self, blob_name: str, offset: int | None = None) -> AsyncGenerator[bytes, None]:
+        """
+        Stream blob content from Azure Blob Storage, chunk by chunk.
+
+        Args:
+            blob_name: str
+            offset: int | None: start of the range to download, the whole blob if not set
+
+        Returns:
+            AsyncGenerator[bytes, None]:
+        """
+        blob = self.client().get_blob_client(blob_name)
+        stream = await blob.download_blob(offset=offset)
+
+        async for chunk in stream.chunks():
+            yield chunk
 
     async def download_blob(
-        self, blob_name: str, download: bool = True, tmp_dir: str = "/tmp"
+        self, blob_name: str, download: bool = True, tmp_dir: str = "/tmp", offset: int | None = None
     ) -> Tuple[str | None, bytes | None]:
         """
         Download blob content from Azure Blob Storage.
@@ -77,12 +114,13 @@ class AzureBlobStorageWrapper(object):
             blob_name: str
             download: bool
             tmp_dir: str
+            offset: int | None: start of the range to download, the whole blob if not set
 
         Returns:
             Union[str, bytes]:
         """
         blob = self.client().get_blob_client(blob_name)
-        stream = await blob.download_blob()
+        stream = await blob.download_blob(offset=offset)
 
         if download:
             async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, dir=tmp_dir) as file:
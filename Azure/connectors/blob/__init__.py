@@ -4,22 +4,20 @@ import asyncio
 import os
 import time
 from abc import ABCMeta
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from gzip import decompress
 from typing import Any, AsyncGenerator, Optional
 
-import aiofiles
-from azure.storage.blob import BlobProperties
+from azure.storage.blob import BlobProperties, BlobType
 from dateutil.parser import isoparse
 from loguru import logger
 from pydantic import Field
 from sekoia_automation.aio.connector import AsyncConnector
-from sekoia_automation.aio.helpers.files.utils import delete_file
 from sekoia_automation.connector import DefaultConnectorConfiguration
 from sekoia_automation.module import Module
 from sekoia_automation.storage import PersistentJSON
 
-from azure_helpers.io import is_gzip_compressed
+from azure_helpers.io import BlobContentReader
 from azure_helpers.storage import AzureBlobStorageConfig, AzureBlobStorageWrapper
 from connectors.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 
@@ -31,6 +29,17 @@ class AzureBlobConnectorConfig(DefaultConnectorConfiguration):
     account_name: str
     account_key: str = Field(secret=True)
     frequency: int = 60
+    partitioned_discovery: bool = False
+
+
+# Name of the first segment of the date-partitioned layouts (`y=YYYY/m=MM/d=DD/h=HH/`)
+PARTITION_SEGMENT = "y="
+
+# Blobs keep being written after the end of their hourly partition, so the previous partition is listed again
+PARTITION_GRACE = timedelta(hours=1)
+
+# Offsets of the append blobs not modified for this duration are forgotten
+APPEND_OFFSETS_RETENTION = timedelta(days=1)
 
 
 class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
@@ -41,12 +50,20 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
 
     _azure_blob_storage_wrapper: AzureBlobStorageWrapper | None = None
 
+    # The content appended to a blob can be parsed on its own: only read the new content of the append blobs
+    incremental_append_blobs: bool = False
+
     def __init__(self, *args: Any, **kwargs: Optional[Any]) -> None:
         """Init AzureBlobConnector."""
 
         super().__init__(*args, **kwargs)
         self.context = PersistentJSON("context.json", self._data_path)
         self.limit_of_events_to_push = int(os.getenv("AZURE_BATCH_SIZE", 1000))
+        # Each blob being downloaded is kept in memory, decompressed, until its records are forwarded:
+        # the peak memory grows with the number and the size of the concurrent downloads.
+        # The total size of the concurrent downloads is bounded (as stored, i.e. before decompression)
+        self.max_concurrent_downloads = int(os.getenv("AZURE_MAX_CONCURRENT_DOWNLOADS", 10))
+        self.max_concurrent_download_bytes = int(os.getenv("AZURE_MAX_CONCURRENT_DOWNLOAD_BYTES", 64 * 1024 * 1024))
 
     def azure_blob_wrapper(self) -> AzureBlobStorageWrapper:
         """
@@ -73,10 +90,13 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
-    @property
-    def last_event_date(self) -> datetime:
+    @staticmethod
+    def _bounded_date(date_str: str | None) -> datetime:
         """
-        Get last event date.
+        Parse a saved date, bounded to the last hour.
+
+        Args:
+            date_str: str | None
 
         Returns:
             datetime:
@@ -84,21 +104,51 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
         now = datetime.now(timezone.utc)
         one_hour_ago = (now - timedelta(hours=1)).replace(microsecond=0)
 
+        # If undefined, retrieve events from the last 1 hour
+        if date_str is None:
+            return one_hour_ago
+
+        # Parse the most recent date seen
+        date = isoparse(date_str).replace(microsecond=0)
+
+        # We don't retrieve messages older than 1 hour
+        if date < one_hour_ago:
+            return one_hour_ago
+
+        return date
+
+    @property
+    def last_event_date(self) -> datetime:
+        """
+        Get last event date.
+
+        Returns:
+            datetime:
+        """
         with self.context as cache:
-            last_event_date_str = cache.get("last_event_date")
+            return self._bounded_date(cache.get("last_event_date"))
 
-            # If undefined, retrieve events from the last 1 hour
-            if last_event_date_str is None:
-                return one_hour_ago
+    @property
+    def partition_cursors(self) -> dict[str, datetime]:
+        """
+        Get the most recent modification date seen for each partitioned directory.
 
-            # Parse the most recent date seen
-            last_event_date = isoparse(last_event_date_str).replace(microsecond=0)
+        Returns:
+            dict[str, datetime]:
+        """
+        with self.context as cache:
+            return {root: self._bounded_date(date_str) for root, date_str in cache.get("partitions", {}).items()}
 
-            # We don't retrieve messages older than 1 hour
-            if last_event_date < one_hour_ago:
-                return one_hour_ago
+    @property
+    def append_blob_offsets(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the offsets already read in the append blobs.
 
-            return last_event_date
+        Returns:
+            dict[str, dict[str, Any]]:
+        """
+        with self.context as cache:
+            return dict(cache.get("append_blobs", {}))
 
     async def get_most_recent_blobs(self, lower_bound: datetime) -> AsyncGenerator[BlobProperties, None]:
         """
@@ -114,6 +164,191 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
             if blob.last_modified > lower_bound:
                 yield blob
 
+    async def get_partition_roots(self, prefix: str = "") -> AsyncGenerator[str, None]:
+        """
+        Find the virtual directories split in date partitions (`y=YYYY/m=MM/d=DD/h=HH/`).
+
+        The hierarchy is walked level by level, without listing the content of the partitions.
+
+        Args:
+            prefix: str
+
+        Returns:
+            AsyncGenerator[str, None]
+        """
+        subdirectories = []
+        async for item in self.azure_blob_wrapper().walk_blobs(name_starts_with=prefix or None):
+            # Skip the blobs, only keep the virtual directories
+            if not item.name.endswith("/"):
+                continue
+
+            if item.name[len(prefix) :].startswith(PARTITION_SEGMENT):
+                yield prefix
+                return
+
+            subdirectories.append(item.name)
+
+        for subdirectory in subdirectories:
+            async for root in self.get_partition_roots(subdirectory):
+                yield root
+
+    @staticmethod
+    def partition_prefixes(root: str, lower_bound: datetime, upper_bound: datetime) -> list[str]:
+        """
+        Build the prefixes of the hourly partitions between the two dates.
+
+        Args:
+            root: str
+            lower_bound: datetime
+            upper_bound: datetime
+
+        Returns:
+            list[str]:
+        """
+        prefixes = []
+        hour = lower_bound.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        while hour <= upper_bound:
+            prefixes.append(f"{root}y={hour:%Y}/m={hour:%m}/d={hour:%d}/h={hour:%H}/")
+            hour += timedelta(hours=1)
+
+        return prefixes
+
+    async def get_most_recent_partitioned_blobs(
+        self, cursors: dict[str, datetime]
+    ) -> AsyncGenerator[tuple[str, BlobProperties], None]:
+        """
+        Return the blobs more recent than the cursor of their partitioned directory.
+
+        Only the recent hourly partitions are listed, so the cost does not grow with the size of the container.
+
+        Args:
+            cursors: dict[str, datetime]
+
+        Returns:
+            AsyncGenerator[tuple[str, BlobProperties], None]
+        """
+        now = datetime.now(timezone.utc)
+        async for root in self.get_partition_roots():
+            cursor = cursors.get(root) or self._bounded_date(None)
+            for prefix in self.partition_prefixes(root, cursor - PARTITION_GRACE, now):
+                async for blob in self.azure_blob_wrapper().list_blobs(name_starts_with=prefix):
+                    if blob.last_modified > cursor:
+                        yield root, blob
+
+    async def get_new_blobs(
+        self, lower_bound: datetime, cursors: dict[str, datetime]
+    ) -> AsyncGenerator[tuple[str | None, BlobProperties], None]:
+        """
+        Return the new or modified blobs, with their partitioned directory if the partitioned discovery is enabled.
+
+        Args:
+            lower_bound: datetime
+            cursors: dict[str, datetime]
+
+        Returns:
+            AsyncGenerator[tuple[str | None, BlobProperties], None]
+        """
+        if self.configuration.partitioned_discovery:
+            async for root, blob in self.get_most_recent_partitioned_blobs(cursors):
+                yield root, blob
+
+        else:
+            async for blob in self.get_most_recent_blobs(lower_bound):
+                yield None, blob
+
+    async def read_blob(self, blob: BlobProperties, append_offsets: dict[str, dict[str, Any]]) -> list[str]:
+        """
+        Download and format the content of a blob.
+
+        For the append blobs, only the content appended since the last read is downloaded,
+        and only the complete lines are read.
+
+        Args:
+            blob: BlobProperties
+            append_offsets: dict[str, dict[str, Any]]
+
+        Returns:
+            list[str]:
+        """
+        is_append_blob = self.incremental_append_blobs and blob.blob_type == BlobType.APPENDBLOB
+        creation_time = blob.creation_time.isoformat() if blob.creation_time else None
+
+        offset = 0
+        state = append_offsets.get(blob.name)
+        # Resume only if the blob was not recreated in the meantime
+        if is_append_blob and state and state["created"] == creation_time and state["offset"] <= (blob.size or 0):
+            offset = state["offset"]
+            if offset == blob.size:
+                return []
+
+        # Get the content of the current blob, decompressed as the chunks are received
+        reader = BlobContentReader(detect_compression=offset == 0)
+        async for chunk in self.azure_blob_wrapper().stream_blob(blob.name, offset=offset or None):
+            await asyncio.to_thread(reader.feed, chunk)
+
+        data = reader.getvalue()
+
+        if is_append_blob:
+            if reader.is_compressed:
+                # A compressed blob can't be resumed
+                append_offsets.pop(blob.name, None)
+            else:
+                # The last line may still be being appended: only read up to the last complete line,
+                # the trailing fragment is read again at the next cycle
+                data = data[: data.rfind(b"\n") + 1]
+                append_offsets[blob.name] = {
+                    "offset": offset + len(data),
+                    "created": creation_time,
+                    "last_modified": blob.last_modified.isoformat(),
+                }
+
+        if not data:
+            return []
+
+        return self.filter_blob_data(data.decode("utf-8"))
+
+    async def read_new_blobs(
+        self, lower_bound: datetime, cursors: dict[str, datetime], append_offsets: dict[str, dict[str, Any]]
+    ) -> AsyncGenerator[tuple[str | None, BlobProperties, list[str]], None]:
+        """
+        Read the new or modified blobs, a few of them concurrently.
+
+        The number and the total size of the concurrent downloads are bounded, but a blob is always downloaded
+        when no other download is in progress. The blobs are returned in the order of the listing, with their records.
+
+        Args:
+            lower_bound: datetime
+            cursors: dict[str, datetime]
+            append_offsets: dict[str, dict[str, Any]]
+
+        Returns:
+            AsyncGenerator[tuple[str | None, BlobProperties, list[str]], None]
+        """
+        pending: deque[tuple[str | None, BlobProperties, asyncio.Task[list[str]]]] = deque()
+        pending_bytes = 0
+
+        try:
+            async for root, blob in self.get_new_blobs(lower_bound, cursors):
+                # Wait for the oldest downloads while the limits of concurrent downloads are reached
+                while pending and (
+                    len(pending) >= self.max_concurrent_downloads
+                    or pending_bytes + (blob.size or 0) > self.max_concurrent_download_bytes
+                ):
+                    pending_root, pending_blob, task = pending.popleft()
+                    pending_bytes -= pending_blob.size or 0
+                    yield pending_root, pending_blob, await task
+
+                pending.append((root, blob, asyncio.create_task(self.read_blob(blob, append_offsets))))
+                pending_bytes += blob.size or 0
+
+            while pending:
+                root, blob, task = pending.popleft()
+                yield root, blob, await task
+
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+
     async def get_azure_blob_data(self) -> list[str]:
         """
         Get Azure Blob Storage data.
@@ -132,8 +367,11 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
         records: list[str] = []
         result: list[str] = []
 
+        cursors = self.partition_cursors
+        append_offsets = self.append_blob_offsets
+
         # For each blob
-        async for blob in self.get_most_recent_blobs(_last_modified_date):
+        async for root, blob, blob_records in self.read_new_blobs(_last_modified_date, cursors, append_offsets):
             logger.info(
                 "Process blob {name} modified at {modified_at}",
                 name=blob.name,
@@ -143,24 +381,11 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
             if _last_modified_date is None or blob.last_modified > _last_modified_date:
                 _last_modified_date = blob.last_modified
 
-            # Get the content of the current blob
-            file, content = await self.azure_blob_wrapper().download_blob(blob.name, download=True)
-
-            # process the downloaded blob
-            if file:
-                async with aiofiles.open(file, "rb") as file_data:
-                    file_content = await file_data.read()
+            # Save the most recent date seen in the partitioned directory
+            if root is not None and (root not in cursors or blob.last_modified > cursors[root]):
+                cursors[root] = blob.last_modified
 
-                    if is_gzip_compressed(file_content):
-                        file_content = decompress(file_content)
-
-                    records.extend(self.filter_blob_data(file_content.decode("utf-8")))
-
-                await delete_file(file)
-
-            # process the content of the blob
-            if content:
-                records.extend(self.filter_blob_data(content.decode("utf-8")))
+            records.extend(blob_records)
 
             # Push the events if exceed the defined threshold
             if len(records) >= self.limit_of_events_to_push:
@@ -179,6 +404,17 @@ class AbstractAzureBlobConnector(AsyncConnector, metaclass=ABCMeta):
 
             cache["last_event_date"] = _last_modified_date.isoformat()
 
+            if self.configuration.partitioned_discovery:
+                cache["partitions"] = {root: cursor.isoformat() for root, cursor in cursors.items()}
+
+            if self.incremental_append_blobs:
+                retention_limit = datetime.now(timezone.utc) - APPEND_OFFSETS_RETENTION
+                cache["append_blobs"] = {
+                    name: state
+                    for name, state in append_offsets.items()
+                    if isoparse(state["last_modified"]) >= retention_limit
+                }
+
         return result
 
     def run(self) -> None:  # pragma: no cover
@@ -8,6 +8,9 @@ class AzureBlobConnector(AbstractAzureBlobConnector):
 
     name = "AzureBlobConnector"
 
+    # Each line is an event: the lines appended to a blob can be read on their own
+    incremental_append_blobs = True
+
     def filter_blob_data(self, data: str) -> list[str]:
         """
         Filter blob data and exclude empty lines.
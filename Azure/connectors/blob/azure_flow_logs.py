@@ -1,10 +1,11 @@
 """Default Azure Key Vault connector."""
 
-from datetime import timezone
+from datetime import datetime
+from typing import Iterator
 
 import orjson
-from dateutil.parser import isoparse
 
+from azure_helpers.flow_logs import encode_fields, parse_record_time
 from connectors.blob import AbstractAzureBlobConnector
 
 
@@ -21,35 +22,43 @@ class AzureFlowLogsConnector(AbstractAzureBlobConnector):
             https://learn.microsoft.com/en-us/azure/network-watcher/vnet-flow-logs-overview
 
         Args:
-            data: dict[Any, Any]
-            time_filter: datetime | None
+            data: str
 
         Returns:
-            list[dict[Any, Any]]:
+            list[str]:
         """
-        modified_result = []
-        time_filter = self.last_event_date
+        return list(self.iter_flow_tuples(data, self.last_event_date))
 
+    def iter_flow_tuples(self, data: str, time_filter: datetime | None) -> Iterator[str]:
+        """
+        Expand the records to one event per flow tuple, serialized as they are produced.
+
+        Args:
+            data: str
+            time_filter: datetime | None: the records older than this date are ignored
+
+        Yields:
+            str:
+        """
         for record in orjson.loads(data).get("records", []):
-            record_time = isoparse(record["time"]).astimezone(timezone.utc)
+            record_time = parse_record_time(record["time"])
 
             # If the record is too old, ignore it.
             if time_filter and record_time < time_filter:
                 continue
 
-            result = {
-                "time": record_time,
-                "flowLogVersion": record["flowLogVersion"],
-                "flowLogGUID": record["flowLogGUID"],
-                "macAddress": record["macAddress"],
-                "operationName": record["operationName"],
-            }
+            header = encode_fields(
+                {
+                    "time": record_time,
+                    "flowLogVersion": record["flowLogVersion"],
+                    "flowLogGUID": record["flowLogGUID"],
+                    "macAddress": record["macAddress"],
+                    "operationName": record["operationName"],
+                }
+            )
 
             for flow in record.get("flowRecords", {}).get("flows", []):
                 for group in flow.get("flowGroups", []):
+                    prefix = encode_fields({"aclID": flow["aclID"], "rule": group["rule"]}, header)
                     for entry in group.get("flowTuples", []):
-                        modified_result.append(
-                            {**result, "aclID": flow["aclID"], "rule": group["rule"], "flow.0": entry}
-                        )
-
-        return [orjson.dumps(value).decode("utf-8") for value in modified_result]
+                        yield f'{prefix},"flow.0":{orjson.dumps(entry).decode("utf-8")}}}'
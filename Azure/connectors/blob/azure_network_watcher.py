@@ -1,10 +1,11 @@
 """Default Azure Key Vault connector."""
 
-from datetime import timezone
+from datetime import datetime
+from typing import Iterator
 
 import orjson
-from dateutil.parser import isoparse
 
+from azure_helpers.flow_logs import encode_fields, parse_record_time
 from connectors.blob import AbstractAzureBlobConnector
 
 
@@ -21,35 +22,47 @@ class AzureNetworkWatcherConnector(AbstractAzureBlobConnector):
             https://learn.microsoft.com/en-us/azure/network-watcher/vnet-flow-logs-overview
 
         Args:
-            data: dict[Any, Any]
-            time_filter: datetime | None
+            data: str
 
         Returns:
-            list[dict[Any, Any]]:
+            list[str]:
+        """
+        return list(self.iter_flow_tuples(data, self.last_event_date))
+
+    def iter_flow_tuples(self, data: str, time_filter: datetime | None) -> Iterator[str]:
+        """
+        Format the records, serialized as they are produced.
+
+        Args:
+            data: str
+            time_filter: datetime | None: the records older than this date are ignored
+
+        Yields:
+            str:
         """
-        modified_result = []
-        time_filter = self.last_event_date
         for line in orjson.loads(data).get("records", []):
-            line_time = isoparse(line["time"]).astimezone(timezone.utc)
+            line_time = parse_record_time(line["time"])
 
             # If the record is too old, ignore it.
             if time_filter and line_time < time_filter:
                 continue
 
-            result = {
-                "macAddress": line["macAddress"],
-                "operationName": line["operationName"],
-                "resourceId": line["resourceId"],
-                "time": line["time"],
-            }
-
+            header = encode_fields(
+                {
+                    "macAddress": line["macAddress"],
+                    "operationName": line["operationName"],
+                    "resourceId": line["resourceId"],
+                    "time": line["time"],
+                }
+            )
+
+            # Only the last rule and the last flow tuple of the record are kept
+            fields = {}
             for property_flow in line["properties"]["flows"]:
-                result["rule"] = property_flow["rule"]
+                fields["rule"] = property_flow["rule"]
 
                 for flow in property_flow["flows"]:
-                    for flow_tuple in flow["flowTuples"]:
-                        result["flow.0"] = flow_tuple
-
-            modified_result.append(result)
+                    if flow["flowTuples"]:
+                        fields["flow.0"] = flow["flowTuples"][-1]
 
-        return [orjson.dumps(value).decode("utf-8") for value in modified_result]
+            yield f"{encode_fields(fields, header)}}}" if fields else f"{header}}}"
@@ -0,0 +1,52 @@
+"""Tests related to the blob content helpers."""
+
+import gzip
+
+from azure_helpers.io import BlobContentReader, is_gzip_compressed
+
+
+def feed_by_chunks(reader: BlobContentReader, content: bytes, chunk_size: int) -> None:
+    """
+    Feed the reader with the content split in chunks.
+
+    Args:
+        reader: BlobContentReader
+        content: bytes
+        chunk_size: int
+    """
+    for index in range(0, len(content), chunk_size):
+        reader.feed(content[index : index + chunk_size])
+
+
+def test_is_gzip_compressed():
+    assert is_gzip_compressed(gzip.compress(b"content"))
+    assert not is_gzip_compressed(b"content")
+
+
+def test_blob_content_reader_plain():
+    content = b"line 1\nline 2\n" * 100
+    reader = BlobContentReader()
+    feed_by_chunks(reader, content, 7)
+
+    assert reader.getvalue() == content
+    assert reader.size == len(content)
+    assert reader.is_compressed is False
+
+
+def test_blob_content_reader_gzip_multiple_members():
+    content = gzip.compress(b"line 1\n" * 100) + gzip.compress(b"line 2\n" * 100)
+    reader = BlobContentReader()
+    feed_by_chunks(reader, content, 11)
+
+    assert reader.getvalue() == b"line 1\n" * 100 + b"line 2\n" * 100
+    assert reader.size == len(content)
+    assert reader.is_compressed is True
+
+
+def test_blob_content_reader_without_detection():
+    content = gzip.compress(b"content")
+    reader = BlobContentReader(detect_compression=False)
+    reader.feed(content)
+
+    assert reader.getvalue() == content
+    assert reader.is_compressed is False
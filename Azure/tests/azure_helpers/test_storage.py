@@ -143,3 +143,84 @@ async def test_download_blob_with_file(wrapper, blob_content, session_faker):
     assert result is not None
 
     os.remove(result)
+
+
+@pytest.mark.asyncio
+async def test_walk_blobs(wrapper, session_faker):
+    """
+    Test listing of one level of the hierarchy.
+
+    Args:
+        wrapper: AzureBlobStorageWrapper
+        session_faker: Faker
+    """
+    client_mock = MagicMock()
+    prefix = "{0}/".format(session_faker.word())
+
+    mock_walk_blobs = MagicMock()
+    mock_walk_blobs.__aiter__.return_value = []
+    client_mock.walk_blobs.return_value = mock_walk_blobs
+
+    wrapper._client = client_mock
+
+    result = [blob async for blob in wrapper.walk_blobs(prefix)]
+
+    assert result == []
+    client_mock.walk_blobs.assert_called_once_with(name_starts_with=prefix, delimiter="/")
+
+
+@pytest.mark.asyncio
+async def test_download_blob_from_offset(wrapper, blob_content, session_faker):
+    """
+    Test get blob content from an offset.
+
+    Args:
+        wrapper: AzureBlobStorageWrapper
+        blob_content: bytes
+        session_faker: Faker
+    """
+    client_mock = MagicMock()
+
+    blob_client = AsyncMock()
+    mocked_stream = AsyncMock()
+    mocked_stream.readall.return_value = blob_content
+
+    blob_client.download_blob.return_value = mocked_stream
+
+    client_mock.get_blob_client.return_value = blob_client
+
+    wrapper._client = client_mock
+
+    result = await wrapper.download_blob(session_faker.word(), False, offset=42)
+
+    assert result == (None, blob_content)
+    blob_client.download_blob.assert_awaited_once_with(offset=42)
+
+
+@pytest.mark.asyncio
+async def test_stream_blob(wrapper, blob_content, session_faker):
+    """
+    Test stream blob content by chunks.
+
+    Args:
+        wrapper: AzureBlobStorageWrapper
+        blob_content: bytes
+        session_faker: Faker
+    """
+    client_mock = MagicMock()
+
+    blob_client = AsyncMock()
+    mocked_stream = AsyncMock()
+    mocked_stream.chunks = MagicMock()
+    mocked_stream.chunks.return_value.__aiter__.return_value = [blob_content[:10], blob_content[10:]]
+
+    blob_client.download_blob.return_value = mocked_stream
+
+    client_mock.get_blob_client.return_value = blob_client
+
+    wrapper._client = client_mock
+
+    result = [chunk async for chunk in wrapper.stream_blob(session_faker.word(), offset=10)]
+
+    assert b"".join(result) == blob_content
+    blob_client.download_blob.assert_awaited_once_with(offset=10)
@@ -0,0 +1,140 @@
+"""
+Micro-benchmark of the expansion of VNet flow logs blobs to one event per flow tuple.
+
+Compare the former path (a dict copied per flow tuple, `isoparse` per record, all the events
+serialized at the end) with the streaming path (events serialized as they are produced, from
+pre-encoded header fragments).
+
+Usage:
+    python -m tests.benchmarks.bench_flow_logs [--records 600] [--tuples 200]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import orjson
+from dateutil.parser import isoparse
+
+from connectors.blob.azure_flow_logs import AzureFlowLogsConnector
+
+
+def generate_blob(records: int, tuples: int) -> str:
+    """
+    Generate a VNet flow logs blob, with several flows and flow groups per record.
+
+    Args:
+        records: int
+        tuples: int: number of flow tuples per flow group
+
+    Returns:
+        str:
+    """
+    rng = random.Random(42)
+    start = datetime.now(timezone.utc) - timedelta(minutes=30)
+
+    def flow_tuple() -> str:
+        return "{0},10.0.0.{1},{2}.{3}.{4}.{5},{6},443,6,O,E,NX,3,767,2,1580".format(
+            int(start.timestamp() * 1000) + rng.randint(0, 60000),
+            rng.randint(1, 254),
+            rng.randint(1, 223),
+            rng.randint(0, 255),
+            rng.randint(0, 255),
+            rng.randint(1, 254),
+            rng.randint(1024, 65535),
+        )
+
+    return orjson.dumps(
+        {
+            "records": [
+                {
+                    "time": (start + timedelta(seconds=index)).strftime("%Y-%m-%dT%H:%M:%S.%f0Z"),
+                    "flowLogVersion": 4,
+                    "flowLogGUID": "66aa66aa-bb77-cc88-dd99-00ee00ee00ee",
+                    "macAddress": "112233445566",
+                    "category": "FlowLogFlowEvent",
+                    "flowLogResourceID": "/SUBSCRIPTIONS/AAAA0A0A/RESOURCEGROUPS/NETWORKWATCHERRG/FLOWLOGS/VNETFLOWLOG",
+                    "targetResourceID": "/subscriptions/aaaa0a0a/resourceGroups/myResourceGroup/virtualNetworks/myVNet",
+                    "operationName": "FlowLogFlowEvent",
+                    "flowRecords": {
+                        "flows": [
+                            {
+                                "aclID": f"aclID{acl}",
+                                "flowGroups": [
+                                    {"rule": f"Rule{rule}", "flowTuples": [flow_tuple() for _ in range(tuples)]}
+                                    for rule in range(2)
+                                ],
+                            }
+                            for acl in range(2)
+                        ]
+                    },
+                }
+                for index in range(records)
+            ]
+        }
+    ).decode("utf-8")
+
+
+def former_path(data: str, time_filter: datetime) -> list[str]:
+    """
+    Expand the blob as the connector used to.
+
+    Args:
+        data: str
+        time_filter: datetime
+
+    Returns:
+        list[str]:
+    """
+    modified_result: list[dict[str, Any]] = []
+    for record in orjson.loads(data).get("records", []):
+        record_time = isoparse(record["time"]).astimezone(timezone.utc)
+        if time_filter and record_time < time_filter:
+            continue
+
+        result = {
+            "time": record_time,
+            "flowLogVersion": record["flowLogVersion"],
+            "flowLogGUID": record["flowLogGUID"],
+            "macAddress": record["macAddress"],
+            "operationName": record["operationName"],
+        }
+        for flow in record.get("flowRecords", {}).get("flows", []):
+            for group in flow.get("flowGroups", []):
+                for entry in group.get("flowTuples", []):
+                    modified_result.append({**result, "aclID": flow["aclID"], "rule": group["rule"], "flow.0": entry})
+
+    return [orjson.dumps(value).decode("utf-8") for value in modified_result]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=600)
+    parser.add_argument("--tuples", type=int, default=200)
+    args = parser.parse_args()
+
+    data = generate_blob(args.records, args.tuples)
+    time_filter = datetime.now(timezone.utc) - timedelta(hours=1)
+    print(f"{args.records} records, {len(data) / 1024 / 1024:.1f} MiB")
+
+    streaming_path = AzureFlowLogsConnector.iter_flow_tuples
+    assert former_path(data, time_filter) == list(streaming_path(None, data, time_filter))  # type: ignore[arg-type]
+
+    for name, function in (
+        ("former", lambda: former_path(data, time_filter)),
+        ("streaming", lambda: list(streaming_path(None, data, time_filter))),  # type: ignore[arg-type]
+    ):
+        durations = []
+        for _ in range(5):
+            start = time.perf_counter()
+            count = len(function())
+            durations.append(time.perf_counter() - start)
+
+        duration = min(durations)
+        print(f"{name:>10}: {count} events in {duration:.3f}s ({count / duration:.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
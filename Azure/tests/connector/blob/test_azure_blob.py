@@ -1,13 +1,13 @@
 """Tests related to connector."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from gzip import GzipFile
-from tempfile import NamedTemporaryFile
-from unittest.mock import AsyncMock, MagicMock
+from io import BytesIO
+from unittest.mock import MagicMock
 
-import aiofiles
 import pytest
-from azure.storage.blob import BlobProperties
+from azure.storage.blob import BlobProperties, BlobType
 from sekoia_automation.module import Module
 
 from connectors.blob import AzureBlobConnectorConfig
@@ -121,10 +121,10 @@ async def test_azure_blob_get_azure_blob_data_1(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (None, blob_content)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [blob_content]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -153,9 +153,9 @@ async def test_azure_blob_get_azure_blob_data_2(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, dir="") as file:
-        file_name = str(file.name)
-        await file.write(blob_content)
+    # Split the content in two chunks
+    middle = len(blob_content) // 2
+    chunks = [blob_content[:middle], blob_content[middle:]]
 
     azure_blob_storage_wrapper = MagicMock()
 
@@ -170,10 +170,10 @@ async def test_azure_blob_get_azure_blob_data_2(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = chunks
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -202,8 +202,8 @@ async def test_azure_blob_get_azure_blob_data_3(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    with NamedTemporaryFile("wb", delete=False, dir="") as file, GzipFile(fileobj=file, mode="w+") as gfile:
-        file_name = str(file.name)
+    buffer = BytesIO()
+    with GzipFile(fileobj=buffer, mode="w+") as gfile:
         gfile.write(blob_content)
 
     azure_blob_storage_wrapper = MagicMock()
@@ -219,10 +219,10 @@ async def test_azure_blob_get_azure_blob_data_3(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [buffer.getvalue()]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -251,8 +251,8 @@ async def test_azure_blob_get_azure_blob_data_4(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    with NamedTemporaryFile("wb", delete=False, dir="") as file, GzipFile(fileobj=file, mode="w+") as gfile:
-        file_name = str(file.name)
+    buffer = BytesIO()
+    with GzipFile(fileobj=buffer, mode="w+") as gfile:
         gfile.write(blob_content)
         gfile.write(b"\n")
         gfile.write(b"\n")
@@ -277,10 +277,10 @@ async def test_azure_blob_get_azure_blob_data_4(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [buffer.getvalue()]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -335,3 +335,284 @@ async def test_azure_blob_get_most_recent_blob(
     blobs_list = [n async for n in connector.get_most_recent_blobs(lower_bound=current_date + timedelta(minutes=2))]
 
     assert blobs_list == [properties2, properties3]
+
+
+def make_paged(items: list) -> MagicMock:
+    """
+    Mock an async paged result.
+
+    Args:
+        items: list
+
+    Returns:
+        MagicMock:
+    """
+    paged = MagicMock()
+    paged.__aiter__.return_value = items
+
+    return paged
+
+
+def make_blob(name: str, last_modified: datetime, **kwargs) -> BlobProperties:
+    """
+    Build blob properties.
+
+    Args:
+        name: str
+        last_modified: datetime
+
+    Returns:
+        BlobProperties:
+    """
+    properties = BlobProperties()
+    properties.name = name
+    properties.last_modified = last_modified
+    for key, value in kwargs.items():
+        setattr(properties, key, value)
+
+    return properties
+
+
+def test_azure_blob_partition_prefixes(connector: AzureBlobConnector):
+    """
+    Test the prefixes of the hourly partitions.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    lower_bound = datetime(2024, 12, 31, 22, 42, tzinfo=timezone.utc)
+    upper_bound = datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc)
+
+    assert connector.partition_prefixes("root/", lower_bound, upper_bound) == [
+        "root/y=2024/m=12/d=31/h=22/",
+        "root/y=2024/m=12/d=31/h=23/",
+        "root/y=2025/m=01/d=01/h=00/",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_get_partition_roots(connector: AzureBlobConnector):
+    """
+    Test the discovery of the partitioned directories.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    hierarchy = {
+        None: [make_blob("insights-logs/", None), make_blob("readme.txt", None)],
+        "insights-logs/": [make_blob("insights-logs/nsg1/", None), make_blob("insights-logs/nsg2/", None)],
+        "insights-logs/nsg1/": [make_blob("insights-logs/nsg1/y=2024/", None)],
+        "insights-logs/nsg2/": [
+            make_blob("insights-logs/nsg2/y=2024/", None),
+            make_blob("insights-logs/nsg2/y=2025/", None),
+        ],
+    }
+
+    azure_blob_storage_wrapper = MagicMock()
+    azure_blob_storage_wrapper.walk_blobs.side_effect = lambda name_starts_with: make_paged(
+        hierarchy[name_starts_with]
+    )
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    roots = [root async for root in connector.get_partition_roots()]
+
+    assert roots == ["insights-logs/nsg1/", "insights-logs/nsg2/"]
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_get_azure_blob_data_partitioned(connector: AzureBlobConnector):
+    """
+    Test that only the recent partitions are listed and the cursor is saved per partitioned directory.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    connector.configuration.partitioned_discovery = True
+    current_date = datetime.now(timezone.utc).replace(microsecond=0)
+    cursor = current_date - timedelta(minutes=10)
+
+    with connector.context as cache:
+        cache["partitions"] = {"nsg/": cursor.isoformat()}
+
+    old_blob = make_blob("nsg/old.json", cursor - timedelta(minutes=1))
+    new_blob = make_blob("nsg/new.json", current_date)
+
+    azure_blob_storage_wrapper = MagicMock()
+    hierarchy = {None: [make_blob("nsg/", None)], "nsg/": [make_blob("nsg/y=2024/", None)]}
+    azure_blob_storage_wrapper.walk_blobs.side_effect = lambda name_starts_with: make_paged(
+        hierarchy[name_starts_with]
+    )
+    azure_blob_storage_wrapper.list_blobs.side_effect = lambda name_starts_with: make_paged(
+        [old_blob, new_blob]
+        if name_starts_with == connector.partition_prefixes("nsg/", current_date, current_date)[0]
+        else []
+    )
+    azure_blob_storage_wrapper.stream_blob.return_value = make_paged([b"event 1\nevent 2\n"])
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    result = await connector.get_azure_blob_data()
+
+    assert result == ["event 1", "event 2"]
+    listed_prefixes = [
+        call.kwargs["name_starts_with"] for call in azure_blob_storage_wrapper.list_blobs.call_args_list
+    ]
+    assert listed_prefixes == connector.partition_prefixes("nsg/", cursor - timedelta(hours=1), current_date)
+    assert azure_blob_storage_wrapper.stream_blob.call_count == 1
+    assert connector.partition_cursors == {"nsg/": current_date}
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_get_azure_blob_data_append_blob(connector: AzureBlobConnector):
+    """
+    Test that only the content appended to an append blob since the last read is downloaded.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    current_date = datetime.now(timezone.utc).replace(microsecond=0)
+    created_at = current_date - timedelta(days=2)
+    first_content = b"event 1\nevent 2\n"
+    second_content = b"event 3\n"
+
+    azure_blob_storage_wrapper = MagicMock()
+    azure_blob_storage_wrapper.stream_blob.return_value = make_paged([first_content])
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    blob = make_blob(
+        "logs.json",
+        current_date - timedelta(minutes=5),
+        blob_type=BlobType.APPENDBLOB,
+        creation_time=created_at,
+        size=len(first_content),
+    )
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged([blob])
+
+    assert await connector.get_azure_blob_data() == ["event 1", "event 2"]
+    assert azure_blob_storage_wrapper.stream_blob.call_args.kwargs["offset"] is None
+
+    # The blob grew
+    blob = make_blob(
+        "logs.json",
+        current_date,
+        blob_type=BlobType.APPENDBLOB,
+        creation_time=created_at,
+        size=len(first_content) + len(second_content),
+    )
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged([blob])
+    azure_blob_storage_wrapper.stream_blob.return_value = make_paged([second_content])
+
+    assert await connector.get_azure_blob_data() == ["event 3"]
+    assert azure_blob_storage_wrapper.stream_blob.call_args.kwargs["offset"] == len(first_content)
+    assert connector.append_blob_offsets["logs.json"]["offset"] == len(first_content) + len(second_content)
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_get_azure_blob_data_append_blob_partial_line(connector: AzureBlobConnector):
+    """
+    Test that a line being appended to an append blob is only read once complete.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    current_date = datetime.now(timezone.utc).replace(microsecond=0)
+    created_at = current_date - timedelta(days=2)
+    # the multi-byte character is split between the two reads
+    content = "event 1\névénement 2 é\n".encode()
+    first_content = content[:12]
+
+    azure_blob_storage_wrapper = MagicMock()
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    blob = make_blob(
+        "logs.json",
+        current_date - timedelta(minutes=5),
+        blob_type=BlobType.APPENDBLOB,
+        creation_time=created_at,
+        size=len(first_content),
+    )
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged([blob])
+    azure_blob_storage_wrapper.stream_blob.return_value = make_paged([first_content])
+
+    assert await connector.get_azure_blob_data() == ["event 1"]
+    assert connector.append_blob_offsets["logs.json"]["offset"] == len(b"event 1\n")
+
+    # The line is complete
+    blob = make_blob(
+        "logs.json",
+        current_date,
+        blob_type=BlobType.APPENDBLOB,
+        creation_time=created_at,
+        size=len(content),
+    )
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged([blob])
+    azure_blob_storage_wrapper.stream_blob.return_value = make_paged([content[len(b"event 1\n") :]])
+
+    assert await connector.get_azure_blob_data() == ["événement 2 é"]
+    assert azure_blob_storage_wrapper.stream_blob.call_args.kwargs["offset"] == len(b"event 1\n")
+    assert connector.append_blob_offsets["logs.json"]["offset"] == len(content)
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_get_azure_blob_data_concurrent_downloads_keep_order(connector: AzureBlobConnector):
+    """
+    Test that the blobs downloaded concurrently are forwarded in the order of the listing.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    connector.max_concurrent_downloads = 3
+    current_date = datetime.now(timezone.utc).replace(microsecond=0)
+    blobs = [make_blob(f"blob-{index}", current_date - timedelta(minutes=10 - index)) for index in range(5)]
+
+    async def stream_blob(blob_name: str, offset: int | None = None):
+        # The first blobs are the slowest to download
+        await asyncio.sleep(0.01 * (5 - int(blob_name.split("-")[1])))
+        yield f"{blob_name}\n".encode()
+
+    azure_blob_storage_wrapper = MagicMock()
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged(blobs)
+    azure_blob_storage_wrapper.stream_blob = stream_blob
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    result = await connector.get_azure_blob_data()
+
+    assert result == [blob.name for blob in blobs]
+    assert connector.last_event_date == blobs[-1].last_modified
+
+
+@pytest.mark.asyncio
+async def test_azure_blob_read_new_blobs_bounds_concurrent_bytes(connector: AzureBlobConnector):
+    """
+    Test that the total size of the concurrent downloads is bounded.
+
+    Args:
+        connector: AzureBlobConnector
+    """
+    connector.max_concurrent_downloads = 10
+    connector.max_concurrent_download_bytes = 250
+    current_date = datetime.now(timezone.utc).replace(microsecond=0)
+    blobs = [
+        make_blob(f"blob-{index}", current_date - timedelta(minutes=10 - index), size=100) for index in range(5)
+    ] + [make_blob("blob-large", current_date, size=1000)]
+
+    in_progress: set[str] = set()
+    max_in_progress = 0
+
+    async def stream_blob(blob_name: str, offset: int | None = None):
+        nonlocal max_in_progress
+        in_progress.add(blob_name)
+        max_in_progress = max(max_in_progress, len(in_progress))
+        await asyncio.sleep(0.01)
+        in_progress.discard(blob_name)
+        yield f"{blob_name}\n".encode()
+
+    azure_blob_storage_wrapper = MagicMock()
+    azure_blob_storage_wrapper.list_blobs.return_value = make_paged(blobs)
+    azure_blob_storage_wrapper.stream_blob = stream_blob
+    connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
+
+    result = await connector.get_azure_blob_data()
+
+    # the blob larger than the limit is still read
+    assert result == [blob.name for blob in blobs]
+    assert max_in_progress == 2
@@ -2,10 +2,10 @@
 
 from datetime import datetime, timedelta, timezone
 from gzip import GzipFile
-from tempfile import NamedTemporaryFile
-from unittest.mock import AsyncMock, MagicMock
+from io import BytesIO
+from unittest.mock import MagicMock
 
-import aiofiles
+import orjson
 import pytest
 from azure.storage.blob import BlobProperties
 from sekoia_automation.module import Module
@@ -100,10 +100,10 @@ async def test_flow_logs_get_network_watcher_data_1(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (None, flow_logs_content)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [flow_logs_content]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -132,9 +132,9 @@ async def test_flow_logs_get_network_watcher_data_2(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, dir="") as file:
-        file_name = str(file.name)
-        await file.write(flow_logs_content)
+    # Split the content in two chunks
+    middle = len(flow_logs_content) // 2
+    chunks = [flow_logs_content[:middle], flow_logs_content[middle:]]
 
     azure_blob_storage_wrapper = MagicMock()
 
@@ -149,10 +149,10 @@ async def test_flow_logs_get_network_watcher_data_2(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = chunks
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -180,8 +180,8 @@ async def test_flow_logs_get_network_watcher_data_3(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    with NamedTemporaryFile("wb", delete=False, dir="") as file, GzipFile(fileobj=file, mode="w+") as gfile:
-        file_name = str(file.name)
+    buffer = BytesIO()
+    with GzipFile(fileobj=buffer, mode="w+") as gfile:
         gfile.write(flow_logs_content)
 
     azure_blob_storage_wrapper = MagicMock()
@@ -197,13 +197,74 @@ async def test_flow_logs_get_network_watcher_data_3(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [buffer.getvalue()]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
     result = await connector.get_azure_blob_data()
 
     assert result == connector.filter_blob_data(flow_logs_content.decode("utf-8"))
+
+
+def test_flow_logs_filter_blob_data(connector: AzureFlowLogsConnector, flow_logs_content, current_datetime):
+    """
+    Test the expansion of the records to one event per flow tuple.
+
+    Args:
+        connector: AzureFlowLogsConnector
+        flow_logs_content: bytes
+        current_datetime: datetime
+    """
+    result = connector.filter_blob_data(flow_logs_content.decode("utf-8"))
+
+    header = {
+        "time": current_datetime.astimezone(timezone.utc),
+        "flowLogVersion": 4,
+        "flowLogGUID": "flowLogGUID1",
+        "macAddress": "112233445566",
+        "operationName": "FlowLogFlowEvent",
+    }
+    expected = [
+        {**header, "aclID": "aclID1", "rule": "DefaultRule_AllowInternetOutBound", "flow.0": entry}
+        for entry in (
+            "1663146003599,1.2.3.4,192.0.2.180,23956,443,6,O,B,NX,0,0,0,0",
+            "1663146003606,1.2.3.4,192.0.2.180,23956,443,6,O,E,NX,3,767,2,1580",
+        )
+    ]
+    expected += [
+        {**header, "aclID": "aclID2", "rule": "BlockHighRiskTCPPortsFromInternet", "flow.0": entry}
+        for entry in (
+            "1663145998065,8.7.6.5,1.2.3.4,55188,22,6,I,D,NX,0,0,0,0",
+            "1663146005503,2.3.4.5,1.2.3.4,35276,119,6,I,D,NX,0,0,0,0",
+        )
+    ]
+    expected += [
+        {**header, "aclID": "aclID2", "rule": "Internet", "flow.0": entry}
+        for entry in (
+            "1663145989563,3.4.5.6,1.2.3.4,50557,44357,6,I,D,NX,0,0,0,0",
+            "1663145989679,1.2.3.81,1.2.3.4,62797,35945,6,I,D,NX,0,0,0,0",
+        )
+    ]
+
+    assert result == [orjson.dumps(value).decode("utf-8") for value in expected]
+
+
+def test_flow_logs_iter_flow_tuples_time_filter(
+    connector: AzureFlowLogsConnector, flow_logs_content, current_datetime
+):
+    """
+    Test that the records older than the time filter are ignored.
+
+    Args:
+        connector: AzureFlowLogsConnector
+        flow_logs_content: bytes
+        current_datetime: datetime
+    """
+    data = flow_logs_content.decode("utf-8")
+    record_time = current_datetime.astimezone(timezone.utc)
+
+    assert len(list(connector.iter_flow_tuples(data, record_time - timedelta(minutes=1)))) == 6
+    assert list(connector.iter_flow_tuples(data, record_time + timedelta(minutes=1))) == []
@@ -2,10 +2,10 @@
 
 from datetime import datetime, timedelta, timezone
 from gzip import GzipFile
-from tempfile import NamedTemporaryFile
-from unittest.mock import AsyncMock, MagicMock
+from io import BytesIO
+from unittest.mock import MagicMock
 
-import aiofiles
+import orjson
 import pytest
 from azure.storage.blob import BlobProperties
 from sekoia_automation.module import Module
@@ -99,10 +99,10 @@ async def test_network_watcher_get_network_watcher_data_1(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (None, blob_content)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [blob_content]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -131,9 +131,9 @@ async def test_network_watcher_get_network_watcher_data_2(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, dir="") as file:
-        file_name = str(file.name)
-        await file.write(blob_content)
+    # Split the content in two chunks
+    middle = len(blob_content) // 2
+    chunks = [blob_content[:middle], blob_content[middle:]]
 
     azure_blob_storage_wrapper = MagicMock()
 
@@ -148,10 +148,10 @@ async def test_network_watcher_get_network_watcher_data_2(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = chunks
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
@@ -179,8 +179,8 @@ async def test_network_watcher_get_network_watcher_data_3(
     with connector.context as cache:
         cache["last_event_date"] = (current_date - timedelta(days=1)).isoformat()
 
-    with NamedTemporaryFile("wb", delete=False, dir="") as file, GzipFile(fileobj=file, mode="w+") as gfile:
-        file_name = str(file.name)
+    buffer = BytesIO()
+    with GzipFile(fileobj=buffer, mode="w+") as gfile:
         gfile.write(blob_content)
 
     azure_blob_storage_wrapper = MagicMock()
@@ -196,13 +196,42 @@ async def test_network_watcher_get_network_watcher_data_3(
 
     azure_blob_storage_wrapper.list_blobs.return_value = mock_list_blobs
 
-    download_blob_result = AsyncMock()
-    download_blob_result.return_value = (file_name, None)
+    mock_stream_blob = MagicMock()
+    mock_stream_blob.__aiter__.return_value = [buffer.getvalue()]
 
-    azure_blob_storage_wrapper.download_blob = download_blob_result
+    azure_blob_storage_wrapper.stream_blob.return_value = mock_stream_blob
 
     connector._azure_blob_storage_wrapper = azure_blob_storage_wrapper
 
     result = await connector.get_azure_blob_data()
 
     assert result == connector.filter_blob_data(blob_content.decode("utf-8"))
+
+
+def test_network_watcher_filter_blob_data(connector: AzureNetworkWatcherConnector, blob_content):
+    """
+    Test the formatting of the records.
+
+    Args:
+        connector: AzureNetworkWatcherConnector
+        blob_content: bytes
+    """
+    data = blob_content.decode("utf-8")
+
+    expected = []
+    for line in orjson.loads(data)["records"]:
+        result = {
+            "macAddress": line["macAddress"],
+            "operationName": line["operationName"],
+            "resourceId": line["resourceId"],
+            "time": line["time"],
+        }
+        for property_flow in line["properties"]["flows"]:
+            result["rule"] = property_flow["rule"]
+            for flow in property_flow["flows"]:
+                for flow_tuple in flow["flowTuples"]:
+                    result["flow.0"] = flow_tuple
+
+        expected.append(orjson.dumps(result).decode("utf-8"))
+
+    assert list(connector.iter_flow_tuples(data, None)) == expected
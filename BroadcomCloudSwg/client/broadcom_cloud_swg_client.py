@@ -1,8 +1,10 @@
 """Contains BroadcomCloudSwgClient."""
 
+import re
+from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from itertools import groupby
+from functools import lru_cache
 from typing import Any, AsyncGenerator, Tuple
 
 import orjson
@@ -15,6 +17,24 @@ from multidict import CIMultiDictProxy
 from sekoia_automation.aio.helpers.http.utils import save_aiohttp_response
 from yarl import URL
 
+# An ELFF value is either quoted (up to the closing quote followed by a space or the end of line) or space delimited
+ELFF_VALUE_PATTERN = re.compile(r'"(.*?)(?:"(?= )|"?$)|([^ ]+)')
+
+
+@lru_cache(maxsize=65536)
+def _strptime(value: str, date_format: str) -> datetime:
+    """
+    Parse a datetime string. The same timestamps are repeated a lot in the log files, so they are parsed only once.
+
+    Args:
+        value: str
+        date_format: str
+
+    Returns:
+        datetime:
+    """
+    return datetime.strptime(value, date_format)
+
 
 class BroadcomCloudSwgClient(object):
     """BroadcomCloudSwgClient."""
@@ -316,38 +336,10 @@ class BroadcomCloudSwgClient(object):
         Returns:
             dict[str, str]
         """
-        _fields = fields or cls.full_list_of_elff_fields()
-        _str_to_work = value.rstrip("\n")
-        _values = []
-
-        delimiter = " "
-        while len(_str_to_work) > 1:
-            try:
-                end_index = _str_to_work.index(delimiter)
-            except ValueError:
-                end_index = len(_str_to_work)
-
-            if end_index == 0:
-                _str_to_work = _str_to_work[1:]
+        _fields = fields or cls.default_elff_fields()
+        values = (quoted or plain for quoted, plain in ELFF_VALUE_PATTERN.findall(value.rstrip("\n")))
 
-                continue
-
-            _field_value = _str_to_work[0:end_index]
-            _str_to_work = _str_to_work[end_index + 1 :]
-
-            if _str_to_work.startswith('"'):
-                delimiter = '" '
-            else:
-                delimiter = " "
-
-            if _field_value.startswith('"'):
-                _values.append(_field_value[1:])
-            else:
-                _values.append(_field_value)
-
-        result = dict(zip(_fields, _values))
-
-        return {key: result.get(key, "") for key in result.keys() if result.get(key) != "-"}
+        return {key: field_value for key, field_value in zip(_fields, values) if field_value != "-"}
 
     async def perform_download_file_request(
         self, url: str, headers: dict[str, str]
@@ -406,6 +398,17 @@ class BroadcomCloudSwgClient(object):
 
         return None
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def default_elff_fields(cls) -> tuple[str, ...]:
+        """
+        Complete list of fields available in elff log file, built once.
+
+        Returns:
+            tuple[str, ...]:
+        """
+        return tuple(cls.full_list_of_elff_fields())
+
     @classmethod
     def full_list_of_elff_fields(cls) -> list[str]:
         """
@@ -565,52 +568,46 @@ class BroadcomCloudSwgClient(object):
                 item.get("cs-uri-path", ""),
             )
 
-        # Sorting the data is important for the groupby to work correctly
-        sorted_data = sorted(data, key=_group_key)
-
-        grouped_data = {key: list(group) for key, group in groupby(sorted_data, key=_group_key)}
+        grouped_data: dict[tuple[Any, ...], list[dict[str, Any]]] = defaultdict(list)
+        for item in data:
+            grouped_data[_group_key(item)].append(item)
 
         result = []
-        for key, group in grouped_data.items():
-            if len(group) > 0:
-                time_taken = int(group[0].get("time-taken", 0))
-                start_time = datetime.strptime(group[0].get("time", ""), cls._time_format)
-                end_time = datetime.strptime(group[0].get("time", ""), cls._time_format)
-                count = 0
-
-                for entry in group:
-                    entry_time_taken = int(entry.get("time-taken", 0))
-                    if time_taken < entry_time_taken:
-                        time_taken = entry_time_taken
-
-                    entry_start_time = datetime.strptime(
-                        entry.get("start-time") or entry.get("time", ""), cls._time_format
-                    )
-
-                    entry_end_time = datetime.strptime(
-                        entry.get("end-time") or entry.get("time", ""), cls._time_format
-                    )
-
-                    if start_time > entry_start_time:
-                        start_time = entry_start_time
-
-                    if end_time < entry_end_time:
-                        end_time = entry_end_time
-
-                    if entry.get("count", 0) != 0:
-                        count += entry.get("count", 0)
-                    else:
-                        count += 1
-
-                result.append(
-                    {
-                        **group[0],
-                        "count": count,
-                        "time-taken": time_taken,
-                        "start-time": start_time.strftime(cls._time_format),
-                        "end-time": end_time.strftime(cls._time_format),
-                    }
-                )
+        # Only the keys of the groups are sorted, the entries of each group keep their order
+        for key in sorted(grouped_data):
+            group = grouped_data[key]
+            time_taken = int(group[0].get("time-taken", 0))
+            start_time = end_time = _strptime(group[0].get("time", ""), cls._time_format)
+            count = 0
+
+            for entry in group:
+                entry_time_taken = int(entry.get("time-taken", 0))
+                if time_taken < entry_time_taken:
+                    time_taken = entry_time_taken
+
+                entry_start_time = _strptime(entry.get("start-time") or entry.get("time", ""), cls._time_format)
+                entry_end_time = _strptime(entry.get("end-time") or entry.get("time", ""), cls._time_format)
+
+                if start_time > entry_start_time:
+                    start_time = entry_start_time
+
+                if end_time < entry_end_time:
+                    end_time = entry_end_time
+
+                if entry.get("count", 0) != 0:
+                    count += entry.get("count", 0)
+                else:
+                    count += 1
+
+            result.append(
+                {
+                    **group[0],
+                    "count": count,
+                    "time-taken": time_taken,
+                    "start-time": start_time.strftime(cls._time_format),
+                    "end-time": end_time.strftime(cls._time_format),
+                }
+            )
 
         return result
 
@@ -626,7 +623,7 @@ class BroadcomCloudSwgClient(object):
             datetime | None
         """
         if data.get("date") and data.get("time"):
-            return datetime.strptime(
+            return _strptime(
                 "{0} {1}".format(data.get("date"), data.get("time")),
                 "{0} {1}".format(cls._date_format, cls._time_format),
             )
@@ -34,6 +34,10 @@ class BroadcomCloudSwgConnectorConfig(DefaultConnectorConfiguration):
     frequency: int = 60
 
 
+# Number of parsed records sent at once to the consumers
+QUEUE_BATCH_SIZE = 1000
+
+
 @dataclass
 class DatetimeRange(object):
 
@@ -228,7 +232,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
         return self._broadcom_cloud_swg_client
 
-    async def consume_file_events(self, queue: Queue[dict[str, str] | None], tag: str | None = None) -> int:
+    async def consume_file_events(self, queue: Queue[list[dict[str, str]] | None], tag: str | None = None) -> int:
         """
         Consumer function for specified queue with optional index of consumer.
 
@@ -237,7 +241,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
         Provides total amount of messages that where pushed to intake.
 
         Args:
-            queue: Queue[dict[str, str] | None]
+            queue: Queue[list[dict[str, str]] | None]: batches of parsed records
             tag: str | None = None
 
         Returns:
@@ -249,14 +253,14 @@ class BroadcomCloudSwgConnector(AsyncConnector):
         result = 0
 
         while True:
-            item = await queue.get()
+            batch = await queue.get()
             queue.task_done()
 
             # It means that producer finished with producing messages.
-            if item is None:
+            if batch is None:
                 break
 
-            data_to_push.append(item)
+            data_to_push.extend(batch)
 
             if len(data_to_push) >= self.configuration.chunk_size:  # pragma: no cover
                 result += len(
@@ -285,10 +289,14 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
     @staticmethod
     async def produce_file_to_queue(
-        file_path: str, queue: Queue[dict[str, str] | None], date_range: DatetimeRange, consumers_count: int = 1
+        file_path: str,
+        queue: Queue[list[dict[str, str]] | None],
+        date_range: DatetimeRange,
+        consumers_count: int = 1,
+        batch_size: int = QUEUE_BATCH_SIZE,
     ) -> DatetimeRange:
         """
-        Reads zipped archive line by line and produce parsed messages to queue.
+        Reads zipped archive line by line and produce parsed messages to queue, by batches.
 
         As result after producing we get new lowest and highest datetime.
 
@@ -297,6 +305,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
             queue: Queue
             consumers_count: int
             date_range: DatetimeRange
+            batch_size: int
 
         Returns:
             DatetimeRange:
@@ -304,6 +313,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
         headers = None
         total_produced = 0
         total_skipped = 0
+        batch: list[dict[str, str]] = []
 
         new_date_time_range: DatetimeRange = date_range.duplicate()
 
@@ -341,12 +351,19 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
                         new_date_time_range = new_date_time_range.update_with(event_date)
 
-                    await queue.put(line_as_dict)
+                    batch.append(line_as_dict)
                     total_produced += 1
 
+                    if len(batch) >= batch_size:
+                        await queue.put(batch)
+                        batch = []
+
         except Exception as e:  # pragma: no cover
             logger.error("File {0}: Error during zip file processing: {1}".format(file_path, str(e)))
 
+        if batch:
+            await queue.put(batch)
+
         # Before pushing to queue None we should wait until all messages in queue are processed
         await queue.join()
 
@@ -434,7 +451,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
         if local_file_name is not None:
             logger.info("File {0}: Start to decompress and process zip file".format(local_file_name))
 
-            queue: Queue[dict[str, str] | None] = Queue()
+            queue: Queue[list[dict[str, str]] | None] = Queue()
             consumers_amount = int(os.getenv("BROADCOM_CONSUMERS_COUNT", 4))
             processed_result: Any = await asyncio.gather(
                 self.produce_file_to_queue(local_file_name, queue, DatetimeRange(), consumers_amount),
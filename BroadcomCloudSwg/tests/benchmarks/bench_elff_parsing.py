@@ -0,0 +1,194 @@
+"""
+Benchmark of the processing of Cloud SWG access log archives.
+
+Generate a sample archive of ELFF access logs, then measure:
+- the former tokenizer (slicing the line value after value) against the compiled one
+- the whole pipeline, from the archive to the consumers, with the records queued by batches
+
+Usage:
+    python -m tests.benchmarks.bench_elff_parsing [--size-mb 300] [--consumers 3]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+import zipfile
+from asyncio import Queue
+from tempfile import mkdtemp
+from types import SimpleNamespace
+from typing import Any
+
+from client.broadcom_cloud_swg_client import BroadcomCloudSwgClient
+from connectors.broadcom_cloud_swg_connector import BroadcomCloudSwgConnector, DatetimeRange
+from utils import files as file_utils
+
+FIELDS = (
+    "x-bluecoat-request-tenant-id date time x-bluecoat-appliance-name time-taken c-ip cs-userdn cs-auth-groups "
+    "x-exception-id sc-filter-result cs-categories cs(Referer) sc-status s-action cs-method rs(Content-Type) "
+    "cs-uri-scheme cs-host cs-uri-port cs-uri-path cs-uri-query cs-uri-extension cs(User-Agent) s-ip sc-bytes "
+    "cs-bytes x-virus-id x-bluecoat-location-id x-bluecoat-location-name x-bluecoat-access-type r-ip "
+    "r-supplier-country x-rs-certificate-validate-status x-rs-connection-negotiated-ssl-version "
+    "x-rs-connection-negotiated-cipher x-client-agent-type x-client-os x-bluecoat-transaction-uuid"
+)
+
+
+def generate_archive(directory: str, size_mb: int) -> str:
+    """
+    Generate a zipped ELFF log file of about `size_mb` uncompressed megabytes.
+
+    Args:
+        directory: str
+        size_mb: int
+
+    Returns:
+        str: path of the archive
+    """
+    rng = random.Random(42)
+    log_path = os.path.join(directory, "access.log")
+    archive_path = os.path.join(directory, "access.zip")
+
+    with open(log_path, "w") as log_file:
+        log_file.write("#Software: SGOS 6.7\n#Fields: {0}\n".format(FIELDS))
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            second = rng.randint(0, 3599)
+            line = (
+                '18050 2023-01-22 05:{0:02d}:{1:02d} "DP5-ACNSH2_proxysg1" {2} 10.{3}.{4}.{5} ADSYSTRA\\user{6} - - '
+                'OBSERVED "Technology/Internet" - 200 TCP_NC_MISS GET text/html https host{7}.example.com 443 '
+                '/path/{8} ?q={9} - "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36" 1.2.3.4 {10} '
+                '{11} - 0 "client" client_connector 5.6.7.8 "Singapore" CERT_VALID TLSv1.2 ECDHE-RSA wss-agent '
+                '"Windows 10" {12:032x}\n'
+            ).format(
+                second // 60,
+                second % 60,
+                rng.randint(1, 5000),
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+                rng.randint(1, 254),
+                rng.randint(0, 500),
+                rng.randint(0, 10000),
+                rng.randint(0, 10**6),
+                rng.randint(0, 10**6),
+                rng.randint(0, 10**6),
+                rng.randint(0, 10**5),
+                rng.getrandbits(128),
+            )
+            log_file.write(line)
+            written += len(line)
+
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(log_path, "access.log")
+
+    os.remove(log_path)
+
+    return archive_path
+
+
+def former_parse_input_string(value: str, fields: list[str]) -> dict[str, str]:
+    """
+    Tokenize the line as the client used to.
+
+    Args:
+        value: str
+        fields: list[str]
+
+    Returns:
+        dict[str, str]:
+    """
+    _str_to_work = value.rstrip("\n")
+    _values = []
+
+    delimiter = " "
+    while len(_str_to_work) > 1:
+        try:
+            end_index = _str_to_work.index(delimiter)
+        except ValueError:
+            end_index = len(_str_to_work)
+
+        if end_index == 0:
+            _str_to_work = _str_to_work[1:]
+
+            continue
+
+        _field_value = _str_to_work[0:end_index]
+        _str_to_work = _str_to_work[end_index + 1 :]
+
+        delimiter = '" ' if _str_to_work.startswith('"') else " "
+        _values.append(_field_value[1:] if _field_value.startswith('"') else _field_value)
+
+    result = dict(zip(fields, _values))
+
+    return {key: result.get(key, "") for key in result.keys() if result.get(key) != "-"}
+
+
+async def read_lines(archive_path: str) -> list[str]:
+    return [line async for line in file_utils.read_zip_lines(archive_path) if line and not line.startswith("#")]
+
+
+async def run_pipeline(archive_path: str, consumers: int) -> int:
+    """
+    Produce the records of the archive to consumers that serialize them, without pushing them to an intake.
+
+    Args:
+        archive_path: str
+        consumers: int
+
+    Returns:
+        int: number of records
+    """
+
+    async def push_data_to_intakes(events: list[str]) -> list[str]:
+        return events
+
+    connector: Any = SimpleNamespace(
+        configuration=SimpleNamespace(chunk_size=10000), push_data_to_intakes=push_data_to_intakes
+    )
+    queue: Queue[list[dict[str, str]] | None] = Queue()
+    results = await asyncio.gather(
+        BroadcomCloudSwgConnector.produce_file_to_queue(archive_path, queue, DatetimeRange(), consumers),
+        *[BroadcomCloudSwgConnector.consume_file_events(connector, queue, str(index)) for index in range(consumers)],
+    )
+
+    return sum(results[1:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--consumers", type=int, default=3)
+    args = parser.parse_args()
+
+    # the pipeline logs every batch pushed to the consumers
+    from loguru import logger
+
+    logger.remove()
+
+    archive_path = generate_archive(mkdtemp(), args.size_mb)
+    print(f"Archive of {args.size_mb} MiB of logs: {os.path.getsize(archive_path) / 1024 / 1024:.1f} MiB compressed")
+
+    lines = asyncio.run(read_lines(archive_path))
+    fields = FIELDS.split(" ")
+    assert former_parse_input_string(lines[0], fields) == BroadcomCloudSwgClient.parse_input_string(lines[0], fields)
+
+    for name, parse in (
+        ("former", former_parse_input_string),
+        ("compiled", BroadcomCloudSwgClient.parse_input_string),
+    ):
+        start = time.perf_counter()
+        for line in lines:
+            parse(line, fields)
+        duration = time.perf_counter() - start
+        print(f"{name:>10}: {len(lines)} lines in {duration:.3f}s ({len(lines) / duration:.0f} lines/s)")
+
+    start = time.perf_counter()
+    count = asyncio.run(run_pipeline(archive_path, args.consumers))
+    duration = time.perf_counter() - start
+    print(f"{'pipeline':>10}: {count} records in {duration:.3f}s ({count / duration:.0f} records/s)")
+
+    os.remove(archive_path)
+
+
+if __name__ == "__main__":
+    main()
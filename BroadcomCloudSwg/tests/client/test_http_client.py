@@ -321,6 +321,21 @@ async def test_parse_input_string():
     assert result == expected_output
 
 
+@pytest.mark.asyncio
+async def test_parse_input_string_quoted_values():
+    """Test parse_input_string method with quoted values."""
+    fields = ["field1", "field2", "field3", "field4", "field5"]
+
+    input_string = '"value 1" "value 2" - value4 "value 5"\n'
+    expected_output = {"field1": "value 1", "field2": "value 2", "field4": "value4", "field5": "value 5"}
+    assert BroadcomCloudSwgClient.parse_input_string(input_string, fields=fields) == expected_output
+
+    # a quote inside a value does not end it, unless it is followed by a space
+    input_string = 'value1 "value "2" "" v'
+    expected_output = {"field1": "value1", "field2": 'value "2', "field3": "", "field4": "v"}
+    assert BroadcomCloudSwgClient.parse_input_string(input_string, fields=fields) == expected_output
+
+
 @pytest.mark.asyncio
 async def test_parse_string_as_headers():
     """Test parse_string_as_headers method."""
@@ -248,6 +248,44 @@ async def test_produce_file_to_queue(
     assert result[1] == len([line for line in logs_content.split("\n") if not line.startswith("#")])
 
 
+@pytest.mark.asyncio
+async def test_produce_file_to_queue_by_batches(
+    connector: BroadcomCloudSwgConnector,
+    session_faker: Faker,
+    logs_content: str,
+):
+    queue = Queue()
+    file_name = "{0}.log".format(session_faker.word())
+    with open(file_name, "w") as file:
+        file.write(logs_content)
+
+    zip_file_name = "{0}.zip".format(session_faker.word())
+    with zipfile.ZipFile(zip_file_name, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.write(file_name)
+
+    os.remove(file_name)
+
+    batches = []
+
+    async def consume() -> None:
+        while (batch := await queue.get()) is not None:
+            batches.append(batch)
+            queue.task_done()
+
+        queue.task_done()
+
+    await asyncio.gather(
+        connector.produce_file_to_queue(zip_file_name, queue, DatetimeRange(), batch_size=2), consume()
+    )
+
+    os.remove(zip_file_name)
+
+    assert all(0 < len(batch) <= 2 for batch in batches)
+    assert sum(len(batch) for batch in batches) == len(
+        [line for line in logs_content.split("\n") if not line.startswith("#")]
+    )
+
+
 @pytest.mark.asyncio
 async def test_broadcom_cloud_swg_connector_broadcom_client(connector: BroadcomCloudSwgConnector):
     """
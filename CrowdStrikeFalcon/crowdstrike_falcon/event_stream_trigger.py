@@ -3,10 +3,13 @@ import queue
 import threading
 import time
 import os
+from collections import defaultdict
 from collections.abc import Generator
 from functools import cached_property
+from typing import NamedTuple
 
 import orjson
+from cachetools import TTLCache
 from requests.auth import AuthBase
 from requests.exceptions import HTTPError, StreamConsumedError
 from sekoia_automation.connector import Connector
@@ -29,12 +32,17 @@ logger = get_logger()
 
 MAX_EVENTS_PER_BATCH = 1000
 
+# The maximum number of verticles requested at once
+MAX_VERTICLES_PER_REQUEST = 100
+
 
 class VerticlesCollector:
     def __init__(
         self,
         connector: "EventStreamTrigger",
         falcon_client: CrowdstrikeFalconClient | None = None,
+        cache_ttl: int = 300,
+        cache_size: int = 10000,
     ):
         self.connector = connector
         self.falcon_client = falcon_client or connector.client
@@ -43,6 +51,13 @@ class VerticlesCollector:
             "hunting_lead",
         }
 
+        # The edges and the verticles are shared by the detections on the same processes:
+        # keep them for a while to not request them again for each detection
+        self._lock = threading.Lock()
+        self._edges_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._verticles_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._edges_in_flight: dict[tuple[str, str], threading.Event] = {}
+
     def log(self, *args, **kwargs):
         self.connector.log(*args, **kwargs)
 
@@ -98,34 +113,113 @@ class VerticlesCollector:
 
         return graph_ids
 
+    def list_edges(self, graph_id: str, edge_type: str) -> list[dict]:
+        """
+        List the edges of a type starting from a graph id.
+        The edges are cached, and requested only once when several detections need them at the same time.
+
+        :param str graph_id: The source of the edges
+        :param str edge_type: The type of the edges
+        """
+        key = (graph_id, edge_type)
+
+        with self._lock:
+            if key in self._edges_cache:
+                return self._edges_cache[key]
+
+            in_flight = self._edges_in_flight.get(key)
+            if in_flight is None:
+                self._edges_in_flight[key] = threading.Event()
+
+        # another worker is requesting these edges: wait for its result
+        if in_flight is not None:
+            in_flight.wait(timeout=60)
+            with self._lock:
+                if key in self._edges_cache:
+                    return self._edges_cache[key]
+
+            return list(self.falcon_client.list_edges(graph_id, edge_type))
+
+        try:
+            edges = list(self.falcon_client.list_edges(graph_id, edge_type))
+            with self._lock:
+                self._edges_cache[key] = edges
+
+            return edges
+        finally:
+            with self._lock:
+                self._edges_in_flight.pop(key).set()
+
+    def get_verticles(self, verticle_ids_per_type: dict[str, set[str]]) -> dict[str, dict]:
+        """
+        Get the details of verticles, from the cache or by batches
+
+        :param dict verticle_ids_per_type: The identifiers of the verticles, grouped by type of verticle
+        :return: The verticles, by identifier
+        """
+        verticles: dict[str, dict] = {}
+        for verticle_type, verticle_ids in verticle_ids_per_type.items():
+            missing_ids = []
+            with self._lock:
+                for verticle_id in verticle_ids:
+                    if verticle_id in self._verticles_cache:
+                        verticles[verticle_id] = self._verticles_cache[verticle_id]
+                    else:
+                        missing_ids.append(verticle_id)
+
+            for index in range(0, len(missing_ids), MAX_VERTICLES_PER_REQUEST):
+                chunk = missing_ids[index : index + MAX_VERTICLES_PER_REQUEST]
+                try:
+                    for vertex in self.falcon_client.get_verticles_details(chunk, verticle_type):
+                        verticles[vertex["id"]] = vertex
+                        with self._lock:
+                            self._verticles_cache[vertex["id"]] = vertex
+                except HTTPError as error:
+                    self.log_exception(
+                        error,
+                        message=f"Failed to collect the details of {len(chunk)} verticles of type {verticle_type}",
+                        level="warning",
+                    )
+
+        return verticles
+
     def collect_verticles_from_graph_ids(self, graph_ids: set[str]) -> Generator[tuple[str, str, dict], None, None]:
         """
         Collect verticles from a list of graph ids
 
         :param list: graph_ids: The list of sources to explore the graph
         """
+        # the source of each verticle, per graph id and type of edge
+        links: dict[tuple[str, str, str], str] = {}
+        verticle_ids_per_type: dict[str, set[str]] = defaultdict(set)
+
         for graph_id in graph_ids:
             # iter over each type of edges
             for edge_type in self.edge_types:
                 try:
                     # get edges starting from a graph id
-                    edges = self.falcon_client.list_edges(graph_id, edge_type)
-                    groups = group_edges_by_verticle_type(edges)
-
-                    # for each group, get the verticles
-                    for verticle_type, list_of_edges in groups:
-                        verticles_links = {edge["id"]: edge["source_vertex_id"] for edge in list_of_edges}
-                        for vertex in self.falcon_client.get_verticles_details(
-                            list(verticles_links.keys()), verticle_type
-                        ):
-                            INCOMING_VERTICLES.labels(intake_key=self.connector.configuration.intake_key).inc()
-                            yield (verticles_links[vertex["id"]], edge_type, vertex)
+                    edges = self.list_edges(graph_id, edge_type)
                 except HTTPError as error:
                     self.log_exception(
                         error,
                         message=f"Failed to collect verticles for edge_type {edge_type} for graph_id {graph_id}",
                         level="warning",
                     )
+                    continue
+
+                for verticle_type, list_of_edges in group_edges_by_verticle_type(iter(edges)):
+                    for edge in list_of_edges:
+                        links[(graph_id, edge_type, edge["id"])] = edge["source_vertex_id"]
+                        verticle_ids_per_type[verticle_type].add(edge["id"])
+
+        # get the verticles of all the graph ids at once
+        verticles = self.get_verticles(verticle_ids_per_type)
+
+        for (_, edge_type, verticle_id), source_vertex_id in links.items():
+            vertex = verticles.get(verticle_id)
+            if vertex is not None:
+                INCOMING_VERTICLES.labels(intake_key=self.connector.configuration.intake_key).inc()
+                yield (source_vertex_id, edge_type, vertex)
 
     def collect_verticles_from_detection(self, detection_id: str) -> Generator[tuple[str, str, dict], None, None]:
         """
@@ -195,6 +289,100 @@ class VerticlesCollector:
             )
 
 
+class EnrichmentRequest(NamedTuple):
+    stream_root_url: str
+    detection_id: str
+    is_alert: bool
+    detection_event: dict
+
+
+class VerticlesEnricher:
+    """
+    Collect the verticles of the detections in a pool of workers, so the stream readers only parse the events
+    """
+
+    def __init__(
+        self,
+        connector: "EventStreamTrigger",
+        verticles_collector: VerticlesCollector,
+        nb_workers: int = 4,
+        queue_size: int = 1000,
+    ):
+        self.connector = connector
+        self.verticles_collector = verticles_collector
+        self.nb_workers = nb_workers
+        self.requests: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    def log(self, *args, **kwargs):
+        self.connector.log(*args, **kwargs)
+
+    def start(self):
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while len(self._workers) < self.nb_workers:
+                worker = threading.Thread(target=self.run, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def submit(self, request: EnrichmentRequest):
+        """
+        Queue the collection of the verticles of a detection.
+        Block when the queue is full, to not read the stream faster than the verticles are collected
+        """
+        self.start()
+        self.requests.put(request)
+
+    def run(self):
+        while self.running:
+            try:
+                request = self.requests.get(block=True, timeout=0.5)
+            except queue.Empty:
+                continue
+
+            try:
+                self.enrich(request)
+            except Exception as error:
+                self.connector.log_exception(
+                    error, message=f"Failed to collect verticles for detection {request.detection_id}"
+                )
+
+    def enrich(self, request: EnrichmentRequest):
+        event_content = request.detection_event.get("event", {})
+        severity_name = event_content.get("SeverityName")
+        severity_code = event_content.get("Severity")
+
+        if request.is_alert:
+            verticles = self.verticles_collector.collect_verticles_from_alert(request.detection_id)
+        else:
+            verticles = self.verticles_collector.collect_verticles_from_detection(request.detection_id)
+
+        nb_verticles = 0
+        for source_vertex_id, edge_type, vertex in verticles:
+            nb_verticles += 1
+            event = {
+                "metadata": {
+                    "detectionIdString": request.detection_id,
+                    "eventType": "Vertex",
+                    "edge": {"sourceVertexId": source_vertex_id, "type": edge_type},
+                    "severity": {"name": severity_name, "code": severity_code},
+                },
+                "event": vertex,
+            }
+            self.connector.events_queue.put((request.stream_root_url, orjson.dumps(event).decode()))
+
+        self.log(message=f"Collected {nb_verticles} vertex", level="info")
+
+
 class EventStreamAuthentication(AuthBase):
     def __init__(self, session_token: str):
         self.__session_token = session_token
@@ -214,6 +402,7 @@ class EventStreamReader(threading.Thread):
         offset: int = 0,
         client: CrowdstrikeFalconClient | None = None,
         verticles_collector: VerticlesCollector | None = None,
+        verticles_enricher: VerticlesEnricher | None = None,
     ):
         super().__init__()
         self.connector = connector
@@ -222,6 +411,9 @@ class EventStreamReader(threading.Thread):
         self.offset = offset
         self.client = client or connector.client
         self.verticles_collector = verticles_collector
+        if verticles_enricher is None and verticles_collector is not None:
+            verticles_enricher = VerticlesEnricher(connector, verticles_collector)
+        self.verticles_enricher = verticles_enricher
         self.app_id = app_id
         self._stop_event = threading.Event()
         self.events_queue = connector.events_queue
@@ -366,70 +558,28 @@ class EventStreamReader(threading.Thread):
             logger.info("Not a detection")
             return
 
-        if self.verticles_collector is None:
+        if self.verticles_enricher is None:
             logger.info("verticles collection disabled")
             return
 
         logger.info("Collect verticles for detection", detection_id=detection_id)
-
-        event_content = detection_event.get("event", {})
-        severity_name = event_content.get("SeverityName")
-        severity_code = event_content.get("Severity")
-
-        nb_verticles = 0
-        for (
-            source_vertex_id,
-            edge_type,
-            vertex,
-        ) in self.verticles_collector.collect_verticles_from_detection(detection_id):
-            nb_verticles += 1
-            event = {
-                "metadata": {
-                    "detectionIdString": detection_id,
-                    "eventType": "Vertex",
-                    "edge": {"sourceVertexId": source_vertex_id, "type": edge_type},
-                    "severity": {"name": severity_name, "code": severity_code},
-                },
-                "event": vertex,
-            }
-            self.events_queue.put((self.stream_root_url, orjson.dumps(event).decode()))
-
-        self.log(message=f"Collected {nb_verticles} vertex", level="info")
+        self.verticles_enricher.submit(
+            EnrichmentRequest(self.stream_root_url, detection_id, is_alert=False, detection_event=detection_event)
+        )
 
     def collect_verticles_for_epp_detection(self, composite_id: str | None, detection_event: dict):
         if composite_id is None:
             logger.info("Not a epp detection")
             return
 
-        if self.verticles_collector is None:
+        if self.verticles_enricher is None:
             logger.info("verticles collection disabled")
             return
 
         logger.info("Collect verticles for detection", composite_id=composite_id)
-
-        event_content = detection_event.get("event", {})
-        severity_name = event_content.get("SeverityName")
-        severity_code = event_content.get("Severity")
-
-        nb_verticles = 0
-        for (
-            source_vertex_id,
-            edge_type,
-            vertex,
-        ) in self.verticles_collector.collect_verticles_from_alert(composite_id):
-            nb_verticles += 1
-            event = {
-                "metadata": {
-                    "detectionIdString": composite_id,
-                    "eventType": "Vertex",
-                    "edge": {"sourceVertexId": source_vertex_id, "type": edge_type},
-                    "severity": {"name": severity_name, "code": severity_code},
-                },
-                "event": vertex,
-            }
-            self.events_queue.put((self.stream_root_url, orjson.dumps(event).decode()))
-
-        self.log(message=f"Collected {nb_verticles} vertex", level="info")
+        self.verticles_enricher.submit(
+            EnrichmentRequest(self.stream_root_url, composite_id, is_alert=True, detection_event=detection_event)
+        )
 
 
 class EventForwarder(threading.Thread):
@@ -568,7 +718,9 @@ class EventStreamTrigger(Connector):
             if os.getenv("ACTIVATE_VERTICLES_COLLECTION", "false").lower() == "false":
                 self.log(message="Verticles collection is disabled by configuration", level="info")
                 return None
-            verticles_collector = VerticlesCollector(self, self.client)
+            verticles_collector = VerticlesCollector(
+                self, self.client, cache_ttl=int(os.getenv("VERTICLES_CACHE_TTL", 300))
+            )
             return verticles_collector
         except HTTPError as error:
             if error.response.status_code == 403:
@@ -580,6 +732,21 @@ class EventStreamTrigger(Connector):
             self.log_exception(error, message="Failed to create verticles collector")
             return None
 
+    @cached_property
+    def verticles_enricher(self) -> VerticlesEnricher | None:
+        """
+        The pool of workers collecting the verticles, shared by the stream readers
+        """
+        if self.verticles_collector is None:
+            return None
+
+        return VerticlesEnricher(
+            self,
+            self.verticles_collector,
+            nb_workers=int(os.getenv("VERTICLES_ENRICHMENT_WORKERS", 4)),
+            queue_size=int(os.getenv("VERTICLES_ENRICHMENT_QUEUE_SIZE", 1000)),
+        )
+
     def get_streams(self, app_id: str) -> dict[str, dict]:
         """
         Query the CS EventStream API to retrieve the streams
@@ -614,6 +781,7 @@ class EventStreamTrigger(Connector):
                 stream_offset,
                 self.client,
                 self.verticles_collector,
+                self.verticles_enricher,
             )
             stream_threads[stream_root_url].start()
 
@@ -645,6 +813,7 @@ class EventStreamTrigger(Connector):
                         stream_offset,
                         self.client,
                         self.verticles_collector,
+                        self.verticles_enricher,
                     )
                     stream_threads[stream_root_url].start()
 
@@ -677,6 +846,8 @@ class EventStreamTrigger(Connector):
                     time.sleep(5)
             finally:
                 self.stop_streams(stream_threads)
+                if self.verticles_enricher is not None:
+                    self.verticles_enricher.stop()
                 read_queue_thread.stop()
 
         except HTTPError as error:
@@ -12,10 +12,12 @@ from requests.exceptions import HTTPError
 from crowdstrike_falcon import CrowdStrikeFalconModule
 from crowdstrike_falcon.client import CrowdstrikeFalconClient
 from crowdstrike_falcon.event_stream_trigger import (
+    EnrichmentRequest,
     EventForwarder,
     EventStreamReader,
     EventStreamTrigger,
     VerticlesCollector,
+    VerticlesEnricher,
 )
 
 
@@ -814,25 +816,17 @@ def test_verticle_collector_collect_verticles_from_graph_ids(verticles_collector
             },
         )
 
+        # the verticles of all the graph ids are requested at once
         mock.register_uri(
             "GET",
             "https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&"
             "ids=pid:835449907c99453085a924a16e967be5:6494700150&"
-            "ids=pid:835449907c99453085a924a16e967be5:6492874271",
+            "ids=pid:835449907c99453085a924a16e967be5:6492874271&"
+            "ids=pid:835449907c99453085a924a16e967be5:6463227462",
             json={
                 "errors": [],
                 "meta": {},
-                "resources": verticles1,
-            },
-        )
-
-        mock.register_uri(
-            "GET",
-            "https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&ids=pid:835449907c99453085a924a16e967be5:6463227462",  # noqa: E501
-            json={
-                "errors": [],
-                "meta": {},
-                "resources": verticles2,
+                "resources": verticles,
             },
         )
 
@@ -841,6 +835,68 @@ def test_verticle_collector_collect_verticles_from_graph_ids(verticles_collector
         assert vertex_ids == {vertex["id"] for vertex in verticles}
 
 
+def test_verticle_collector_caches_edges_and_verticles(trigger):
+    falcon_client = MagicMock()
+    falcon_client.get_edge_types.return_value = ["child_process"]
+    falcon_client.list_edges.return_value = iter(
+        [{"edge_type": "child_process", "id": "pid:1111:2222", "source_vertex_id": "pid:1111:3333"}]
+    )
+    falcon_client.get_verticles_details.return_value = [{"id": "pid:1111:2222", "vertex_type": "process"}]
+    collector = VerticlesCollector(trigger, falcon_client)
+
+    first = list(collector.collect_verticles_from_graph_ids({"pid:1111:3333"}))
+    second = list(collector.collect_verticles_from_graph_ids({"pid:1111:3333"}))
+
+    assert first == second == [("pid:1111:3333", "child_process", {"id": "pid:1111:2222", "vertex_type": "process"})]
+    assert falcon_client.list_edges.call_count == 1
+    assert falcon_client.get_verticles_details.call_count == 1
+
+
+def test_verticle_collector_requests_verticles_by_batches(trigger):
+    falcon_client = MagicMock()
+    falcon_client.get_edge_types.return_value = ["child_process"]
+    edges = [
+        {"edge_type": "child_process", "id": f"pid:1111:{index}", "source_vertex_id": "pid:1111:root"}
+        for index in range(250)
+    ]
+    falcon_client.list_edges.return_value = iter(edges)
+    falcon_client.get_verticles_details.side_effect = lambda ids, verticle_type: [
+        {"id": verticle_id, "vertex_type": verticle_type} for verticle_id in ids
+    ]
+    collector = VerticlesCollector(trigger, falcon_client)
+
+    collect = list(collector.collect_verticles_from_graph_ids({"pid:1111:root"}))
+
+    assert len(collect) == 250
+    assert [len(call.args[0]) for call in falcon_client.get_verticles_details.call_args_list] == [100, 100, 50]
+
+
+def test_verticles_enricher_forwards_verticles(trigger):
+    verticles_collector = MagicMock()
+    verticles_collector.collect_verticles_from_detection.return_value = iter(
+        [("pid:1111:3333", "child_process", {"id": "pid:1111:2222"})]
+    )
+    enricher = VerticlesEnricher(trigger, verticles_collector, nb_workers=1)
+    detection_event = {"event": {"SeverityName": "High", "Severity": 4}}
+
+    enricher.submit(EnrichmentRequest("https://my.fake.sekoia/stream", "ldt:1111", False, detection_event))
+    stream_root_url, event = trigger.events_queue.get(timeout=5)
+    enricher.stop()
+
+    assert stream_root_url == "https://my.fake.sekoia/stream"
+    assert orjson.loads(event) == {
+        "metadata": {
+            "detectionIdString": "ldt:1111",
+            "eventType": "Vertex",
+            "edge": {"sourceVertexId": "pid:1111:3333", "type": "child_process"},
+            "severity": {"name": "High", "code": 4},
+        },
+        "event": {"id": "pid:1111:2222"},
+    }
+    verticles_collector.collect_verticles_from_detection.assert_called_once_with("ldt:1111")
+    verticles_collector.collect_verticles_from_alert.assert_not_called()
+
+
 @patch.dict(os.environ, {"ACTIVATE_VERTICLES_COLLECTION": "true"})
 def test_read_stream_with_verticles(trigger):
     detection_id = "ldt:aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa:11111111111"
@@ -1037,21 +1093,12 @@ def test_read_stream_with_verticles(trigger):
             "GET",
             "https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&"
             f"ids={verticle1['id']}&"
-            f"ids={verticle2['id']}",
-            json={
-                "errors": [],
-                "meta": {},
-                "resources": [verticle1, verticle2],
-            },
-        )
-
-        mock.register_uri(
-            "GET",
-            f"https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&ids={verticle3['id']}",
+            f"ids={verticle2['id']}&"
+            f"ids={verticle3['id']}",
             json={
                 "errors": [],
                 "meta": {},
-                "resources": [verticle3],
+                "resources": [verticle1, verticle2, verticle3],
             },
         )
 
@@ -1338,21 +1385,12 @@ def test_read_stream_with_verticles_with_alert(trigger):
             "GET",
             "https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&"
             f"ids={verticle1['id']}&"
-            f"ids={verticle2['id']}",
-            json={
-                "errors": [],
-                "meta": {},
-                "resources": [verticle1, verticle2],
-            },
-        )
-
-        mock.register_uri(
-            "GET",
-            f"https://my.fake.sekoia/threatgraph/entities/processes/v1?scope=device&ids={verticle3['id']}",
+            f"ids={verticle2['id']}&"
+            f"ids={verticle3['id']}",
             json={
                 "errors": [],
                 "meta": {},
-                "resources": [verticle3],
+                "resources": [verticle1, verticle2, verticle3],
             },
         )
 
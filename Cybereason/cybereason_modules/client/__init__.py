@@ -4,7 +4,7 @@ from requests.auth import AuthBase
 
 
 class ApiClient(requests.Session):
-    def __init__(self, auth: AuthBase, nb_retries: int = 5):
+    def __init__(self, auth: AuthBase, nb_retries: int = 5, pool_maxsize: int = 10):
         super().__init__()
         self.auth = auth
         self.mount(
@@ -13,10 +13,14 @@ class ApiClient(requests.Session):
                 max_retries=Retry(
                     total=nb_retries,
                     backoff_factor=1,
-                    status_forcelist=[429, 500, 502, 503, 504],
+                    # the rate-limited responses (429) are handled by the connector, to suspend all its workers:
+                    # don't retry them, even with a Retry-After header
+                    status_forcelist=[500, 502, 503, 504],
+                    respect_retry_after_header=False,
                     connect=5,
                     read=5,
                     allowed_methods=["GET", "POST"],
-                )
+                ),
+                pool_maxsize=pool_maxsize,
             ),
         )
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from posixpath import join as urljoin
+from threading import Lock
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
@@ -25,6 +26,7 @@ class CybereasonApiAuthentication(AuthBase):
         self.__username = username
         self.__password = password
         self.__api_credentials: CybereasonApiCredentials | None = None
+        self.__lock = Lock()  # the malops are enriched by concurrent requests sharing the credentials
         self.__http_session = requests.Session()
         self.__http_session.mount(
             "https://",
@@ -40,34 +42,38 @@ class CybereasonApiAuthentication(AuthBase):
         """
         Return Cybereason Credentials for the API
         """
-        current_dt = datetime.utcnow()
+        with self.__lock:
+            current_dt = datetime.utcnow()
 
-        if self.__api_credentials is None or current_dt + timedelta(seconds=300) >= self.__api_credentials.expires_at:
-            try:
-                response = self.__http_session.post(
-                    url=self.__authorization_url,
-                    data={
-                        "username": self.__username,
-                        "password": self.__password,
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    verify=True,
-                    timeout=60,
-                )
-            except requests.Timeout as error:
-                raise TimeoutError(self.__authorization_url) from error
+            if (
+                self.__api_credentials is None
+                or current_dt + timedelta(seconds=300) >= self.__api_credentials.expires_at
+            ):
+                try:
+                    response = self.__http_session.post(
+                        url=self.__authorization_url,
+                        data={
+                            "username": self.__username,
+                            "password": self.__password,
+                        },
+                        headers={"Content-Type": "application/x-www-form-urlencoded"},
+                        verify=True,
+                        timeout=60,
+                    )
+                except requests.Timeout as error:
+                    raise TimeoutError(self.__authorization_url) from error
 
-            response.raise_for_status()
+                response.raise_for_status()
 
-            if not validate_response_not_login_failure(response):
-                raise LoginFailureError(self.__authorization_url)
+                if not validate_response_not_login_failure(response):
+                    raise LoginFailureError(self.__authorization_url)
 
-            credentials = CybereasonApiCredentials()
-            credentials.session_id = self.__http_session.cookies.get("JSESSIONID")
-            credentials.expires_at = current_dt + timedelta(hours=8)
-            self.__api_credentials = credentials
+                credentials = CybereasonApiCredentials()
+                credentials.session_id = self.__http_session.cookies.get("JSESSIONID")
+                credentials.expires_at = current_dt + timedelta(hours=8)
+                self.__api_credentials = credentials
 
-        return self.__api_credentials
+            return self.__api_credentials
 
     def __call__(self, request):
         request.prepare_cookies(merge_cookies(request._cookies, {"JSESSIONID": self.get_credentials().session_id}))
@@ -1,11 +1,13 @@
 import signal
 import time
 from collections import defaultdict
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import timedelta
 from functools import cached_property
 from posixpath import join as urljoin
-from threading import Event
+from threading import Event, Lock
+from time import monotonic
 from typing import Any
 
 import orjson
@@ -27,6 +29,7 @@ from cybereason_modules.exceptions import InvalidJsonResponse, InvalidResponse,
 from cybereason_modules.helpers import (
     RETRY_ON_STATUS,
     extract_models_from_malop,
+    get_retry_after,
     merge_suspicions,
     retry,
     retry_strategy,
@@ -42,6 +45,7 @@ class CybereasonEventConnectorConfiguration(DefaultConnectorConfiguration):
     frequency: int = 60
     group_ids: list[str] | None = None
     chunk_size: int = 1000
+    max_concurrent_requests: int = 8
 
 
 class CybereasonEventConnector(Connector):
@@ -68,6 +72,10 @@ class CybereasonEventConnector(Connector):
         self._stop_event = Event()  # Event to notify we must stop the thread
         self.retry = retry_strategy()
 
+        # requests on the tenant are suspended until this time (monotonic clock) when rate limited
+        self._resume_at: float = 0.0
+        self._rate_limit_lock = Lock()
+
         # Register signal to terminate thread
         signal.signal(signal.SIGINT, self.exit)
         signal.signal(signal.SIGTERM, self.exit)
@@ -98,7 +106,7 @@ class CybereasonEventConnector(Connector):
         auth = CybereasonApiAuthentication(
             self.module.configuration.base_url, self.module.configuration.username, self.module.configuration.password
         )
-        return ApiClient(auth=auth)
+        return ApiClient(auth=auth, pool_maxsize=self.configuration.max_concurrent_requests)
 
     def exit(self, _, __):
         # Exit signal received, asking the processor to stop
@@ -116,6 +124,32 @@ class CybereasonEventConnector(Connector):
         except Exception as error:
             raise InvalidJsonResponse(response) from error
 
+    def wait_for_rate_limit(self) -> None:
+        """
+        Wait until the end of the rate limiting period, if any
+        """
+        with self._rate_limit_lock:
+            delay = self._resume_at - monotonic()
+
+        if delay > 0:
+            self._stop_event.wait(delay)
+
+    def handle_rate_limit(self, response: requests.Response) -> None:
+        """
+        Suspend the requests of all the workers for the delay requested by a rate-limited response
+        """
+        if response.status_code != 429:
+            return
+
+        delay = get_retry_after(response)
+        with self._rate_limit_lock:
+            self._resume_at = max(self._resume_at, monotonic() + delay)
+
+        self.log(
+            message=f"Rate limited by the Cybereason API. Requests suspended for {delay} seconds",
+            level="warning",
+        )
+
     def fetch_malops(self, from_date: int, to_date: int) -> list[dict[str, Any]]:
         """
         Return a list of malops according the time range
@@ -173,6 +207,7 @@ class CybereasonEventConnector(Connector):
         params: dict[str, str] = {"malopGuid": malop_uuid}
 
         url = urljoin(self.module.configuration.base_url, MALOP_DETAIL_ENDPOINT)
+        self.wait_for_rate_limit()
         response = self.client.post(url, json=params)
 
         if not response.ok:
@@ -185,6 +220,7 @@ class CybereasonEventConnector(Connector):
             )
 
             # Raise for retryable status codes
+            self.handle_rate_limit(response)
             if response.status_code in RETRY_ON_STATUS:
                 response.raise_for_status()
 
@@ -217,6 +253,7 @@ class CybereasonEventConnector(Connector):
 
         # call the api
         url = urljoin(self.module.configuration.base_url, AI_HUNT_MALOP_DETAIL_ENDPOINT)
+        self.wait_for_rate_limit()
         response = self.client.post(url, json=params)
 
         # check the response
@@ -230,6 +267,7 @@ class CybereasonEventConnector(Connector):
             )
 
             # Raise for retryable status codes
+            self.handle_rate_limit(response)
             if response.status_code in RETRY_ON_STATUS:
                 response.raise_for_status()
 
@@ -264,17 +302,16 @@ class CybereasonEventConnector(Connector):
 
         return malop_suspicions
 
-    def get_all_suspicions_for_edr_malop(self, malop_uuid: str) -> dict[tuple[str, str], dict[str, Any] | None] | None:
+    def merge_edr_malop_suspicions(
+        self, malop_uuid: str, suspicions_by_type: Iterable[dict[tuple[str, str], dict[str, Any]] | None]
+    ) -> dict[tuple[str, str], dict[str, Any] | None] | None:
         """
-        Retrieve all suspicions and evidences for an EDR malop
+        Merge the suspicions and evidences of an EDR malop retrieved for each requested type
         """
         malop_suspicions: dict[tuple[str, str], dict[str, Any] | None] = defaultdict(lambda: {})
 
         # for each requested type
-        for requested_type in AI_HUNT_MALOP_TYPES:
-            # get suspicions
-            suspicions = self.get_edr_malop_suspicions(malop_uuid, requested_type)
-
+        for suspicions in suspicions_by_type:
             # if no suspicions found, go to the next type
             if suspicions is None:
                 continue
@@ -293,13 +330,57 @@ class CybereasonEventConnector(Connector):
 
         return malop_suspicions
 
-    def enrich_generic_malop(self, malop: dict[str, Any]) -> Generator[dict[str, Any], None, None]:
+    def get_all_suspicions_for_edr_malop(self, malop_uuid: str) -> dict[tuple[str, str], dict[str, Any] | None] | None:
+        """
+        Retrieve all suspicions and evidences for an EDR malop
+        """
+        return self.merge_edr_malop_suspicions(
+            malop_uuid,
+            (self.get_edr_malop_suspicions(malop_uuid, requested_type) for requested_type in AI_HUNT_MALOP_TYPES),
+        )
+
+    def submit_malop_enrichment(self, executor: Executor, malop: dict[str, Any]) -> list[Future]:
         """
-        Get and yield details on the malop
+        Schedule the requests enriching the malop:
+        its suspicions for each requested type for an EDR malop, its details otherwise
         """
-        # get details on the malop
-        details = self.get_malop_detail(malop["guid"])
+        if malop.get("edr", False):
+            return [
+                executor.submit(self.get_edr_malop_suspicions, malop["guid"], requested_type)
+                for requested_type in AI_HUNT_MALOP_TYPES
+            ]
+
+        return [executor.submit(self.get_malop_detail, malop["guid"])]
 
+    def enrich_edr_malop(
+        self, malop: dict[str, Any], suspicions: dict[tuple[str, str], dict[str, Any] | None] | None
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yield the malop and its suspicions
+        """
+        users = malop.pop("users", [])
+        machines = malop.pop("machines", [])
+        yield malop
+        yield from extract_models_from_malop(malop, users, ".UserInboxModel")
+        yield from extract_models_from_malop(malop, machines, ".MachineInboxModel")
+        if suspicions:
+            for (suspicion_uuid, suspicion_name), suspicion in suspicions.items():
+                if suspicion is not None:
+                    yield {
+                        "metadata": {"malopGuid": malop["guid"], "timestamp": malop["lastUpdateTime"]},
+                        "@class": ".SuspicionModel",
+                        "name": suspicion_name,
+                        "guid": suspicion_uuid,
+                        "firstTimestamp": suspicion["firstTimestamp"],
+                        "evidences": suspicion["evidences"],
+                    }
+
+    def enrich_generic_malop(
+        self, malop: dict[str, Any], details: dict[str, Any] | None
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yield the details on the malop
+        """
         # if no details retrieved, use the malop as base
         if details is None:
             users = malop.pop("users", [])
@@ -319,6 +400,8 @@ class CybereasonEventConnector(Connector):
     def fetch_last_events(self) -> Generator[dict[str, Any], None, None]:
         """
         Fetch the last malops from the Cybereason API
+
+        The malops are enriched concurrently, but yielded in their order
         """
         from_date = self.from_date
         # compute the ending time to retrieve malops (Currently, now)
@@ -328,44 +411,36 @@ class CybereasonEventConnector(Connector):
         next_malops = self.fetch_malops(from_date, to_date)
         INCOMING_MALOPS.labels(intake_key=self.configuration.intake_key).inc(len(next_malops))
 
-        most_recent_date_seen = from_date
+        # skip already processed malops based on their GUID
+        new_malops: dict[str, dict[str, Any]] = {}
         for malop in next_malops:
+            if malop["guid"] not in self.events_cache and malop["guid"] not in new_malops:
+                new_malops[malop["guid"]] = malop
 
-            malop_uuid = malop["guid"]
-            # skip already processed malops based on their GUID
-            if malop_uuid in self.events_cache:
-                continue
-            self.events_cache[malop_uuid] = 1
-
-            # save the greater date ever seen
-            event_date = int(malop["lastUpdateTime"])
-            if event_date > most_recent_date_seen:
-                most_recent_date_seen = event_date + 1  # add 1 ms to avoid getting the same event again
-
-            # check if the malop is an AI Hunt malop (EDR) or a generic one
-            is_edr = malop.get("edr", False)
-            if is_edr:
-                suspicions = self.get_all_suspicions_for_edr_malop(malop["guid"])
-
-                users = malop.pop("users", [])
-                machines = malop.pop("machines", [])
-                yield malop
-                yield from extract_models_from_malop(malop, users, ".UserInboxModel")
-                yield from extract_models_from_malop(malop, machines, ".MachineInboxModel")
-                if suspicions:
-                    for (suspicion_uuid, suspicion_name), suspicion in suspicions.items():
-                        if suspicion is not None:
-                            yield {
-                                "metadata": {"malopGuid": malop["guid"], "timestamp": malop["lastUpdateTime"]},
-                                "@class": ".SuspicionModel",
-                                "name": suspicion_name,
-                                "guid": suspicion_uuid,
-                                "firstTimestamp": suspicion["firstTimestamp"],
-                                "evidences": suspicion["evidences"],
-                            }
-
-            else:
-                yield from self.enrich_generic_malop(malop)
+        most_recent_date_seen = from_date
+        executor = ThreadPoolExecutor(
+            max_workers=self.configuration.max_concurrent_requests, thread_name_prefix="MalopEnrichment"
+        )
+        try:
+            enrichments = [self.submit_malop_enrichment(executor, malop) for malop in new_malops.values()]
+
+            for (malop_uuid, malop), futures in zip(new_malops.items(), enrichments):
+                results = [future.result() for future in futures]
+                self.events_cache[malop_uuid] = 1
+
+                # save the greater date ever seen
+                event_date = int(malop["lastUpdateTime"])
+                if event_date > most_recent_date_seen:
+                    most_recent_date_seen = event_date + 1  # add 1 ms to avoid getting the same event again
+
+                # check if the malop is an AI Hunt malop (EDR) or a generic one
+                if malop.get("edr", False):
+                    yield from self.enrich_edr_malop(malop, self.merge_edr_malop_suspicions(malop_uuid, results))
+                else:
+                    yield from self.enrich_generic_malop(malop, results[0])
+        finally:
+            # do not wait for the pending enrichments if the batch failed
+            executor.shutdown(wait=False, cancel_futures=True)
 
         self.save_events_cache(self.events_cache)
 
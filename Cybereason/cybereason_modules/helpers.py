@@ -95,6 +95,21 @@ def validate_response_not_login_failure(response: requests.Response) -> bool:
 RETRY_ON_STATUS = {429, 500, 502, 503, 504}
 
 
+def get_retry_after(response: requests.Response, default: float = 1.0) -> float:
+    """
+    Return the delay, in seconds, requested by the API before sending new requests
+
+    :param requests.Response response: The rate-limited response
+    :param float default: The delay to use if the response doesn't define any
+    :return: The delay in seconds
+    :rtype: float
+    """
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
 def retry_strategy(max_retries: int = 10) -> Retrying:
     """
     Define retry strategy for HTTP requests
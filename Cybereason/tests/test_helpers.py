@@ -1,6 +1,11 @@
 from unittest.mock import MagicMock
 
-from cybereason_modules.helpers import extract_models_from_malop, merge_suspicions, validate_response_not_login_failure
+from cybereason_modules.helpers import (
+    extract_models_from_malop,
+    get_retry_after,
+    merge_suspicions,
+    validate_response_not_login_failure,
+)
 from tests.data import APP_HTML, EPP_MALOP_DETAIL, LOGIN_HTML
 
 
@@ -94,3 +99,15 @@ def test_validate_response_not_login_failure_on_login_page():
     response.content = LOGIN_HTML
 
     assert validate_response_not_login_failure(response) is False
+
+
+def test_get_retry_after():
+    response = MagicMock()
+    response.headers = {"Retry-After": "30"}
+    assert get_retry_after(response) == 30.0
+
+    response.headers = {}
+    assert get_retry_after(response) == 1.0
+
+    response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert get_retry_after(response, default=5.0) == 5.0
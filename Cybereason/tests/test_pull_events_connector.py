@@ -1,13 +1,19 @@
 import copy
+import io
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from unittest.mock import MagicMock, Mock, patch
 
+import orjson
 import pytest
 import requests
 import requests_mock
 from cachetools import LRUCache
+from urllib3 import HTTPResponse
+from urllib3.connectionpool import HTTPSConnectionPool
 
 from cybereason_modules import CybereasonModule
 from cybereason_modules.connector_pull_events import CybereasonEventConnector
@@ -544,3 +550,63 @@ def test_fetch_last_events_deduplication(
     # Verify that the malop GUIDs are in the cache
     assert EPP_MALOP["guid"] in trigger.events_cache
     assert EDR_MALOP["guid"] in trigger.events_cache
+
+
+def test_fetch_last_events_enriches_malops_concurrently_in_order(trigger, mock_cybereason_api):
+    trigger.configuration = {"intake_key": "intake_key", "frequency": 60, "max_concurrent_requests": 4}
+    malops = []
+    for index in range(8):
+        malop = copy.deepcopy(EPP_MALOP)
+        malop["guid"] = f"malop-{index}"
+        malops.append(malop)
+
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def get_malop_detail(malop_uuid):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+
+        # the first malops are the slowest to enrich
+        time.sleep(0.05 * (8 - int(malop_uuid.split("-")[1])) / 8)
+
+        with lock:
+            in_flight -= 1
+
+        return {"guid": malop_uuid, "lastUpdateTime": EPP_MALOP["lastUpdateTime"]}
+
+    mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/inbox", status_code=200, json={"malops": malops}
+    )
+
+    # requests_mock serializes the requests: mock the enrichment itself
+    with patch.object(trigger, "get_malop_detail", side_effect=get_malop_detail):
+        events = list(trigger.fetch_last_events())
+
+    assert [event["guid"] for event in events] == [f"malop-{index}" for index in range(8)]
+    assert 1 < max_in_flight <= 4
+
+
+def test_get_malop_details_when_rate_limited(trigger):
+    # go through the HTTP adapter of the client, only the connections are mocked
+    trigger.client.auth = lambda request: request
+    responses = [
+        HTTPResponse(body=io.BytesIO(b""), status=429, headers={"Retry-After": "0.1"}, preload_content=False),
+        HTTPResponse(
+            body=io.BytesIO(orjson.dumps(EPP_MALOP)),
+            status=200,
+            headers={"Content-Type": "application/json"},
+            preload_content=False,
+        ),
+    ]
+
+    with patch.object(HTTPSConnectionPool, "_make_request", side_effect=responses) as make_request:
+        assert trigger.get_malop_detail("malop_uuid") == EPP_MALOP
+
+    # the rate-limited response reached the connector, which suspended the requests
+    assert make_request.call_count == 2
+    assert trigger._resume_at > 0
+    assert "Rate limited" in trigger.log.call_args_list[1].kwargs["message"]
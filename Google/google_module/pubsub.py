@@ -1,10 +1,12 @@
 import os
 import queue
 import time
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import cached_property
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 
 from google.api_core import exceptions, retry
 from google.cloud.pubsub_v1 import SubscriberClient, types
@@ -14,6 +16,15 @@ from pydantic import BaseModel
 
 max_chunk_size: int = 1000
 
+# The minimum ack deadline of a subscription: the messages are leased at least for this duration once pulled
+MIN_ACK_DEADLINE_SECONDS: int = 10
+
+# The duration by which the ack deadline of the messages waiting to be forwarded is extended
+ACK_DEADLINE_EXTENSION_SECONDS: int = 60
+
+# The messages not forwarded after this duration are no longer leased and will be redelivered
+MAX_LEASE_DURATION_SECONDS: int = 3600
+
 
 class PubSubConfig(BaseModel):
     intake_key: str
@@ -24,6 +35,77 @@ class PubSubConfig(BaseModel):
     chunk_size: int = 1000
 
 
+def chunked(values: list[str], size: int = max_chunk_size) -> Generator[list[str], None, None]:
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
+
+@dataclass
+class MessagesBatch:
+    """
+    Messages pulled from the subscription, with the ack ids to acknowledge once they are forwarded
+    """
+
+    messages: list = field(default_factory=list)
+    ack_ids: list[str] = field(default_factory=list)
+
+    def extend(self, batch: "MessagesBatch") -> None:
+        self.messages.extend(batch.messages)
+        self.ack_ids.extend(batch.ack_ids)
+
+
+class PendingAcks:
+    """
+    Ack ids of the messages pulled but not forwarded yet, with their ack deadline
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._deadlines: dict[str, float] = {}
+        self._received_at: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def add(self, ack_ids: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for ack_id in ack_ids:
+                self._deadlines[ack_id] = now + MIN_ACK_DEADLINE_SECONDS
+                self._received_at[ack_id] = now
+
+    def remove(self, ack_ids: Iterable[str]) -> None:
+        with self._lock:
+            for ack_id in ack_ids:
+                self._deadlines.pop(ack_id, None)
+                self._received_at.pop(ack_id, None)
+
+    def expiring(self, margin: float) -> list[str]:
+        """
+        Return the ack ids whose deadline expires within the margin.
+        The ack ids leased for too long are dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                ack_id
+                for ack_id, received_at in self._received_at.items()
+                if now - received_at > MAX_LEASE_DURATION_SECONDS
+            ]
+            for ack_id in expired:
+                self._deadlines.pop(ack_id, None)
+                self._received_at.pop(ack_id, None)
+
+            return [ack_id for ack_id, deadline in self._deadlines.items() if deadline - now < margin]
+
+    def extend(self, ack_ids: Iterable[str], seconds: int) -> None:
+        deadline = time.monotonic() + seconds
+        with self._lock:
+            for ack_id in ack_ids:
+                if ack_id in self._deadlines:
+                    self._deadlines[ack_id] = deadline
+
+
 class Worker(Thread):
     KIND = "worker"
 
@@ -42,11 +124,12 @@ class Worker(Thread):
 class MessagesConsumer(Worker):
     KIND = "Consumer"
 
-    def __init__(self, connector: "PubSub", subscription_name: str, queue: queue.Queue):
+    def __init__(self, connector: "PubSub", subscription_name: str, queue: queue.Queue, nb_pulls: int = 1):
         super().__init__()
         self.connector = connector
         self.subscription_name = subscription_name
         self.queue = queue
+        self.nb_pulls = max(nb_pulls, 1)
         self.configuration = connector.configuration
         self.client: SubscriberClient | None = None
 
@@ -57,7 +140,49 @@ class MessagesConsumer(Worker):
         if self.client:
             self.client.close()
 
-    def fetch_events(self) -> Generator[list, None, None]:
+    def pull_batch(
+        self, subscriber: SubscriberClient, pull_request: types.PullRequest, retry_policy: retry.Retry
+    ) -> MessagesBatch:
+        batch_start_time = time.time()
+        # pull a new set of messages (with retry for transient errors)
+        response = subscriber.pull(request=pull_request, retry=retry_policy)
+
+        # get contents and ack_ids from messages
+        batch = MessagesBatch()
+        most_recent_date_seen = None
+        for message in response.received_messages:
+            batch.messages.append(message.message.data.decode("utf-8"))
+            batch.ack_ids.append(message.ack_id)
+
+            # look for the most recent publication date in messages
+            message_date = message.message.publish_time
+            if message_date is not None and (most_recent_date_seen is None or message_date > most_recent_date_seen):
+                most_recent_date_seen = message_date
+
+        INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(batch.messages))
+
+        # the messages will be acknowledged once forwarded: until then, their ack deadline is extended
+        if len(batch.ack_ids) > 0:
+            self.connector.pending_acks.add(batch.ack_ids)
+
+        if len(batch.messages) > 0:
+            # Compute the current lag
+            if not most_recent_date_seen:
+                self.connector.log("unable to get publication date from messages", level="warning")
+            else:
+                now = datetime.now(timezone.utc)
+                current_lag = now - most_recent_date_seen
+                EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(int(current_lag.total_seconds()))
+        else:
+            batch_duration = time.time() - batch_start_time
+            FORWARD_EVENTS_DURATION.labels(intake_key=self.configuration.intake_key).observe(batch_duration)
+            delta_sleep = self.configuration.frequency - batch_duration
+            if delta_sleep > 0:
+                time.sleep(delta_sleep)
+
+        return batch
+
+    def fetch_events(self) -> Generator[MessagesBatch, None, None]:
         self.client = SubscriberClient()
 
         # Define the retry policy
@@ -69,63 +194,76 @@ class MessagesConsumer(Worker):
             max_messages=self.configuration.chunk_size,
         )
 
-        with self.client as subscriber:
-            while self.is_running:
-                batch_start_time = time.time()
-                # pull a new set of messages (with retry for transient errors)
-                response = subscriber.pull(request=pull_request, retry=retry_policy)
-
-                # get contents and ack_ids from messages
-                messages = []
-                ack_ids = []
-                most_recent_date_seen = None
-                for message in response.received_messages:
-                    messages.append(message.message.data.decode("utf-8"))
-                    ack_ids.append(message.ack_id)
-
-                    # look for the most recent publication date in messages
-                    message_date = message.message.publish_time
-                    if message_date is not None and (
-                        most_recent_date_seen is None or message_date > most_recent_date_seen
-                    ):
-                        most_recent_date_seen = message_date
-
-                INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(messages))
-
-                # ack the messages if defined
-                if len(ack_ids) > 0:
-                    subscriber.acknowledge(request={"subscription": self.subscription_name, "ack_ids": ack_ids})
-
-                if len(messages) > 0:
-                    # Compute the current lag
-                    if not most_recent_date_seen:
-                        self.connector.log("unable to get publication date from messages", level="warning")
-                    else:
-                        now = datetime.now(timezone.utc)
-                        current_lag = now - most_recent_date_seen
-                        EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(
-                            int(current_lag.total_seconds())
-                        )
-
-                    yield messages
-                else:
-                    batch_duration = time.time() - batch_start_time
-                    FORWARD_EVENTS_DURATION.labels(intake_key=self.configuration.intake_key).observe(batch_duration)
-                    delta_sleep = self.configuration.frequency - batch_duration
-                    if delta_sleep > 0:
-                        time.sleep(delta_sleep)
+        with self.client as subscriber, ThreadPoolExecutor(max_workers=self.nb_pulls) as executor:
+            # keep several pulls in flight
+            pulls = {
+                executor.submit(self.pull_batch, subscriber, pull_request, retry_policy) for _ in range(self.nb_pulls)
+            }
+
+            while self.is_running and len(pulls) > 0:
+                done, pulls = wait(pulls, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # replace the completed pull before handling its result
+                    if self.is_running:
+                        pulls.add(executor.submit(self.pull_batch, subscriber, pull_request, retry_policy))
+
+                    batch = future.result()
+                    if len(batch.messages) > 0:
+                        yield batch
 
     def run(self):
         while self.is_running:
             try:
-                for messages in self.fetch_events():
-                    self.queue.put(messages)
+                for batch in self.fetch_events():
+                    self.queue.put(batch)
             except exceptions.Cancelled:
                 pass
             except Exception as ex:
                 self.connector.log_exception(ex, message=f"failed to fetch messages from {self.subscription_name}")
 
 
+class AckDeadlineExtender(Worker):
+    KIND = "ack deadline extender"
+
+    def __init__(self, connector: "PubSub", subscription_name: str, interval: float = 2.0):
+        super().__init__()
+        self.connector = connector
+        self.subscription_name = subscription_name
+        self.interval = interval
+        self.client: SubscriberClient | None = None
+
+    def extend_deadlines(self) -> None:
+        # extend the deadlines expiring before the next check, with a safety margin
+        ack_ids = self.connector.pending_acks.expiring(margin=self.interval + MIN_ACK_DEADLINE_SECONDS / 2)
+        if len(ack_ids) == 0:
+            return
+
+        if self.client is None:
+            self.client = SubscriberClient()
+
+        for chunk in chunked(ack_ids):
+            self.client.modify_ack_deadline(
+                request={
+                    "subscription": self.subscription_name,
+                    "ack_ids": chunk,
+                    "ack_deadline_seconds": ACK_DEADLINE_EXTENSION_SECONDS,
+                }
+            )
+            self.connector.pending_acks.extend(chunk, ACK_DEADLINE_EXTENSION_SECONDS)
+
+    def run(self):
+        while self.is_running:
+            try:
+                self.extend_deadlines()
+            except Exception as ex:
+                self.connector.log_exception(ex, message="Failed to extend the ack deadline of the messages")
+
+            self._stop_event.wait(self.interval)
+
+        if self.client:
+            self.client.close()
+
+
 class EventsForwarder(Worker):
     KIND = "forwarder"
 
@@ -135,38 +273,84 @@ class EventsForwarder(Worker):
         self.configuration = connector.configuration
         self.queue = queue
         self.max_batch_size = max_batch_size
+        self.client: SubscriberClient | None = None
 
-    def next_batch(self, max_batch_size: int) -> list:
-        events = []
+    def next_batch(self, max_batch_size: int) -> MessagesBatch:
+        batch = MessagesBatch()
         while self.is_running:
             try:
-                messages = self.queue.get(block=True, timeout=0.5)
-
-                if len(messages) > 0:
-                    events.extend(messages)
+                batch.extend(self.queue.get(block=True, timeout=0.5))
 
-                if len(events) >= max_batch_size:
+                if len(batch.messages) >= max_batch_size:
                     break
 
             except queue.Empty:
                 break
 
-        return events
+        return batch
+
+    def subscriber(self) -> SubscriberClient:
+        if self.client is None:
+            self.client = SubscriberClient()
+
+        return self.client
+
+    def acknowledge(self, ack_ids: list[str]) -> None:
+        for chunk in chunked(ack_ids):
+            self.subscriber().acknowledge(request={"subscription": self.connector.subscription_name, "ack_ids": chunk})
+
+        self.connector.pending_acks.remove(ack_ids)
+
+    def release(self, ack_ids: list[str]) -> None:
+        """
+        Make the messages available again for redelivery
+        """
+        self.connector.pending_acks.remove(ack_ids)
+        for chunk in chunked(ack_ids):
+            self.subscriber().modify_ack_deadline(
+                request={"subscription": self.connector.subscription_name, "ack_ids": chunk, "ack_deadline_seconds": 0}
+            )
+
+    def forward(self, batch: MessagesBatch) -> None:
+        self.connector.log(
+            message=f"Forward {len(batch.messages)} events to the intake",
+            level="info",
+        )
+        try:
+            event_ids = self.connector.push_events_to_intakes(events=batch.messages)
+        except Exception:
+            if len(batch.ack_ids) > 0:
+                self.release(batch.ack_ids)
+            raise
+
+        # The intake failures are only logged: make the messages available again if some events were not forwarded
+        if len(event_ids) < len(batch.messages):
+            self.connector.log(
+                message=f"Only {len(event_ids)} of {len(batch.messages)} events were forwarded, release the messages",
+                level="error",
+            )
+            if len(batch.ack_ids) > 0:
+                self.release(batch.ack_ids)
+            return
+
+        OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(batch.messages))
+
+        # acknowledge the messages only once forwarded
+        if len(batch.ack_ids) > 0:
+            self.acknowledge(batch.ack_ids)
 
     def run(self):
         try:
             while self.is_running or self.queue.qsize() > 0:
-                events = self.next_batch(self.max_batch_size)
-
-                if len(events) > 0:
-                    self.connector.log(
-                        message=f"Forward {len(events)} events to the intake",
-                        level="info",
-                    )
-                    OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(events))
-                    self.connector.push_events_to_intakes(events=events)
+                batch = self.next_batch(self.max_batch_size)
+
+                if len(batch.messages) > 0:
+                    self.forward(batch)
         except Exception as ex:
             self.connector.log_exception(ex, message="Failed to forward events")
+        finally:
+            if self.client:
+                self.client.close()
 
 
 class PubSub(GoogleTrigger):
@@ -179,6 +363,7 @@ class PubSub(GoogleTrigger):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.client: SubscriberClient | None = None
+        self.pending_acks = PendingAcks()
 
     @cached_property
     def subscription_name(self) -> str:
@@ -232,9 +417,19 @@ class PubSub(GoogleTrigger):
         )
         self.start_workers(forwarders)
 
+        # start the extender of the ack deadlines of the messages waiting to be forwarded
+        extenders = self.create_workers(1, AckDeadlineExtender, self, self.subscription_name)
+        self.start_workers(extenders)
+
         # start the consumers
+        nb_pulls = int(os.environ.get("NB_PULLS_PER_CONSUMER", 2))
         consumers = self.create_workers(
-            int(os.environ.get("NB_CONSUMERS", 1)), MessagesConsumer, self, self.subscription_name, events_queue
+            int(os.environ.get("NB_CONSUMERS", 1)),
+            MessagesConsumer,
+            self,
+            self.subscription_name,
+            events_queue,
+            nb_pulls=nb_pulls,
         )
         self.start_workers(consumers)
 
@@ -243,7 +438,10 @@ class PubSub(GoogleTrigger):
             time.sleep(5)
 
             self.supervise_workers(forwarders, EventsForwarder, self, events_queue, max_batch_size=batch_size)
-            self.supervise_workers(consumers, MessagesConsumer, self, self.subscription_name, events_queue)
+            self.supervise_workers(
+                consumers, MessagesConsumer, self, self.subscription_name, events_queue, nb_pulls=nb_pulls
+            )
+            self.supervise_workers(extenders, AckDeadlineExtender, self, self.subscription_name)
 
         # Stop the consumer
         self.stop_workers(consumers, timeout=2)
@@ -255,5 +453,8 @@ class PubSub(GoogleTrigger):
         # Stop the forward
         self.stop_workers(forwarders)
 
+        # Stop extending the ack deadlines: the messages not forwarded will be redelivered
+        self.stop_workers(extenders)
+
         # Stop the connector executor
         self._executor.shutdown(wait=True)
@@ -4,11 +4,21 @@ from datetime import datetime
 from threading import Thread
 from unittest.mock import Mock, patch
 
+import requests
 from google.cloud import pubsub_v1
 from google.protobuf.timestamp_pb2 import Timestamp
 from pytest import fixture
+from tenacity import Retrying, stop_after_attempt
 
-from google_module.pubsub import EventsForwarder, MessagesConsumer, PubSub, Worker
+from google_module.pubsub import (
+    AckDeadlineExtender,
+    EventsForwarder,
+    MessagesBatch,
+    MessagesConsumer,
+    PendingAcks,
+    PubSub,
+    Worker,
+)
 
 
 @fixture
@@ -27,7 +37,7 @@ def trigger(credentials):
     }
     trigger.log = Mock()
     trigger.log_exception = Mock()
-    trigger.push_events_to_intakes = Mock()
+    trigger.push_events_to_intakes = Mock(side_effect=lambda events: [f"id{index}" for index in range(len(events))])
     yield trigger
 
 
@@ -78,20 +88,43 @@ def test_fetch_events(consumer, events_queue):
         )
         instance.__enter__.return_value = instance
 
-        messages = next(consumer.fetch_events())
+        batch = next(consumer.fetch_events())
 
-        assert len(messages) == 3
-        assert messages == ["data1", "data2", "data3"]
+        assert batch.messages == ["data1", "data2", "data3"]
+        assert batch.ack_ids == ["1", "3", "6"]
+
+        # the messages are acknowledged only once forwarded
+        assert instance.acknowledge.called is False
+        assert len(consumer.connector.pending_acks) == 3
+
+
+def test_fetch_events_with_several_pulls(trigger, events_queue):
+    consumer = MessagesConsumer(trigger, "subscription_name", events_queue, nb_pulls=3)
+    with patch("google_module.pubsub.SubscriberClient") as mock:
+        instance = mock.return_value
+        instance.pull.return_value = create_pull_response(
+            create_received_message(create_pubsub_message(b"data1", datetime(2023, 3, 11, 13, 21, 23)), "1"),
+        )
+        instance.__enter__.return_value = instance
+
+        events = consumer.fetch_events()
+        batches = [next(events) for _ in range(5)]
+        consumer.stop()
+        events.close()
+
+        assert [batch.messages for batch in batches] == [["data1"]] * 5
+        assert instance.pull.call_count >= 5
 
 
 def test_event_forwarder_next_batch(forwarder, events_queue):
     expected_lengths = [500, 500, 8]
     for length in expected_lengths:
-        events_queue.put(list(range(length)), block=False)
+        events_queue.put(MessagesBatch(list(range(length)), [str(index) for index in range(length)]), block=False)
 
     for length in expected_lengths:
         batch = forwarder.next_batch(500)
-        assert len(batch) == length
+        assert len(batch.messages) == length
+        assert len(batch.ack_ids) == length
 
 
 def test_create_workers(trigger, events_queue):
@@ -147,11 +180,11 @@ def test_supervise_workers(trigger):
 
 
 def test_event_forwarder_run(trigger, forwarder, events_queue):
-    batches = [["aaaaa"] * 100 for _ in range(10)]
+    batches = [MessagesBatch(["aaaaa"] * 100) for _ in range(10)]
     for batch in batches:
         events_queue.put(batch, block=False)
 
-    events_queue.put(["aaaaa"] * 8, block=False)
+    events_queue.put(MessagesBatch(["aaaaa"] * 8), block=False)
 
     thread = Thread(target=forwarder.run)
     thread.start()
@@ -162,3 +195,91 @@ def test_event_forwarder_run(trigger, forwarder, events_queue):
     assert trigger.log_exception.called is False
     assert events_queue.qsize() == 0
     assert trigger.push_events_to_intakes.call_count == 3
+
+
+def test_event_forwarder_acknowledges_after_push(trigger, forwarder):
+    trigger.pending_acks.add(["1", "2"])
+    with patch("google_module.pubsub.SubscriberClient") as mock:
+        instance = mock.return_value
+        calls = Mock()
+        calls.attach_mock(trigger.push_events_to_intakes, "push")
+        calls.attach_mock(instance.acknowledge, "acknowledge")
+
+        forwarder.forward(MessagesBatch(["event1", "event2"], ["1", "2"]))
+
+        assert [call[0] for call in calls.mock_calls] == ["push", "acknowledge"]
+        assert instance.acknowledge.call_args.kwargs["request"]["ack_ids"] == ["1", "2"]
+        assert len(trigger.pending_acks) == 0
+
+
+def test_event_forwarder_releases_messages_on_failure(trigger, forwarder):
+    trigger.pending_acks.add(["1", "2"])
+    trigger.push_events_to_intakes.side_effect = Exception("intake unavailable")
+    with patch("google_module.pubsub.SubscriberClient") as mock:
+        instance = mock.return_value
+
+        try:
+            forwarder.forward(MessagesBatch(["event1", "event2"], ["1", "2"]))
+        except Exception:
+            pass
+
+        assert instance.acknowledge.called is False
+        assert instance.modify_ack_deadline.call_args.kwargs["request"]["ack_deadline_seconds"] == 0
+        assert len(trigger.pending_acks) == 0
+
+
+def test_event_forwarder_releases_messages_on_intake_error(trigger, forwarder):
+    # the intake errors are not raised by the connector, only logged
+    del trigger.push_events_to_intakes
+    trigger.configuration.intake_server = "https://intake.fake.url"
+    trigger._retry = lambda: Retrying(stop=stop_after_attempt(1), reraise=True)
+
+    response = requests.Response()
+    response.status_code = 503
+    trigger._http_session = Mock()
+    trigger._http_session.post.return_value = response
+
+    trigger.pending_acks.add(["1", "2"])
+    with patch("google_module.pubsub.SubscriberClient") as mock:
+        instance = mock.return_value
+
+        forwarder.forward(MessagesBatch(["event1", "event2"], ["1", "2"]))
+
+        assert trigger._http_session.post.called
+        assert instance.acknowledge.called is False
+        assert instance.modify_ack_deadline.call_args.kwargs["request"]["ack_ids"] == ["1", "2"]
+        assert instance.modify_ack_deadline.call_args.kwargs["request"]["ack_deadline_seconds"] == 0
+        assert len(trigger.pending_acks) == 0
+
+
+def test_pending_acks():
+    pending_acks = PendingAcks()
+    pending_acks.add(["1", "2", "3"])
+
+    assert sorted(pending_acks.expiring(margin=60)) == ["1", "2", "3"]
+    assert pending_acks.expiring(margin=0) == []
+
+    pending_acks.extend(["1", "2"], 120)
+    assert pending_acks.expiring(margin=60) == ["3"]
+
+    pending_acks.remove(["3"])
+    assert pending_acks.expiring(margin=60) == []
+    assert len(pending_acks) == 2
+
+
+def test_ack_deadline_extender(trigger):
+    trigger.pending_acks.add(["1", "2"])
+    extender = AckDeadlineExtender(trigger, "subscription_name", interval=10)
+    with patch("google_module.pubsub.SubscriberClient") as mock:
+        instance = mock.return_value
+
+        extender.extend_deadlines()
+
+        request = instance.modify_ack_deadline.call_args.kwargs["request"]
+        assert request["ack_ids"] == ["1", "2"]
+        assert request["ack_deadline_seconds"] == 60
+
+        # the deadlines were extended: nothing to do until they expire
+        instance.modify_ack_deadline.reset_mock()
+        extender.extend_deadlines()
+        assert instance.modify_ack_deadline.called is False
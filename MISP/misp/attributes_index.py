@@ -0,0 +1,81 @@
+import logging
+import time
+from pathlib import Path
+
+import orjson
+
+
+class AttributesIndex:
+    """
+    Last known timestamp of the MISP attributes, by uuid, persisted in a JSON file
+
+    Attributes with a timestamp older than the TTL are evicted:
+    they are no longer considered as new anyway.
+    """
+
+    def __init__(self, path: Path, ttl: int):
+        self._logger = logging.getLogger(__name__)
+        self.path = path
+        self.ttl = ttl
+        self._timestamps: dict[str, int] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with self.path.open("rb") as f:
+                self._timestamps = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception:
+            self._logger.warning(f"Failed to load the attributes index from {self.path}, starting from scratch")
+            self._timestamps = {}
+            return
+
+        self.evict()
+
+    @property
+    def oldest_timestamp(self) -> int:
+        """Timestamp before which the attributes are evicted"""
+        return int(time.time()) - self.ttl
+
+    def __contains__(self, uuid: str) -> bool:
+        return self._timestamps.get(uuid, 0) > self.oldest_timestamp
+
+    def __getitem__(self, uuid: str) -> int:
+        if uuid not in self:
+            raise KeyError(uuid)
+
+        return self._timestamps[uuid]
+
+    def __setitem__(self, uuid: str, timestamp: int):
+        self._timestamps[uuid] = timestamp
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def evict(self):
+        """Remove the attributes older than the TTL"""
+        oldest_timestamp = self.oldest_timestamp
+        expired = [uuid for uuid, timestamp in self._timestamps.items() if timestamp <= oldest_timestamp]
+        for uuid in expired:
+            del self._timestamps[uuid]
+
+        self._dirty = self._dirty or bool(expired)
+
+    def save(self):
+        """Snapshot the index on disk, if it changed since the last snapshot"""
+        self.evict()
+        if not self._dirty:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            with tmp_path.open("wb") as f:
+                f.write(orjson.dumps(self._timestamps))
+            tmp_path.replace(self.path)
+            self._dirty = False
+        except Exception:
+            self._logger.warning(f"Failed to save the attributes index to {self.path}")
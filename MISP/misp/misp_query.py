@@ -12,9 +12,18 @@ class MISPQuery:
         self._logger = logging.getLogger(__name__)
         self._api = PyMISP(url=url, key=key, ssl=verify_ssl)
 
-    def get_events_starting_from(self, timestamp: float):
+    def get_events_starting_from(self, timestamp: float, attribute_timestamp: int | None = None):
+        """
+        Get the events published since the timestamp
+
+        If `attribute_timestamp` is set, only the attributes updated since this timestamp are returned.
+        """
+        filters = {}
+        if attribute_timestamp is not None:
+            filters["attribute_timestamp"] = attribute_timestamp
+
         try:
-            res = self._api.search(publish_timestamp=timestamp)
+            res = self._api.search(publish_timestamp=timestamp, **filters)
         except PyMISPError as ex:
             self._logger.error(f"The MISP server returned the following error: {ex.message}")
             raise MISPError(ex.message)
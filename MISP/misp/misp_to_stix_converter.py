@@ -22,6 +22,8 @@ import os
 import re
 import uuid
 from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 
 import pymisp
@@ -46,7 +48,8 @@ from misp.misp2stix2_mapping import (
     x509mapping,
 )
 from stix2 import exceptions
-from stix2.base import STIXJSONEncoder
+from stix2.base import _STIXBase
+from stix2.utils import format_datetime
 from stix2.v21 import (
     AttackPattern,
     Bundle,
@@ -119,19 +122,88 @@ tool_galaxies_list = (
 _MISP_event_tags = ["Threat-Report", 'misp:tool="misp2stix2"']
 
 
+def _load_misp_categories():
+    describe_types_filename = os.path.join(pymisp.__path__[0], "data/describeTypes.json")
+    with open(describe_types_filename) as describe_types:
+        return json.load(describe_types)["result"]["category_type_mappings"]
+
+
+# The categories of pymisp are loaded once, when the module is imported
+for _category in _load_misp_categories():
+    mispTypesMapping[_category] = {"to_call": "handle_person"}
+
+# Names of the methods resolving the MISP objects
+objects_resolvers_mapping = {
+    "asn": {"observable": "resolve_asn_observable", "pattern": "resolve_asn_pattern"},
+    "domain-ip": {"observable": "resolve_domain_ip_observable", "pattern": "resolve_domain_ip_pattern"},
+    "email": {"observable": "resolve_email_object_observable", "pattern": "resolve_email_object_pattern"},
+    "file": {"observable": "resolve_file_observable", "pattern": "resolve_file_pattern"},
+    "ip-port": {"observable": "resolve_ip_port_observable", "pattern": "resolve_ip_port_pattern"},
+    "network-socket": {"observable": "resolve_network_socket_observable", "pattern": "resolve_network_socket_pattern"},
+    "process": {"observable": "resolve_process_observable", "pattern": "resolve_process_pattern"},
+    "registry-key": {"observable": "resolve_regkey_observable", "pattern": "resolve_regkey_pattern"},
+    "stix2": {"pattern": "resolve_stix2_pattern"},
+    "url": {"observable": "resolve_url_observable", "pattern": "resolve_url_pattern"},
+    "x509": {"observable": "resolve_x509_observable", "pattern": "resolve_x509_pattern"},
+}
+
+# STIX type and name of the method adding the object, per galaxy type
+galaxies_mapping = {"branded-vulnerability": ("vulnerability", "add_vulnerability_from_galaxy")}
+galaxies_mapping.update(dict.fromkeys(attack_pattern_galaxies_list, ("attack-pattern", "add_attack_pattern")))
+galaxies_mapping.update(dict.fromkeys(course_of_action_galaxies_list, ("course-of-action", "add_course_of_action")))
+galaxies_mapping.update(dict.fromkeys(intrusion_set_galaxies_list, ("intrusion-set", "add_intrusion_set")))
+galaxies_mapping.update(dict.fromkeys(malware_galaxies_list, ("malware", "add_malware")))
+galaxies_mapping.update(dict.fromkeys(threat_actor_galaxies_list, ("threat-actor", "add_threat_actor")))
+galaxies_mapping.update(dict.fromkeys(tool_galaxies_list, ("tool", "add_tool")))
+
+
+def stix_to_primitive(value):
+    """
+    Convert STIX objects to primitive types, as they would be serialized in JSON
+    """
+    if isinstance(value, _STIXBase):
+        defaulted = value._defaulted_optional_properties
+        return {key: stix_to_primitive(item) for key, item in value.items() if key not in defaulted}
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return format_datetime(value)
+    if isinstance(value, Mapping):
+        return {key: stix_to_primitive(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [stix_to_primitive(item) for item in value]
+    return value
+
+
+def _convert_event(event):
+    return STIXConverter().convert(event)
+
+
 class STIXConverter:
     def __init__(self):
-        self.orgs = []
-        self.galaxies = []
+        self.orgs = set()
+        self.galaxies = set()
         self.to_return = {}
         self._logger = logging.getLogger(__name__)
 
     def convert(self, event):
-        self.initialize_misp_types()
         objects = self.handler(event["Event"])
         bundle = Bundle(objects=objects)
         # Will convert all the required fields to a primitive type
-        return json.loads(json.dumps(bundle, cls=STIXJSONEncoder))
+        return stix_to_primitive(bundle)
+
+    @staticmethod
+    def convert_many(events: Iterable[dict], max_workers: int | None = None, chunksize: int = 1) -> list[dict]:
+        """
+        Convert several events, across a pool of processes
+
+        The bundles are returned in the order of the events.
+        """
+        events = list(events)
+        if len(events) <= 1 or max_workers == 1:
+            converter = STIXConverter()
+            return [converter.convert(event) for event in events]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_convert_event, events, chunksize=chunksize))
 
     @staticmethod
     def __parse_link(link):
@@ -175,17 +247,10 @@ class STIXConverter:
                 identity_class="organization",
             )
             self.SDOs.append(identity)
-            self.orgs.append(org_uuid)
+            self.orgs.add(org_uuid)
             return 1
         return 0
 
-    def initialize_misp_types(self):
-        describe_types_filename = os.path.join(pymisp.__path__[0], "data/describeTypes.json")
-        describe_types = open(describe_types_filename)
-        categories_mapping = json.loads(describe_types.read())["result"]["category_type_mappings"]
-        for category in categories_mapping:
-            mispTypesMapping[category] = {"to_call": "handle_person"}
-
     def handler(self, event):
         self.misp_event = event
         self.SDOs = []
@@ -193,6 +258,12 @@ class STIXConverter:
         self.links = []
         self.markings = {}
         self.relationships = defaultdict(list)
+        # each bundle gets its own identities and galaxies
+        self.orgs = set()
+        self.galaxies = set()
+        self.objects_by_uuid = {
+            misp_object["uuid"]: misp_object for misp_object in event.get("Object") or [] if misp_object.get("uuid")
+        }
         self.__set_identity()
         if self.misp_event.get("Attribute"):
             for attribute in self.misp_event["Attribute"]:
@@ -203,7 +274,6 @@ class STIXConverter:
                     self._logger.error(event)
                     pass
         if self.misp_event.get("Object"):
-            self.load_objects_mapping()
             self.objects_to_parse = defaultdict(dict)
             misp_objects = self.misp_event["Object"]
             for misp_object in misp_objects:
@@ -224,81 +294,9 @@ class STIXConverter:
                 self.parse_galaxy(galaxy)
         return self.SDOs
 
-    def load_objects_mapping(self):
-        self.objects_mapping = {
-            "asn": {
-                "observable": self.resolve_asn_observable,
-                "pattern": self.resolve_asn_pattern,
-            },
-            "domain-ip": {
-                "observable": self.resolve_domain_ip_observable,
-                "pattern": self.resolve_domain_ip_pattern,
-            },
-            "email": {
-                "observable": self.resolve_email_object_observable,
-                "pattern": self.resolve_email_object_pattern,
-            },
-            "file": {
-                "observable": self.resolve_file_observable,
-                "pattern": self.resolve_file_pattern,
-            },
-            "ip-port": {
-                "observable": self.resolve_ip_port_observable,
-                "pattern": self.resolve_ip_port_pattern,
-            },
-            "network-socket": {
-                "observable": self.resolve_network_socket_observable,
-                "pattern": self.resolve_network_socket_pattern,
-            },
-            "process": {
-                "observable": self.resolve_process_observable,
-                "pattern": self.resolve_process_pattern,
-            },
-            "registry-key": {
-                "observable": self.resolve_regkey_observable,
-                "pattern": self.resolve_regkey_pattern,
-            },
-            "stix2": {"pattern": self.resolve_stix2_pattern},
-            "url": {
-                "observable": self.resolve_url_observable,
-                "pattern": self.resolve_url_pattern,
-            },
-            "x509": {
-                "observable": self.resolve_x509_observable,
-                "pattern": self.resolve_x509_pattern,
-            },
-        }
-        self.galaxies_mapping = {
-            "branded-vulnerability": [
-                "vulnerability",
-                self.add_vulnerability_from_galaxy,
-            ]
-        }
-        self.galaxies_mapping.update(
-            dict.fromkeys(
-                attack_pattern_galaxies_list,
-                ["attack-pattern", self.add_attack_pattern],
-            )
-        )
-        self.galaxies_mapping.update(
-            dict.fromkeys(
-                course_of_action_galaxies_list,
-                ["course-of-action", self.add_course_of_action],
-            )
-        )
-        self.galaxies_mapping.update(
-            dict.fromkeys(intrusion_set_galaxies_list, ["intrusion-set", self.add_intrusion_set])
-        )
-        self.galaxies_mapping.update(dict.fromkeys(malware_galaxies_list, ["malware", self.add_malware]))
-        self.galaxies_mapping.update(
-            dict.fromkeys(threat_actor_galaxies_list, ["threat-actor", self.add_threat_actor])
-        )
-        self.galaxies_mapping.update(dict.fromkeys(tool_galaxies_list, ["tool", self.add_tool]))
-
     def get_object_by_uuid(self, uuid):
-        for _object in self.misp_event["Object"]:
-            if _object.get("uuid") and _object["uuid"] == uuid:
-                return _object
+        if uuid in self.objects_by_uuid:
+            return self.objects_by_uuid[uuid]
         raise Exception(f"Object with uuid {uuid} does not exist in this event.")
 
     def handle_person(self, attribute):
@@ -463,12 +461,12 @@ class STIXConverter:
         galaxy_type = galaxy.get("type")
         galaxy_uuid = galaxy["GalaxyCluster"][0]["collection_uuid"]
         try:
-            stix_type, to_call = self.galaxies_mapping[galaxy_type]
+            stix_type, to_call = galaxies_mapping[galaxy_type]
         except Exception:
             return
         if galaxy_uuid not in self.galaxies:
-            to_call(galaxy)
-            self.galaxies.append(galaxy_uuid)
+            getattr(self, to_call)(galaxy)
+            self.galaxies.add(galaxy_uuid)
 
     @staticmethod
     def generate_galaxy_args(galaxy, b_killchain, b_alias, sdo_type):
@@ -694,7 +692,7 @@ class STIXConverter:
             pattern = pattern_arg
         else:
             name = misp_object["name"]
-            pattern = self.objects_mapping[name]["pattern"](misp_object["Attribute"], indicator_id)
+            pattern = getattr(self, objects_resolvers_mapping[name]["pattern"])(misp_object["Attribute"], indicator_id)
         category = misp_object.get("meta-category")
         killchain = self.create_killchain(category)
         labels = self.create_object_labels(name, category, True)
@@ -720,7 +718,9 @@ class STIXConverter:
             observable_objects = observable_arg
         else:
             name = misp_object["name"]
-            observable_objects = self.objects_mapping[name]["observable"](misp_object["Attribute"], observed_data_id)
+            observable_objects = getattr(self, objects_resolvers_mapping[name]["observable"])(
+                misp_object["Attribute"], observed_data_id
+            )
         category = misp_object.get("meta-category")
         labels = self.create_object_labels(name, category, False)
         timestamp = self.get_datetime_from_timestamp(misp_object["timestamp"])
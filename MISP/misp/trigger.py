@@ -3,7 +3,7 @@ import os
 import time
 from traceback import format_exc
 
-from cachetools import TTLCache
+from misp.attributes_index import AttributesIndex
 from misp.misp_query import MISPError, MISPQuery
 from sekoia_automation.exceptions import SendEventError
 from sekoia_automation.trigger import Trigger
@@ -24,7 +24,7 @@ class MISPTrigger(Trigger):
         )
         self._logger = logging.getLogger(__name__)
         self._query = None
-        self._old_ids = []
+        self._old_ids = set()
 
         self._attributes_cache = None
 
@@ -36,10 +36,16 @@ class MISPTrigger(Trigger):
     def attributes_filter(self):
         return int(self.configuration.get("attributes_filter", 0))
 
+    @property
+    def only_updated_attributes(self):
+        return bool(self.configuration.get("only_updated_attributes", False))
+
     @property
     def attributes_cache(self):
         if self._attributes_cache is None:
-            self._attributes_cache = TTLCache(maxsize=100000, ttl=self.attributes_filter)
+            self._attributes_cache = AttributesIndex(
+                self.data_path.joinpath("attributes_index.json"), ttl=self.attributes_filter
+            )
 
         return self._attributes_cache
 
@@ -66,7 +72,12 @@ class MISPTrigger(Trigger):
         # to be sure to not miss any event.
         next_timestamp = time.time()
         try:
-            events = self.query.get_events_starting_from(timestamp)
+            # Let MISP filter out the attributes that are too old to be considered as new
+            attribute_timestamp = None
+            if self.only_updated_attributes and self.attributes_filter:
+                attribute_timestamp = int(next_timestamp) - self.attributes_filter
+
+            events = self.query.get_events_starting_from(timestamp, attribute_timestamp=attribute_timestamp)
 
             if events:
                 self._logger.info(f"Processing {len(events)} events from MISP")
@@ -132,10 +143,10 @@ class MISPTrigger(Trigger):
         return event
 
     def process_new_events(self, events):
-        ids = []
+        ids = set()
         for event in events:
             event_id = event["Event"]["id"]
-            ids.append(event_id)
+            ids.add(event_id)
 
             if event_id in self._old_ids:
                 # We already got this event in the previous query
@@ -153,3 +164,6 @@ class MISPTrigger(Trigger):
             self.send_event(event["Event"]["info"], {"event": event})
 
         self._old_ids = ids
+
+        if self.attributes_filter:
+            self.attributes_cache.save()
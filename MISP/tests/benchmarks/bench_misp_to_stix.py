@@ -0,0 +1,137 @@
+"""
+Micro-benchmark of the conversion of large MISP events to STIX bundles.
+
+The events are shaped like the daily feed events (thousands of indicators and a galaxy).
+Compare the former serialization of the bundle (a round-trip through JSON) with the direct conversion
+to primitives, and the conversion of several events in a row with the process pool of `convert_many`.
+
+Usage:
+    python -m tests.benchmarks.bench_misp_to_stix [--events 8] [--attributes 1000] [--workers 4]
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from typing import Any
+
+from stix2.base import STIXJSONEncoder
+from stix2.v21 import Bundle
+
+from misp.misp_to_stix_converter import STIXConverter, stix_to_primitive
+
+ATTRIBUTE_TYPES = (
+    ("sha256", "Payload delivery", lambda rng: f"{rng.getrandbits(256):064x}"),
+    ("md5", "Payload delivery", lambda rng: f"{rng.getrandbits(128):032x}"),
+    ("domain", "Network activity", lambda rng: f"host{rng.randint(0, 10**6)}.example.com"),
+    ("ip-dst", "Network activity", lambda rng: f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.0.{rng.randint(1, 254)}"),
+    ("url", "Network activity", lambda rng: f"http://host{rng.randint(0, 10**6)}.example.com/payload.bin"),
+    ("sha1", "Payload delivery", lambda rng: f"{rng.getrandbits(160):040x}"),
+)
+
+
+def generate_event(rng: random.Random, attributes: int) -> dict[str, Any]:
+    """
+    Generate a MISP event with the given number of attributes and a galaxy.
+
+    Args:
+        rng: random.Random
+        attributes: int
+
+    Returns:
+        dict[str, Any]:
+    """
+
+    def attribute(attribute_type: str, category: str, value: str) -> dict:
+        return {
+            "type": attribute_type,
+            "category": category,
+            "to_ids": True,
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "timestamp": "1560916925",
+            "comment": "Daily Cryptolaemus Import",
+            "object_relation": None,
+            "value": value,
+            "Galaxy": [],
+            "ShadowAttribute": [],
+        }
+
+    return {
+        "Event": {
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "date": "2019-06-19",
+            "timestamp": "1560917153",
+            "info": "Daily Incremental Cryptolaemus Emotet IOCs (payload)",
+            "Orgc": {"id": "175", "name": "InThreat", "uuid": "5b9fa2fb-6f38-4045-8c15-2c3e0a00020f"},
+            "Attribute": [
+                attribute(attribute_type, category, make_value(rng))
+                for attribute_type, category, make_value in rng.choices(ATTRIBUTE_TYPES, k=attributes)
+            ],
+            "Tag": [{"name": "tlp:white"}],
+            "Galaxy": [
+                {
+                    "name": "Intrusion Set",
+                    "type": "mitre-intrusion-set",
+                    "description": "Name of ATT&CK Group",
+                    "GalaxyCluster": [
+                        {
+                            "collection_uuid": "10df003e-7b2a-4a4e-a9d4-9fd1c1e3e7a6",
+                            "type": "mitre-intrusion-set",
+                            "value": "TA542 - G0147",
+                            "tag_name": 'misp-galaxy:mitre-intrusion-set="TA542 - G0147"',
+                            "description": "Threat group operating the Emotet botnet.",
+                            "meta": {},
+                        }
+                    ],
+                }
+            ],
+        }
+    }
+
+
+def former_convert(event: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert the event and serialize the bundle as the converter used to.
+
+    Args:
+        event: dict[str, Any]
+
+    Returns:
+        dict[str, Any]:
+    """
+    bundle = Bundle(objects=STIXConverter().handler(event["Event"]))
+    return json.loads(json.dumps(bundle, cls=STIXJSONEncoder))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=8)
+    parser.add_argument("--attributes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    events = [generate_event(rng, args.attributes) for _ in range(args.events)]
+    print(f"{args.events} events of {args.attributes} attributes")
+
+    bundle = Bundle(objects=STIXConverter().handler(events[0]["Event"]))
+    assert stix_to_primitive(bundle) == json.loads(json.dumps(bundle, cls=STIXJSONEncoder))
+
+    for name, function in (
+        ("former", lambda: [former_convert(event) for event in events]),
+        ("direct", lambda: STIXConverter.convert_many(events, max_workers=1)),
+        ("pool", lambda: STIXConverter.convert_many(events, max_workers=args.workers)),
+    ):
+        durations = []
+        for _ in range(3):
+            start = time.perf_counter()
+            count = sum(len(bundle["objects"]) for bundle in function())
+            durations.append(time.perf_counter() - start)
+
+        duration = min(durations)
+        print(f"{name:>10}: {count} STIX objects in {duration:.3f}s ({args.events / duration:.1f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
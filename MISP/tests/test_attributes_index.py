@@ -0,0 +1,36 @@
+from freezegun import freeze_time
+
+from misp.attributes_index import AttributesIndex
+
+
+@freeze_time("2019-06-19 23:00:00")
+def test_attributes_index_persisted(tmp_path):
+    path = tmp_path / "attributes_index.json"
+    index = AttributesIndex(path, ttl=3600)
+    index["attribute-1"] = 1560984000
+    index.save()
+
+    index = AttributesIndex(path, ttl=3600)
+    assert "attribute-1" in index
+    assert index["attribute-1"] == 1560984000
+
+
+@freeze_time("2019-06-19 23:00:00")
+def test_attributes_index_eviction(tmp_path):
+    path = tmp_path / "attributes_index.json"
+    index = AttributesIndex(path, ttl=3600)
+    index["recent"] = 1560984000
+    index["old"] = 1560900000
+
+    assert "old" not in index
+    index.save()
+    assert len(index) == 1
+
+    assert len(AttributesIndex(path, ttl=3600)) == 1
+
+
+def test_attributes_index_corrupted_file(tmp_path):
+    path = tmp_path / "attributes_index.json"
+    path.write_text("not json")
+
+    assert len(AttributesIndex(path, ttl=3600)) == 0
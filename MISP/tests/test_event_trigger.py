@@ -13,8 +13,8 @@ def misp_api(misp_event, requests_mock, misp_base_server, misp_base_url: str):
 
 
 @pytest.fixture
-def misp_trigger(misp_api, misp_base_url):
-    trigger = MISPTrigger()
+def misp_trigger(misp_api, misp_base_url, tmp_path):
+    trigger = MISPTrigger(data_path=tmp_path)
 
     trigger.module.configuration = {
         "misp_url": misp_base_url,
@@ -81,6 +81,42 @@ def test_misp_trigger_attribute_filter_cache(send_event_mock, misp_trigger, misp
     assert send_event_mock.call_count == 1
 
     # Fetch MISP updates another time with same events, this should not create another event
-    misp_trigger._old_ids = []
+    misp_trigger._old_ids = set()
     misp_trigger._run(datetime.now().timestamp())
     assert send_event_mock.call_count == 1
+
+
+@freeze_time("2019-06-19 23:00:00")
+@patch.object(MISPTrigger, "send_event")
+def test_misp_trigger_attribute_filter_cache_persisted(send_event_mock, misp_trigger, misp_base_url, tmp_path):
+    misp_trigger.configuration = {"attributes_filter": "86400"}
+    misp_trigger._run(datetime.now().timestamp())
+    assert send_event_mock.call_count == 1
+
+    # After a restart, the attributes already sent are not sent again
+    trigger = MISPTrigger(data_path=tmp_path)
+    trigger.module.configuration = misp_trigger.module.configuration
+    trigger.configuration = {"attributes_filter": "86400"}
+    trigger._run(datetime.now().timestamp())
+    assert send_event_mock.call_count == 1
+
+
+@freeze_time("2019-06-19 23:00:00")
+@patch.object(MISPTrigger, "send_event")
+def test_misp_trigger_only_updated_attributes(send_event_mock, misp_trigger, misp_api):
+    misp_trigger.configuration = {"attributes_filter": "86400", "only_updated_attributes": True}
+
+    misp_trigger._run(datetime.now().timestamp())
+
+    search = misp_api.request_history[-1].json()
+    assert search["attribute_timestamp"] == int(datetime.now().timestamp()) - 86400
+    assert send_event_mock.call_count == 1
+
+
+@patch.object(MISPTrigger, "send_event")
+def test_misp_trigger_skip_already_retrieved_events(send_event_mock, misp_trigger, misp_api):
+    misp_trigger._run(datetime.now().timestamp())
+    misp_trigger._run(datetime.now().timestamp())
+
+    assert misp_trigger._old_ids == {"47433"}
+    assert send_event_mock.call_count == 1
@@ -1,4 +1,12 @@
+import json
+from copy import deepcopy
+
+import pytest
+from stix2.base import STIXJSONEncoder
+from stix2.v21 import Bundle
+
 from misp.misp_to_stix import MISPToSTIXAction
+from misp.misp_to_stix_converter import STIXConverter, stix_to_primitive
 
 
 def test_misp_to_stix(misp_event):
@@ -26,3 +34,41 @@ def test_misp_to_stix(misp_event):
         "[file:hashes.'sha256' = '7cf5151c21e271989e6702405537e51ec6c7e097de943cfe1428f6f0cfed3cd9']",
         "[file:hashes.'sha256' = '1bdaa4b98aee67b7e3e46802b871671b38e632a87e316c22ac272a6bd5b8e282']",
     }
+
+
+def test_stix_to_primitive_matches_json_serialization(misp_event):
+    converter = STIXConverter()
+    bundle = Bundle(objects=converter.handler(misp_event["Event"]))
+
+    assert stix_to_primitive(bundle) == json.loads(json.dumps(bundle, cls=STIXJSONEncoder))
+
+
+def test_converter_is_reusable(misp_event):
+    converter = STIXConverter()
+
+    first = converter.convert(misp_event)
+    second = converter.convert(misp_event)
+
+    # the identity of the organization is part of each bundle
+    assert [sdo["type"] for sdo in first["objects"]] == [sdo["type"] for sdo in second["objects"]]
+    assert "identity" in {sdo["type"] for sdo in second["objects"]}
+
+
+def test_get_object_by_uuid(misp_event):
+    event = deepcopy(misp_event)
+    event["Event"]["Object"] = [{"uuid": "object-1", "name": "url", "meta-category": "network", "Attribute": []}]
+    converter = STIXConverter()
+    converter.handler(event["Event"])
+
+    assert converter.get_object_by_uuid("object-1")["name"] == "url"
+    with pytest.raises(Exception):
+        converter.get_object_by_uuid("object-2")
+
+
+def test_convert_many(misp_event):
+    bundles = STIXConverter.convert_many([misp_event, misp_event], max_workers=2)
+
+    assert len(bundles) == 2
+    for bundle in bundles:
+        assert bundle["type"] == "bundle"
+        assert len(bundle["objects"]) == 11
@@ -1,7 +1,6 @@
 import gzip
 import io
 import itertools
-import json
 import sys
 import uuid
 import zipfile
@@ -9,6 +8,7 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 
 import magic
+import orjson
 import pytz
 from osintcollector.errors import GZipError, MagicLibError, UnzipError
 from osintcollector.validators import is_valid
@@ -191,7 +191,7 @@ def _create_observable(observable: dict, source: dict, identity: dict, serialize
     if port:
         context["port"] = port
     for observable in new_observables.values():
-        serialized = json.dumps(observable, sort_keys=True)
+        serialized = orjson.dumps(observable, option=orjson.OPT_SORT_KEYS)
 
         # Skip duplicates
         if serialized in serialized_observables:
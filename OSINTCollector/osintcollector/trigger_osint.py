@@ -1,10 +1,12 @@
-import copy
+import hashlib
 import logging
 import os
 import re
+import time
 import uuid
 from traceback import format_exc
 
+import orjson
 import requests
 from apscheduler.schedulers.blocking import BlockingScheduler
 from osintcollector.errors import GZipError, MagicLibError, UnzipError
@@ -15,6 +17,29 @@ from sekoia_automation.storage import PersistentJSON, write
 from sekoia_automation.trigger import Trigger
 
 
+def observable_hash(observable: dict) -> str:
+    """
+    Stable hash of the content of an observable
+
+    The dates of the history and the validity of the tags are ignored
+    because they change at each call
+    """
+    content = dict(observable)
+    if "x_inthreat_history" in content:
+        content["x_inthreat_history"] = [
+            {key: value for key, value in history.items() if key != "date"}
+            for history in content["x_inthreat_history"]
+        ]
+
+    if "x_inthreat_tags" in content:
+        content["x_inthreat_tags"] = [
+            {key: value for key, value in tag.items() if key not in ("valid_from", "valid_until")}
+            for tag in content["x_inthreat_tags"]
+        ]
+
+    return hashlib.blake2b(orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
 class OSINTTrigger(Trigger):
     """
     Trigger that gets the new OSINT events on a regular basis
@@ -77,40 +102,61 @@ class OSINTTrigger(Trigger):
         self._scheduler.start()
         self.log("Stopping OSINTCollector trigger")
 
+    @staticmethod
+    def _cache_file(source: dict) -> str:
+        return re.sub("[^A-Za-z0-9._]", "_", source["url"])
+
     def _new_observables(self, source: dict, observables: list) -> list:
-        """Only return observables that were not returned by the last iteration"""
+        """
+        Only return observables that were not returned by the last iteration
+
+        The cache only keeps the hashes of the observables, with the last time they were seen.
+        Observables missing from the source are remembered for `cache_ttl` seconds (0 by default).
+        """
         if not source.get("cache_results", True):
             return observables
 
+        now = int(time.time())
         new_observables = []
-        cache_file = re.sub("[^A-Za-z0-9._]", "_", source["url"])
 
-        with PersistentJSON(cache_file, data_path=self._data_path) as cache:
-            cache.setdefault("observables", [])
+        with PersistentJSON(self._cache_file(source), data_path=self._data_path) as cache:
+            last_seen: dict[str, int] | None = cache.get("hashes")
+            if last_seen is None:
+                # Former caches stored the observables themselves
+                last_seen = {observable_hash(observable): now for observable in cache.pop("observables", [])}
 
-            to_cache = []
             for observable in observables:
-                # Copy the object and remove the `date` field
-                # Because it will change at each call
-                observable_copy = copy.deepcopy(observable)
-                for history in observable_copy.get("x_inthreat_history", []):
-                    history.pop("date", None)
-
-                for tag in observable_copy.get("x_inthreat_tags", []):
-                    tag.pop("valid_from", None)
-                    tag.pop("valid_until", None)
-
-                to_cache.append(observable_copy)
-                if observable_copy not in cache["observables"]:
+                key = observable_hash(observable)
+                if key not in last_seen:
                     new_observables.append(observable)
 
-            cache["observables"] = to_cache
+                last_seen[key] = now
+
+            expired_before = now - int(source.get("cache_ttl", 0))
+            cache["hashes"] = {key: seen_at for key, seen_at in last_seen.items() if seen_at >= expired_before}
 
         return new_observables
 
+    def _http_validators(self, source: dict) -> dict:
+        """Return the validators (ETag, Last-Modified) of the last successful fetch of the source"""
+        if not source.get("cache_results", True):
+            return {}
+
+        with PersistentJSON(f"{self._cache_file(source)}.http", data_path=self._data_path) as cache:
+            return dict(cache)
+
+    def _save_http_validators(self, source: dict, validators: dict) -> None:
+        if not source.get("cache_results", True):
+            return
+
+        with PersistentJSON(f"{self._cache_file(source)}.http", data_path=self._data_path) as cache:
+            cache.clear()
+            cache.update(validators)
+
     def _run(self, source) -> None:
         try:
-            raw_data = self.__crawl(name=source.get("name"), url=source.get("url"))
+            validators = self._http_validators(source)
+            raw_data = self.__crawl(name=source.get("name"), url=source.get("url"), validators=validators)
 
             if raw_data:
                 try:
@@ -126,6 +172,9 @@ class OSINTTrigger(Trigger):
                     if observables:
                         self._send_observables(identity, observables)
 
+                    # Only skip the unchanged source once its content was processed
+                    self._save_http_validators(source, validators)
+
                 except ScrapingError as e:
                     self.log(
                         f'Error while parsing source {source.get("name")}:\n'
@@ -164,11 +213,26 @@ class OSINTTrigger(Trigger):
             remove_directory=True,
         )
 
-    def __crawl(self, name: str, url: str) -> str | None:
+    def __crawl(self, name: str, url: str, validators: dict | None = None) -> str | None:
         """
         Downloads the raw data from the requested source
+
+        When validators of a previous fetch are given, the request is conditional
+        and nothing is returned if the source didn't change.
+        The validators are updated with the ones of the response.
         """
-        response = requests.get(url, timeout=5)
+        validators = validators if validators is not None else {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = requests.get(url, headers=headers, timeout=5)
+
+        if response.status_code == 304:
+            self.log(f"{name}: source not modified since the last fetch")
+            return None
 
         if not response.ok:
             self.log(
@@ -178,6 +242,12 @@ class OSINTTrigger(Trigger):
             )
             return None
 
+        validators.clear()
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+
         try:
             data = magic_data(response.content)
 
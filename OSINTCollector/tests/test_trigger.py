@@ -1,4 +1,5 @@
 import json
+import time
 from pathlib import Path
 from shutil import rmtree
 from tempfile import mkdtemp
@@ -6,7 +7,7 @@ from unittest.mock import patch
 
 import pytest
 import requests_mock
-from osintcollector.trigger_osint import OSINTTrigger
+from osintcollector.trigger_osint import OSINTTrigger, observable_hash
 
 
 @pytest.fixture(autouse=True)
@@ -314,6 +315,138 @@ def test_observable_cache(send_event, ssh_source, symphony_storage):
                 assert obj["value"] == "1.156.8.47"
 
 
+@patch.object(OSINTTrigger, "send_event")
+def test_observable_cache_ttl(send_event, ssh_source, symphony_storage):
+    trigger = OSINTTrigger(data_path=symphony_storage)
+    ssh_source["cache_ttl"] = 3600
+
+    trigger._run(ssh_source)
+    send_event.assert_called_once()
+
+    # Observables missing from the source are remembered until the ttl expires
+    with requests_mock.Mocker() as mock:
+        mock.get(ssh_source["url"], text="1.10.185.247")
+        trigger._run(ssh_source)
+    send_event.assert_called_once()
+
+    trigger._run(ssh_source)
+    send_event.assert_called_once()
+
+    with patch("osintcollector.trigger_osint.time.time", return_value=time.time() + 7200):
+        with requests_mock.Mocker() as mock:
+            mock.get(ssh_source["url"], text="1.10.185.247")
+            trigger._run(ssh_source)
+
+        trigger._run(ssh_source)
+
+    assert send_event.call_count == 2
+    name, bundle = get_name_and_bundle(symphony_storage, send_event)
+    assert name == "OSINT: blocklist.de ssh: 3 observables"
+
+
+@patch.object(OSINTTrigger, "send_event")
+def test_observable_cache_migration(send_event, ssh_source, symphony_storage):
+    # Former caches stored the observables themselves
+    cache_file = symphony_storage / "https___lists.blocklist.de_lists_ssh.txt"
+    cache_file.write_text(
+        json.dumps(
+            {
+                "observables": [
+                    {
+                        "type": "ipv4-addr",
+                        "value": "1.10.185.247",
+                        "x_inthreat_tags": [{"name": "scanner"}, {"name": "scanner:ssh"}],
+                        "x_inthreat_sources_refs": ["identity--7f1f7357-9669-5925-8a04-4d1a1701a80a"],
+                    }
+                ]
+            }
+        )
+    )
+
+    trigger = OSINTTrigger(data_path=symphony_storage)
+    trigger._run(ssh_source)
+
+    name, bundle = get_name_and_bundle(symphony_storage, send_event)
+    assert name == "OSINT: blocklist.de ssh: 3 observables"
+    assert "observables" not in json.loads(cache_file.read_text())
+
+
+def test_observable_hash():
+    observable = {
+        "type": "ipv4-addr",
+        "value": "1.10.185.247",
+        "x_inthreat_tags": [{"name": "scanner", "valid_from": "2024-01-01", "valid_until": "2024-01-31"}],
+        "x_inthreat_history": [{"date": "2024-01-01", "value": "malicious"}],
+    }
+    same_observable = {
+        "value": "1.10.185.247",
+        "type": "ipv4-addr",
+        "x_inthreat_tags": [{"name": "scanner", "valid_from": "2024-02-01", "valid_until": "2024-02-28"}],
+        "x_inthreat_history": [{"date": "2024-02-01", "value": "malicious"}],
+    }
+
+    assert observable_hash(observable) == observable_hash(same_observable)
+    assert observable_hash(observable) != observable_hash({**observable, "value": "1.10.185.248"})
+    # the observable is left untouched
+    assert observable["x_inthreat_tags"][0]["valid_from"] == "2024-01-01"
+
+
+@patch.object(OSINTTrigger, "send_event")
+def test_conditional_fetch(send_event, symphony_storage):
+    source = {
+        "name": "blocklist.de ssh",
+        "identity": "blocklist.de",
+        "url": "https://lists.blocklist.de/lists/ssh.txt",
+        "global_format": "line",
+        "fields": ["ipv4-addr"],
+    }
+    trigger = OSINTTrigger(data_path=symphony_storage)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            source["url"],
+            [
+                {
+                    "text": "1.10.185.247",
+                    "headers": {"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+                },
+                {"status_code": 304},
+            ],
+        )
+
+        trigger._run(source)
+        trigger._run(source)
+
+        assert "If-None-Match" not in mock.request_history[0].headers
+        assert mock.request_history[1].headers["If-None-Match"] == '"abc"'
+        assert mock.request_history[1].headers["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+
+    send_event.assert_called_once()
+
+
+@patch.object(OSINTTrigger, "send_event")
+def test_conditional_fetch_nocache(send_event, symphony_storage):
+    source = {
+        "name": "blocklist.de ssh",
+        "identity": "blocklist.de",
+        "url": "https://lists.blocklist.de/lists/ssh.txt",
+        "global_format": "line",
+        "fields": ["ipv4-addr"],
+        "cache_results": False,
+    }
+    trigger = OSINTTrigger(data_path=symphony_storage)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(source["url"], text="1.10.185.247", headers={"ETag": '"abc"'})
+
+        trigger._run(source)
+        trigger._run(source)
+
+        assert "If-None-Match" not in mock.request_history[1].headers
+
+    assert send_event.call_count == 2
+
+
 @pytest.fixture
 def amazon_ranges_source():
     source = {
@@ -1,12 +1,13 @@
 import asyncio
-import json
 import os
 import signal
 import time
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
 from functools import cached_property
+from itertools import islice
 
+import orjson
 from sekoia_automation.aio.connector import AsyncConnector
 
 from office365.metrics import FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
@@ -26,6 +27,7 @@ class Office365Connector(AsyncConnector):
         self.limit_of_events_to_push = int(os.getenv("OFFICE365_BATCH_SIZE", 10000))
         self._frequency = int(os.getenv("OFFICE365_PULL_FREQUENCY", 60))
         self.time_range_interval = int(os.getenv("OFFICE365_TIME_RANGE_INTERVAL", 30))
+        self.max_concurrent_fetches = int(os.getenv("OFFICE365_MAX_CONCURRENT_FETCHES", 10))
 
     async def shutdown(self) -> None:
         """
@@ -57,9 +59,67 @@ class Office365Connector(AsyncConnector):
         self._client_closed = False
         return client
 
+    async def list_content_uris(self, start_date: datetime, end_date: datetime) -> list[str]:
+        """Lists the uris of the unexpired contents of all the Office 365 subscriptions
+
+        The subscriptions are listed concurrently.
+
+        Args:
+            start_date (datetime): Start date of the interval
+            end_date (datetime): End date of the interval
+
+        Returns:
+            list[str]: The uris of the contents
+        """
+        content_types = await self.client.list_subscriptions()
+        listers = [
+            asyncio.create_task(self._list_subscription_content_uris(content_type, start_date, end_date))
+            for content_type in content_types
+        ]
+        try:
+            content_uris = await asyncio.gather(*listers)
+        finally:
+            # do not leave the other subscriptions being listed if one failed
+            for lister in listers:
+                lister.cancel()
+
+        return [content_uri for uris in content_uris for content_uri in uris]
+
+    async def _list_subscription_content_uris(
+        self, content_type: str, start_date: datetime, end_date: datetime
+    ) -> list[str]:
+        content_uris: list[str] = []
+
+        # Get the paginated contents from a subscription
+        async for contents in self.client.get_subscription_contents(
+            content_type, start_time=start_date, end_time=end_date
+        ):
+            for content in contents:
+                # https://learn.microsoft.com/en-us/office/office-365-management-api/office-365-management-activity-api-reference
+                content_expiration = content.get("contentExpiration")
+
+                if content_expiration:
+                    now = datetime.now(UTC)
+                    parsed_expiration = datetime.strptime(content_expiration, "%Y-%m-%dT%H:%M:%S.%fZ").replace(
+                        tzinfo=UTC
+                    )
+
+                    if now > parsed_expiration:
+                        continue
+
+                content_uris.append(content["contentUri"])
+
+        return content_uris
+
+    async def _get_serialized_content(self, content_uri: str) -> list[str]:
+        return [orjson.dumps(event).decode("utf-8") for event in await self.client.get_content(content_uri)]
+
     async def pull_content(self, start_date: datetime, end_date: datetime) -> AsyncGenerator[list[str], None]:
         """Pulls content from Office 365 subscriptions
 
+        The contents are fetched concurrently, up to `max_concurrent_fetches` at the same time,
+        and their events are yielded by batches as the contents are received.
+
         Args:
             start_date (datetime): Start date of the interval
             end_date (datetime): End date of the interval
@@ -69,32 +129,29 @@ class Office365Connector(AsyncConnector):
         """
         pulled_events: list[str] = []
 
-        content_types = await self.client.list_subscriptions()
-        for content_type in content_types:
-            # Get the paginated contents from a subscription
-            async for contents in self.client.get_subscription_contents(
-                content_type, start_time=start_date, end_time=end_date
-            ):
-                for content in contents:
-                    # https://learn.microsoft.com/en-us/office/office-365-management-api/office-365-management-activity-api-reference
-                    content_expiration = content.get("contentExpiration")
-
-                    if content_expiration:
-                        now = datetime.now(UTC)
-                        parsed_expiration = datetime.strptime(content_expiration, "%Y-%m-%dT%H:%M:%S.%fZ").replace(
-                            tzinfo=UTC
-                        )
-
-                        if now > parsed_expiration:
-                            continue
-
-                    events = await self.client.get_content(content["contentUri"])
-                    for event in events:
-                        pulled_events.append(json.dumps(event))
-
-                    if len(pulled_events) > self.limit_of_events_to_push:
-                        yield pulled_events
-                        pulled_events = []
+        content_uris = iter(await self.list_content_uris(start_date, end_date))
+        pending: set[asyncio.Task[list[str]]] = set()
+        try:
+            while True:
+                # keep `max_concurrent_fetches` contents being fetched
+                for content_uri in islice(content_uris, self.max_concurrent_fetches - len(pending)):
+                    pending.add(asyncio.create_task(self._get_serialized_content(content_uri)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pulled_events.extend(task.result())
+
+                if len(pulled_events) > self.limit_of_events_to_push:
+                    yield pulled_events
+                    pulled_events = []
+        finally:
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
 
         if len(pulled_events) > 0:
             yield pulled_events
@@ -140,7 +197,7 @@ class Office365Connector(AsyncConnector):
                 intermediate_batch_duration
             )
 
-            # save intermediate end date
+            # save intermediate end date, once all the contents of the range are forwarded
             checkpoint.offset = end_date
 
         # save end date
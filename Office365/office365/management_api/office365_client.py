@@ -7,7 +7,7 @@ from typing import Any
 from urllib.parse import urlencode, urlparse, urlunsplit
 
 import msal
-from aiohttp.client import ClientSession
+from aiohttp.client import ClientResponse, ClientSession
 
 from .constants import OFFICE365_ACTIVE_SUBSCRIPTION_STATUS, OFFICE365_AUTHORITY_DEFAULT, OFFICE365_URL_BASE
 from .errors import (
@@ -29,6 +29,7 @@ class Office365API:
         client_secret: str,
         tenant_id: str,
         publisher_id: str | None = None,
+        max_throttling_retries: int = 5,
     ):
         self.client_id = client_id
         self.tenant_id = tenant_id
@@ -40,6 +41,7 @@ class Office365API:
         self._session = ClientSession()
         self._token_expiration = 0
         self._publisher_id = publisher_id
+        self._max_throttling_retries = max_throttling_retries
 
     async def close(self):
         """
@@ -83,6 +85,35 @@ class Office365API:
 
         yield self._session
 
+    async def _get(self, url: str) -> ClientResponse:
+        """
+        Send a GET request with a fresh session
+
+        Throttled requests (429 status) are retried after the delay from the Retry-After header,
+        or after an exponential backoff if the header is undefined
+
+        :param str url: The url to request
+        :return: The response
+        :rtype: ClientResponse
+        """
+        attempt = 0
+        while True:
+            async with self._fresh_session() as session:
+                response = await session.get(url)
+
+            if response.status != 429 or attempt >= self._max_throttling_retries:
+                return response
+
+            try:
+                delay = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                delay = min(2**attempt, 60)
+
+            logger.warning("Request throttled by the Office 365 Management API", url=url, delay=delay)
+            response.release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
     async def activate_subscriptions(self) -> None:
         """
         Activate subscriptions for a tenant
@@ -192,27 +223,24 @@ class Office365API:
         next_page_uri: str | None = f"{base_url}/subscriptions/content?{query_string}"
         while next_page_uri is not None:
             # queries the contents for the current page
-            async with self._fresh_session() as session:
-                response = await session.get(
-                    next_page_uri,
-                )
+            response = await self._get(next_page_uri)
 
-                # check HTTP status code
-                if response.status >= 400:
-                    raise FailedToGetO365SubscriptionContents(status_code=response.status, body=await response.text())
+            # check HTTP status code
+            if response.status >= 400:
+                raise FailedToGetO365SubscriptionContents(status_code=response.status, body=await response.text())
 
-                contents = await response.json()
+            contents = await response.json()
 
-                # check business errors
-                if "error" in contents:
-                    raise FailedToGetO365SubscriptionContents(
-                        error_code=contents["error"].get("code"), error_message=contents["error"].get("message")
-                    )
+            # check business errors
+            if "error" in contents:
+                raise FailedToGetO365SubscriptionContents(
+                    error_code=contents["error"].get("code"), error_message=contents["error"].get("message")
+                )
 
-                yield contents
+            yield contents
 
-                # get the uri for the next page if defined
-                next_page_uri = response.headers.get("NextPageUri")
+            # get the uri for the next page if defined
+            next_page_uri = response.headers.get("NextPageUri")
 
     async def get_content(self, content_uri: str) -> list[dict[str, Any]]:
         """
@@ -223,24 +251,21 @@ class Office365API:
         :rtype: list
         """
         # queries the contents for the current page
-        async with self._fresh_session() as session:
-            response = await session.get(
-                content_uri,
-            )
+        response = await self._get(content_uri)
 
-            # check HTTP status code
-            if response.status >= 400:
-                raise FailedToGetO365AuditContent(status_code=response.status, body=await response.text())
+        # check HTTP status code
+        if response.status >= 400:
+            raise FailedToGetO365AuditContent(status_code=response.status, body=await response.text())
 
-            content = await response.json(content_type=None)
+        content = await response.json(content_type=None)
 
-            # check business errors
-            if "error" in content:
-                raise FailedToGetO365AuditContent(
-                    error_code=content["error"].get("code"), error_message=content["error"].get("message")
-                )
+        # check business errors
+        if "error" in content:
+            raise FailedToGetO365AuditContent(
+                error_code=content["error"].get("code"), error_message=content["error"].get("message")
+            )
 
-            return content
+        return content
 
     def _normalize_office365_url(self) -> str:
         """
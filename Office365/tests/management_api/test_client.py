@@ -1,5 +1,6 @@
 import re
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
 from urllib.parse import urlencode
 
 import orjson
@@ -542,10 +543,8 @@ audit/492638008028$492638008028$f28ab78ad40140608012736e373933ebspo2015043022$4a
                 },
             ]
         ),
-        headers={
-            "NextPageUri": f"https://manage.office.com/api/v1.0/{tenant_id}/activity/feed/subscriptions/content\
-?contentType=content_types&nextPage=2015101900R022885001761"
-        },
+        headers={"NextPageUri": f"https://manage.office.com/api/v1.0/{tenant_id}/activity/feed/subscriptions/content\
+?contentType=content_types&nextPage=2015101900R022885001761"},
     )
     mocked_responses.get(
         f"https://manage.office.com/api/v1.0/{tenant_id}/activity/feed/subscriptions/content?contentType=content_types&nextPage=2015101900R022885001761",
@@ -779,3 +778,49 @@ audit/492638008028$492638008028$f28ab78ad40140608012736e373933ebspo2015043022$4a
 
     # finalize
     await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_content_should_retry_throttled_requests(mocked_responses, mock_azure_authentication, tenant_id):
+    # arrange
+    content_uri = f"https://manage.office.com/api/v1.0/{tenant_id}/activity/feed/audit/content"
+    mocked_responses.get(content_uri, status=429, headers={"Retry-After": "0"})
+    mocked_responses.get(content_uri, status=429)
+    mocked_responses.get(content_uri, status=200, body=orjson.dumps([{"Id": "1"}]))
+
+    client = Office365API(client_id="client_id", client_secret="client_secret", tenant_id=tenant_id)
+
+    # act
+    with patch("office365.management_api.office365_client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        content = await client.get_content(content_uri)
+
+    # assert
+    assert content == [{"Id": "1"}]
+    assert [call.args[0] for call in sleep.await_args_list] == [0.0, 2]
+
+    # finalize
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_content_should_exception_when_throttled_too_long(
+    mocked_responses, mock_azure_authentication, tenant_id
+):
+    # arrange
+    content_uri = f"https://manage.office.com/api/v1.0/{tenant_id}/activity/feed/audit/content"
+    mocked_responses.get(content_uri, status=429, repeat=True)
+
+    client = Office365API(
+        client_id="client_id", client_secret="client_secret", tenant_id=tenant_id, max_throttling_retries=2
+    )
+
+    # act
+    with patch("office365.management_api.office365_client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        with pytest.raises(FailedToGetO365AuditContent):
+            await client.get_content(content_uri)
+
+    # assert
+    assert sleep.await_count == 2
+
+    # finalize
+    await client.close()
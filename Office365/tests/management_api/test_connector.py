@@ -65,6 +65,68 @@ async def test_pull_content(connector, event):
     assert [json.loads(event) for event in result[0]] == [event, event, event, event]
 
 
+@pytest.mark.asyncio
+async def test_pull_content_concurrently(connector):
+    connector.client.list_subscriptions.return_value = ["Audit.General", "Audit.Exchange"]
+    connector.client.get_subscription_contents.side_effect = lambda content_type, **kwargs: async_generator(
+        [[{"contentUri": f"{content_type}/{index}"} for index in range(10)]]
+    )
+    connector.max_concurrent_fetches = 4
+    connector.limit_of_events_to_push = 5
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_content(content_uri):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return [{"uri": content_uri, "index": index} for index in range(2)]
+
+    connector.client.get_content.side_effect = get_content
+
+    result = [batch async for batch in connector.pull_content(datetime.now() - timedelta(minutes=10), datetime.now())]
+
+    assert max_in_flight == 4
+    assert all(len(batch) > 5 for batch in result[:-1])
+    events = [json.loads(event) for batch in result for event in batch]
+    assert sorted((event["uri"], event["index"]) for event in events) == sorted(
+        (f"{content_type}/{index}", event_index)
+        for content_type in ("Audit.General", "Audit.Exchange")
+        for index in range(10)
+        for event_index in range(2)
+    )
+
+
+@pytest.mark.asyncio
+async def test_forward_next_batches_checkpoint_per_time_range(connector, symphony_storage, event):
+    """Test that the checkpoint only advances to the end of the time ranges fully forwarded"""
+    checkpoint = Checkpoint(symphony_storage, connector.configuration.intake_key)
+    start = checkpoint.offset
+    connector.time_range_interval = 30
+
+    async def pull_content(start_date, end_date):
+        if start_date > start:
+            raise Exception("Failed to pull the content")
+
+        yield [event]
+
+    with (
+        patch.object(connector, "pull_content", side_effect=pull_content),
+        patch.object(connector, "send_events", new_callable=AsyncMock) as send_events,
+        patch("office365.management_api.connector.datetime") as mock_datetime,
+    ):
+        mock_datetime.now.return_value = start + timedelta(minutes=90)
+
+        with pytest.raises(Exception):
+            await connector.forward_next_batches(checkpoint)
+
+    send_events.assert_awaited_once_with([event])
+    assert checkpoint.offset == start + timedelta(minutes=30)
+
+
 @pytest.mark.asyncio
 async def test_forward_next_batches(connector, symphony_storage, event):
     checkpoint = Checkpoint(symphony_storage, connector.configuration.intake_key)
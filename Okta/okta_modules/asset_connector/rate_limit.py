@@ -0,0 +1,61 @@
+"""Rate limiting of the requests of the asset connectors.
+
+Okta returns, with each response, the number of requests remaining in the
+current window (X-Rate-Limit-Remaining) and the time of the reset of the
+window, as an epoch timestamp (X-Rate-Limit-Reset).
+"""
+
+import asyncio
+import time
+from typing import Any
+
+
+class OktaRateLimiter:
+    """Pause the requests when the Okta rate limit is nearly exhausted, until its reset.
+
+    The Okta SDK backs off each request rejected with a 429 status. Pausing
+    ahead of the limit avoids that all the concurrent requests get rejected.
+    """
+
+    def __init__(self, min_remaining: int = 1) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            min_remaining: Number of remaining requests below which the requests are paused.
+        """
+        self.min_remaining = min_remaining
+        self._resume_at = 0.0
+
+    @property
+    def resume_at(self) -> float:
+        """Get the time, as an epoch timestamp, until which the requests are paused.
+
+        Returns:
+            The epoch timestamp of the end of the pause.
+        """
+        return self._resume_at
+
+    async def wait(self) -> None:
+        """Wait until the end of the pause, if any."""
+        delay = self._resume_at - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, response: Any) -> None:
+        """Update the pause from the rate-limit headers of an Okta API response.
+
+        Args:
+            response: The OktaAPIResponse, if any.
+        """
+        if response is None:
+            return
+
+        try:
+            headers = response.get_headers()
+            remaining = int(headers["X-Rate-Limit-Remaining"])
+            reset = float(headers["X-Rate-Limit-Reset"])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return
+
+        if remaining < self.min_remaining:
+            self._resume_at = max(self._resume_at, reset)
@@ -5,6 +5,7 @@ and format them according to OCSF standards.
 """
 
 import asyncio
+from collections import deque
 from collections.abc import AsyncGenerator
 from functools import cached_property
 from typing import Any, Optional
@@ -29,6 +30,7 @@ from sekoia_automation.asset_connector.models.ocsf.user import (
 from sekoia_automation.storage import PersistentJSON
 
 from okta_modules import OktaModule
+from okta_modules.asset_connector.rate_limit import OktaRateLimiter
 
 
 class OktaUserAssetConnector(AsyncAssetConnector):
@@ -40,6 +42,15 @@ class OktaUserAssetConnector(AsyncAssetConnector):
 
     module: OktaModule
 
+    # Number of users mapped at the same time
+    MAX_CONCURRENT_USERS = 8
+
+    # Privileges of the groups, by group id, shared by the users of the run
+    _group_privileges: dict[str, asyncio.Task[list[str]]] | None = None
+
+    # Bound the privileges of the groups fetched at the same time, shared by the users of the run
+    _group_privileges_semaphore: asyncio.Semaphore | None = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize the Okta User Asset Connector.
 
@@ -94,6 +105,16 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         }
         return OktaClient(config)
 
+    @cached_property
+    def rate_limiter(self) -> OktaRateLimiter:
+        """Get the rate limiter shared by the concurrent requests.
+
+        Returns:
+            OktaRateLimiter instance.
+        """
+        # keep room for the requests of each user mapped at the same time
+        return OktaRateLimiter(min_remaining=self.MAX_CONCURRENT_USERS)
+
     async def get_group_privileges(self, group_id: str) -> list[str]:
         """Get privileges for a specific group.
 
@@ -102,7 +123,15 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         Returns:
             List of privilege names associated with the group.
         """
-        privileges, _, err = await self.client.list_group_assigned_roles(group_id)
+        if self._group_privileges_semaphore is None:
+            # the users may belong to many groups: keep their requests within the margin of the rate limiter
+            self._group_privileges_semaphore = asyncio.Semaphore(self.rate_limiter.min_remaining)
+
+        async with self._group_privileges_semaphore:
+            await self.rate_limiter.wait()
+            privileges, resp, err = await self.client.list_group_assigned_roles(group_id)
+            self.rate_limiter.update(resp)
+
         if err:
             self.log(f"Error while fetching privileges for group {group_id}: {err}", level="warning")
             return []
@@ -127,7 +156,9 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         Returns:
             List of Group objects associated with the user.
         """
+        await self.rate_limiter.wait()
         groups, resp, err = await self.client.list_user_groups(user_id)
+        self.rate_limiter.update(resp)
         if err:
             self.log(f"Error while fetching groups for user {user_id}: {err}", level="warning")
             return []
@@ -136,36 +167,55 @@ class OktaUserAssetConnector(AsyncAssetConnector):
             self.log(f"No groups found for user {user_id}", level="warning")
             return []
 
-        # Use list comprehension for better performance
-        group_list = [
+        okta_groups = list(groups)
+        while resp.has_next():
+            await self.rate_limiter.wait()
+            groups, resp, err = await resp.next()
+            self.rate_limiter.update(resp)
+            if err:
+                self.log(f"Error while fetching groups for user {user_id}: {err}", level="warning")
+                break
+
+            okta_groups.extend(groups)
+
+        privileges = await asyncio.gather(*[self.get_cached_group_privileges(group.id) for group in okta_groups])
+
+        return [
             Group(
                 name=group.profile.name,
                 uid=group.id,
                 desc=group.profile.description,
-                privileges=await self.get_group_privileges(group.id),
+                privileges=group_privileges,
             )
-            for group in groups
+            for group, group_privileges in zip(okta_groups, privileges)
         ]
 
-        while resp.has_next():
-            groups, resp, err = await resp.next()
-            if err:
-                self.log(f"Error while fetching groups for user {user_id}: {err}", level="warning")
-                return group_list
-
-            # Use extend with list comprehension for better performance
-            group_list.extend(
-                [
-                    Group(
-                        name=group.profile.name,
-                        uid=group.id,
-                        desc=group.profile.description,
-                    )
-                    for group in groups
-                ]
-            )
+    async def get_cached_group_privileges(self, group_id: str) -> list[str]:
+        """Get privileges for a specific group, fetched once per run.
 
-        return group_list
+        The users of a group, mapped at the same time, share the same pending request.
+
+        Args:
+            group_id: The unique identifier of the group.
+        Returns:
+            List of privilege names associated with the group.
+        """
+        if self._group_privileges is None:
+            self._group_privileges = {}
+
+        task = self._group_privileges.get(group_id)
+        if task is None:
+            task = asyncio.create_task(self.get_group_privileges(group_id))
+            self._group_privileges[group_id] = task
+
+        try:
+            # do not cancel the request shared with the other users if this one is cancelled
+            return await asyncio.shield(task)
+        except Exception:
+            # do not keep the failure for the other users of the group
+            if self._group_privileges.get(group_id) is task:
+                del self._group_privileges[group_id]
+            raise
 
     async def get_user_mfa(self, user_id: str) -> bool:
         """Check if a user has MFA enabled.
@@ -176,7 +226,9 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         Returns:
             True if the user has MFA factors configured, False otherwise.
         """
-        factors, _, err = await self.client.list_factors(user_id)
+        await self.rate_limiter.wait()
+        factors, resp, err = await self.client.list_factors(user_id)
+        self.rate_limiter.update(resp)
         if err:
             self.log(f"Error while fetching MFA status for user {user_id}: {err}", level="warning")
             return False
@@ -195,7 +247,9 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         Returns:
             List of role names associated with the user.
         """
-        roles, _, err = await self.client.list_assigned_roles_for_user(user_id)
+        await self.rate_limiter.wait()
+        roles, resp, err = await self.client.list_assigned_roles_for_user(user_id)
+        self.rate_limiter.update(resp)
         if err:
             self.log(f"Error while fetching roles for user {user_id}: {err}", level="warning")
             return []
@@ -351,10 +405,46 @@ class OktaUserAssetConnector(AsyncAssetConnector):
         self.log("Starting Okta user assets generator", level="info")
         self.log(f"Data path: {self._data_path.absolute()}", level="info")
 
-        async for user in self.next_list_users():
-            try:
-                yield await self.map_fields(user)
-            except Exception as e:
-                user_id = getattr(user, "id", "unknown")
-                self.log(f"Error while mapping user {user_id}: {e}", level="error")
-                continue
+        # the privileges of the groups are fetched once per run
+        self._group_privileges = {}
+        self._group_privileges_semaphore = None
+
+        # map several users at the same time, but yield them in order
+        pending: deque[tuple[OktaUser, asyncio.Task[UserOCSFModel]]] = deque()
+        try:
+            async for user in self.next_list_users():
+                pending.append((user, asyncio.create_task(self.map_fields(user))))
+
+                if len(pending) >= self.MAX_CONCURRENT_USERS:
+                    asset = await self._get_mapped_user(*pending.popleft())
+                    if asset is not None:
+                        yield asset
+
+            while pending:
+                asset = await self._get_mapped_user(*pending.popleft())
+                if asset is not None:
+                    yield asset
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+            await asyncio.gather(*[task for _, task in pending], return_exceptions=True)
+            self._group_privileges = None
+            self._group_privileges_semaphore = None
+
+    async def _get_mapped_user(self, user: OktaUser, task: asyncio.Task[UserOCSFModel]) -> UserOCSFModel | None:
+        """Wait for the mapping of a user.
+
+        Args:
+            user: OktaUser object being mapped.
+            task: The task mapping the user.
+
+        Returns:
+            UserOCSFModel instance, or None if the mapping failed.
+        """
+        try:
+            return await task
+        except Exception as e:
+            user_id = getattr(user, "id", "unknown")
+            self.log(f"Error while mapping user {user_id}: {e}", level="error")
+            return None
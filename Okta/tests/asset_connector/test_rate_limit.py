@@ -0,0 +1,51 @@
+"""Unit tests for OktaRateLimiter."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from okta_modules.asset_connector.rate_limit import OktaRateLimiter
+
+
+def make_response(remaining: str, reset: str) -> MagicMock:
+    response = MagicMock()
+    response.get_headers.return_value = {"X-Rate-Limit-Remaining": remaining, "X-Rate-Limit-Reset": reset}
+    return response
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_pauses_until_reset():
+    """Test the requests are paused until the reset when the remaining requests are below the threshold."""
+    rate_limiter = OktaRateLimiter(min_remaining=5)
+    reset = time.time() + 30
+
+    rate_limiter.update(make_response("100", str(reset)))
+    assert rate_limiter.resume_at == 0.0
+
+    rate_limiter.update(make_response("4", str(reset)))
+    assert rate_limiter.resume_at == reset
+
+    with patch("okta_modules.asset_connector.rate_limit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        await rate_limiter.wait()
+
+    assert 0 < mock_sleep.await_args.args[0] <= 30
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_without_headers():
+    """Test the responses without rate-limit headers are ignored."""
+    rate_limiter = OktaRateLimiter()
+
+    rate_limiter.update(None)
+    response = MagicMock()
+    response.get_headers.return_value = {}
+    rate_limiter.update(response)
+    rate_limiter.update(make_response("not a number", "0"))
+
+    assert rate_limiter.resume_at == 0.0
+
+    with patch("okta_modules.asset_connector.rate_limit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        await rate_limiter.wait()
+
+    mock_sleep.assert_not_awaited()
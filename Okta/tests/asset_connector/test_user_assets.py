@@ -1,5 +1,6 @@
 """Unit tests for OktaUserAssetConnector."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -150,6 +151,79 @@ class TestOktaUserAssetConnector:
         mock_okta_client.list_user_groups.assert_called_once_with("user123")
         mock_response.next.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_user_groups_shares_group_privileges(self, mock_connector, mock_okta_client, sample_groups_data):
+        """Test the privileges of a group are fetched once for all its users, even when mapped at the same time."""
+        # Setup
+        mock_connector.client = mock_okta_client
+        mock_response = MagicMock()
+        mock_response.has_next.return_value = False
+        mock_okta_client.list_user_groups.return_value = (sample_groups_data, mock_response, None)
+
+        async def get_group_privileges(group_id):
+            await asyncio.sleep(0.01)
+            return [f"privilege of {group_id}"]
+
+        mock_connector.get_group_privileges = AsyncMock(side_effect=get_group_privileges)
+
+        # Execute
+        results = await asyncio.gather(*[mock_connector.get_user_groups(f"user{index}") for index in range(5)])
+
+        # Verify
+        assert all(
+            [group.privileges for group in result] == [["privilege of group1"], ["privilege of group2"]]
+            for result in results
+        )
+        assert sorted(call.args[0] for call in mock_connector.get_group_privileges.await_args_list) == [
+            "group1",
+            "group2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_user_groups_bounds_group_privileges_requests(self, mock_connector, mock_okta_client):
+        """Test the privileges of many groups are not all requested at the same time."""
+        mock_connector.client = mock_okta_client
+        groups = []
+        for index in range(50):
+            group = MagicMock()
+            group.id = f"group{index}"
+            group.profile.name = f"Group {index}"
+            group.profile.description = None
+            groups.append(group)
+
+        mock_response = MagicMock()
+        mock_response.has_next.return_value = False
+        mock_okta_client.list_user_groups.return_value = (groups, mock_response, None)
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def list_group_assigned_roles(group_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return [], None, None
+
+        mock_okta_client.list_group_assigned_roles = AsyncMock(side_effect=list_group_assigned_roles)
+
+        result = await mock_connector.get_user_groups("user123")
+
+        assert len(result) == 50
+        assert mock_okta_client.list_group_assigned_roles.await_count == 50
+        assert max_in_flight == mock_connector.rate_limiter.min_remaining
+
+    @pytest.mark.asyncio
+    async def test_get_cached_group_privileges_failure_not_kept(self, mock_connector):
+        """Test a failure to fetch the privileges of a group is not kept for the other users."""
+        mock_connector.get_group_privileges = AsyncMock(side_effect=[Exception("Network error"), ["privilege1"]])
+
+        with pytest.raises(Exception):
+            await mock_connector.get_cached_group_privileges("group1")
+
+        assert await mock_connector.get_cached_group_privileges("group1") == ["privilege1"]
+
     @pytest.mark.asyncio
     async def test_get_user_groups_error(self, mock_connector, mock_okta_client):
         """Test user groups retrieval with error."""
@@ -635,3 +709,38 @@ class TestOktaUserAssetConnector:
         # Verify
         assert isinstance(result, UserOCSFModel)
         assert result.user.display_name is None  # Not set because it's not a string
+
+    @pytest.mark.asyncio
+    async def test_get_assets_maps_users_concurrently_in_order(self, mock_connector):
+        """Test the users are mapped concurrently, up to the limit, and yielded in order."""
+        users = []
+        for index in range(20):
+            user = MagicMock()
+            user.id = f"user{index}"
+            users.append(user)
+
+        async def mock_next_list_users():
+            for user in users:
+                yield user
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def map_fields(user):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # the first users are the slowest to map
+            await asyncio.sleep(0.001 * (20 - int(user.id[4:])))
+            in_flight -= 1
+            return user.id
+
+        mock_connector.next_list_users = mock_next_list_users
+        mock_connector.map_fields = map_fields
+
+        # Execute
+        assets = [asset async for asset in mock_connector.get_assets()]
+
+        # Verify
+        assert assets == [f"user{index}" for index in range(20)]
+        assert max_in_flight == mock_connector.MAX_CONCURRENT_USERS
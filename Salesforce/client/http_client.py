@@ -12,7 +12,7 @@ from aiolimiter import AsyncLimiter
 from loguru import logger
 from yarl import URL
 
-from utils.file_utils import save_response_to_temp_file
+from utils.file_utils import DOWNLOAD_CHUNK_SIZE, save_response_to_temp_file
 
 from .schemas.log_file import EventLogFile, SalesforceEventLogFilesResponse
 from .token_refresher import SalesforceTokenRefresher
@@ -312,7 +312,7 @@ class SalesforceHttpClient(object):
         self,
         log_file: EventLogFile,
         size_to_process: int = 1024 * 1024,
-        chunk_size: int = 1024,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
         temp_dir: str | None = None,
         persist_to_file: bool | None = None,
     ) -> Tuple[list[dict[str, Any]] | None, str | None]:
@@ -15,20 +15,24 @@ from sekoia_automation.connector import DefaultConnectorConfiguration
 from sekoia_automation.storage import PersistentJSON
 
 from client.http_client import LogType, SalesforceHttpClient
+from client.schemas.log_file import EventLogFile
 from client.token_refresher import RefreshTokenException
 from salesforce import SalesforceModule
 from salesforce.metrics import FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 from salesforce.timestepper import TimeStepper
-from utils.file_utils import csv_file_as_rows, delete_file
+from utils.file_utils import csv_file_as_ndjson_batches, delete_file
 
 
 class SalesforceConnectorConfig(DefaultConnectorConfiguration):
     """SalesforceConnector configuration."""
 
     frequency: int = 600
+    chunk_size: int = 1000
     initial_hours_ago: int = 6
     timedelta: int = 15
     fetch_daily_logs: bool = False
+    max_concurrent_log_files: int = 2
+    max_concurrent_pushes: int = 4
 
     @property
     def log_type(self) -> LogType | None:
@@ -204,8 +208,8 @@ class SalesforceConnector(AsyncConnector):
             end=end.isoformat(),
         )
 
-        result = []
-
+        semaphore = asyncio.Semaphore(self.configuration.max_concurrent_log_files)
+        forwarders = []
         for log_file in log_files.records:
             # Check if already processed
             if self.is_log_file_processed(log_file.Id):
@@ -215,6 +219,32 @@ class SalesforceConnector(AsyncConnector):
                 )
                 continue
 
+            forwarders.append(self.forward_log_file(log_file, semaphore))
+
+        # Wait for all the log files, so the ones fully forwarded are marked as processed even if another one fails
+        log_files_results = await asyncio.gather(*forwarders, return_exceptions=True)
+
+        result = []
+        for log_file_results in log_files_results:
+            if isinstance(log_file_results, BaseException):
+                raise log_file_results
+
+            result.extend(log_file_results)
+
+        return result
+
+    async def forward_log_file(self, log_file: EventLogFile, semaphore: asyncio.Semaphore) -> list[str]:
+        """
+        Forward the records of a log file, then mark it as processed.
+
+        Args:
+            log_file: EventLogFile
+            semaphore: asyncio.Semaphore - Limits the number of log files processed at the same time
+
+        Returns:
+            List of message IDs pushed to intake
+        """
+        async with semaphore:
             log_file_results = []
 
             records, csv_path = await self.salesforce_client.get_log_file_content(
@@ -226,12 +256,12 @@ class SalesforceConnector(AsyncConnector):
                     await self.push_data_to_intakes([orjson.dumps(event).decode("utf-8") for event in records])
                 )
 
-            # Process csv file row by row to avoid memory issues
+            # Process csv file by batches to avoid memory issues
             if csv_path is not None:
-                async for row in csv_file_as_rows(csv_path):
-                    log_file_results.extend(await self.push_data_to_intakes([orjson.dumps(row).decode("utf-8")]))
-
-                await delete_file(csv_path)
+                try:
+                    log_file_results.extend(await self.forward_csv_file(csv_path))
+                finally:
+                    await delete_file(csv_path)
 
             logger.info(
                 "Finished processing log file {log_file_id}. Total records: {count}",
@@ -239,9 +269,42 @@ class SalesforceConnector(AsyncConnector):
                 count=len(log_file_results),
             )
 
-            # Mark as processed
+            # Mark as processed, once fully forwarded
             self.mark_log_file_processed(log_file.Id)
-            result.extend(log_file_results)
+
+            return log_file_results
+
+    async def forward_csv_file(self, csv_path: str) -> list[str]:
+        """
+        Forward the rows of a csv file by batches.
+
+        A batch holds `max_concurrent_pushes` chunks of rows, pushed to the intake in a single call,
+        and the next batch is read while the current one is pushed.
+
+        Args:
+            csv_path: str
+
+        Returns:
+            List of message IDs pushed to intake
+        """
+        batch_size = self.configuration.chunk_size * self.configuration.max_concurrent_pushes
+
+        result: list[str] = []
+        push: asyncio.Task[list[str]] | None = None
+        try:
+            async for batch in csv_file_as_ndjson_batches(csv_path, batch_size):
+                if push is not None:
+                    result.extend(await push)
+
+                push = asyncio.create_task(self.push_data_to_intakes(batch))
+
+            if push is not None:
+                result.extend(await push)
+                push = None
+        finally:
+            if push is not None and not push.done():
+                push.cancel()
+                await asyncio.gather(push, return_exceptions=True)
 
         return result
 
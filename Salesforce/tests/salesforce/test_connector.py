@@ -3,7 +3,7 @@
 from datetime import datetime, timedelta, timezone
 from shutil import rmtree
 from tempfile import mkdtemp
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aioresponses import aioresponses
@@ -480,10 +480,9 @@ async def test_salesforce_connector_get_salesforce_events_1(
 
         result = await connector.get_salesforce_events(start_time, end_time)
 
-        expected_result = []
-        [expected_result.extend(pushed_events_ids) for _ in range(1, len(csv_content.splitlines()))]
-
-        assert result == expected_result
+        # The rows fit in a single batch
+        assert result == pushed_events_ids
+        connector.push_data_to_intakes.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -554,10 +553,9 @@ async def test_salesforce_connector_get_salesforce_events_2(
 
         result = await connector.get_salesforce_events(start_time, end_time)
 
-        expected_result = []
-        [expected_result.extend(pushed_events_ids) for _ in range(1, len(csv_content.splitlines()))]
-
-        assert result == expected_result
+        # The rows fit in a single batch
+        assert result == pushed_events_ids
+        connector.push_data_to_intakes.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -624,3 +622,71 @@ async def test_salesforce_connector_skips_processed_log_files(
 
         # Should return empty list since log file was skipped
         assert result == []
+
+
+@pytest.mark.asyncio
+async def test_salesforce_connector_forward_csv_file_by_batches(connector: SalesforceConnector, tmp_path):
+    """
+    Test the rows of a csv file are pushed by batches of `chunk_size * max_concurrent_pushes` rows.
+
+    Args:
+        connector: SalesforceConnector
+        tmp_path: Path
+    """
+    connector.configuration.chunk_size = 2
+    connector.configuration.max_concurrent_pushes = 2
+    connector.push_data_to_intakes = AsyncMock(side_effect=lambda events: [f"id-{event}" for event in events])
+
+    csv_path = tmp_path / "log_file.csv"
+    csv_path.write_text("ID,NAME\n" + "\n".join(f"{index},name {index}" for index in range(10)))
+
+    result = await connector.forward_csv_file(str(csv_path))
+
+    batches = [call.args[0] for call in connector.push_data_to_intakes.await_args_list]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[0][0] == '{"ID":"0","NAME":"name 0"}'
+    assert len(result) == 10
+
+
+@pytest.mark.asyncio
+async def test_salesforce_connector_marks_each_forwarded_log_file(connector: SalesforceConnector, session_faker):
+    """
+    Test the log files are processed concurrently, and each one is marked as processed once fully forwarded.
+
+    Args:
+        connector: SalesforceConnector
+        session_faker: Faker
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    log_files = [
+        EventLogFile(
+            Id=log_file_id,
+            EventType=session_faker.pystr(),
+            LogFile=session_faker.pystr(),
+            LogDate=now.isoformat(),
+            CreatedDate=now.isoformat(),
+            LogFileLength=10,
+        )
+        for log_file_id in ("file-ok-1", "file-failing", "file-ok-2")
+    ]
+
+    async def get_log_file_content(log_file):
+        if log_file.Id == "file-failing":
+            raise ValueError("Failed to download the log file")
+
+        return [{"ID": log_file.Id}], None
+
+    connector.push_data_to_intakes = AsyncMock(side_effect=lambda events: events)
+    client = MagicMock()
+    client.get_log_files = AsyncMock(
+        return_value=SalesforceEventLogFilesResponse(totalSize=3, done=True, records=log_files)
+    )
+    client.get_log_file_content = AsyncMock(side_effect=get_log_file_content)
+
+    with patch.object(SalesforceConnector, "salesforce_client", client):
+        with pytest.raises(ValueError):
+            await connector.get_salesforce_events(now - timedelta(hours=1), now)
+
+    assert connector.is_log_file_processed("file-ok-1")
+    assert connector.is_log_file_processed("file-ok-2")
+    assert not connector.is_log_file_processed("file-failing")
@@ -4,11 +4,12 @@ import csv
 import os
 
 import aiofiles
+import orjson
 import pytest
 from aiohttp import ClientSession
 from aioresponses import aioresponses
 
-from utils.file_utils import csv_file_as_rows, delete_file, save_response_to_temp_file
+from utils.file_utils import csv_file_as_ndjson_batches, delete_file, save_response_to_temp_file
 
 
 @pytest.fixture
@@ -46,9 +47,9 @@ async def test_delete_file(tmp_path, session_faker, random_text):
 
 
 @pytest.mark.asyncio
-async def test_csv_file_content(tmp_path, session_faker, csv_content):
+async def test_csv_file_as_ndjson_batches(tmp_path, session_faker, csv_content):
     """
-    Test read file content as csv.
+    Test read file content as batches of JSON records.
 
     Args:
         tmp_path: Path
@@ -59,15 +60,13 @@ async def test_csv_file_content(tmp_path, session_faker, csv_content):
     with open(file_path, "w+") as file:
         file.write(csv_content)
 
-    result = []
-    async for row in csv_file_as_rows(file_path):
-        result.append(row)
+    batches = []
+    async for batch in csv_file_as_ndjson_batches(file_path, batch_size=3):
+        batches.append(batch)
 
-    assert result == list(csv.DictReader(csv_content.splitlines(), delimiter=","))
-
-    await delete_file(file_path)
-
-    assert not os.path.exists(file_path)
+    rows = list(csv.DictReader(csv_content.splitlines(), delimiter=","))
+    assert all(len(batch) == 3 for batch in batches[:-1])
+    assert [orjson.loads(record) for batch in batches for record in batch] == rows
 
 
 @pytest.mark.asyncio
@@ -1,13 +1,17 @@
 """Contains all useful functions for working with files."""
 
-from typing import Any, AsyncGenerator, Dict
+import asyncio
+import csv
+from typing import AsyncGenerator, Iterator
 
-import aiocsv
 import aiofiles
+import orjson
 from aiofiles import os as aiofiles_os
 from aiohttp import ClientResponse
 from loguru import logger
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 async def delete_file(file_name: str) -> None:
     """
@@ -21,7 +25,9 @@ async def delete_file(file_name: str) -> None:
     await aiofiles_os.remove(file_name)
 
 
-async def save_response_to_temp_file(response: ClientResponse, chunk_size: int = 1024, temp_dir: str = "/tmp") -> str:
+async def save_response_to_temp_file(
+    response: ClientResponse, chunk_size: int = DOWNLOAD_CHUNK_SIZE, temp_dir: str = "/tmp"
+) -> str:
     """
     Save response to temp file.
 
@@ -46,22 +52,52 @@ async def save_response_to_temp_file(response: ClientResponse, chunk_size: int =
         return file_name
 
 
-async def csv_file_as_rows(
-    file_path: str, encoding: str = "utf-8", delimiter: str = ","
-) -> AsyncGenerator[Dict[str, Any], None]:
+def _iter_csv_as_ndjson_batches(file_path: str, batch_size: int, encoding: str, delimiter: str) -> Iterator[list[str]]:
+    """
+    Iterate over the rows of the csv file, serialized to JSON, by batches.
+
+    Args:
+        file_path: str
+        batch_size: int
+        encoding: str
+        delimiter: str
+
+    Yields:
+        list[str]:
+    """
+    with open(file_path, encoding=encoding, newline="") as file:
+        batch: list[str] = []
+        for row in csv.DictReader(file, delimiter=delimiter):
+            batch.append(orjson.dumps(row).decode("utf-8"))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+
+async def csv_file_as_ndjson_batches(
+    file_path: str, batch_size: int, encoding: str = "utf-8", delimiter: str = ","
+) -> AsyncGenerator[list[str], None]:
     """
-    Read csv file as rows.
+    Read csv file as batches of JSON records, so only one batch is kept in memory.
 
-    Each row is a dict with keys from the header row.
+    Each record is a row serialized as a JSON object with keys from the header row.
+    The batches are read in a worker thread to not block the event loop.
 
     Args:
         file_path: str
+        batch_size: int
         encoding: str
         delimiter: str
 
     Yields:
-        dict[str, Any]:
+        list[str]:
     """
-    async with aiofiles.open(file_path, encoding=encoding) as file:
-        async for row in aiocsv.AsyncDictReader(file, delimiter=delimiter):
-            yield row
+    batches = _iter_csv_as_ndjson_batches(file_path, batch_size, encoding, delimiter)
+    try:
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            yield batch
+    finally:
+        batches.close()
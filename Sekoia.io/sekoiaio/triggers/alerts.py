@@ -1,4 +1,3 @@
-import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from posixpath import join as urljoin
@@ -14,6 +13,7 @@ from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_excep
 from sekoiaio.utils import user_agent
 
 from .base import _SEKOIANotificationBaseTrigger
+from .helpers.search_jobs import SearchJobResults, SearchJobScheduler
 from .helpers.state_manager import AlertStateManager
 from .metrics import EVENTS_FORWARDED, EVENTS_FILTERED, THRESHOLD_CHECKS, STATE_SIZE
 
@@ -413,6 +413,9 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
     # Check every 5 minutes to balance responsiveness vs resource usage
     TIME_THRESHOLD_CHECK_INTERVAL_SECONDS = 300
 
+    # Time (in seconds) allowed, after the timeout of a search job, to collect its results
+    SEARCH_JOB_RESULTS_MARGIN_SECONDS = 120
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.state_manager: Optional[AlertStateManager] = None
@@ -421,6 +424,7 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
         self._validated_config: Optional[AlertEventsThresholdConfiguration] = None
         self._http_session: Optional[requests.Session] = None
         self._events_api_path: Optional[str] = None
+        self._search_jobs: Optional[SearchJobScheduler] = None
         self._alert_locks: dict[str, Lock] = {}
         self._locks_lock = Lock()  # Lock to protect access to _alert_locks dictionary
         self._max_locks = 1024  # Maximum number of locks to keep in memory
@@ -717,6 +721,9 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
                     }
                 )
 
+                # Shared scheduler polling the search jobs of all the alerts
+                self._search_jobs = SearchJobScheduler(self._http_session, self._events_api_path, logger=self.log)
+
                 self._initialized = True
 
                 # Start periodic time threshold check thread if enabled
@@ -745,6 +752,11 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
         # Stop the time threshold thread
         self._stop_time_threshold_thread()
 
+        # Stop polling the search jobs
+        if self._search_jobs is not None:
+            self._search_jobs.stop()
+            self._search_jobs = None
+
         # Close HTTP session
         if self._http_session is not None:
             self._http_session.close()
@@ -809,11 +821,16 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
         # Use a lock to prevent concurrent processing of the same alert
         alert_lock = self._get_alert_lock(alert_uuid)
         with alert_lock:
-            self._handle_event_locked(alert_uuid, event_type, message, event_count_from_notification)
+            triggered = self._handle_event_locked(alert_uuid, event_type, message, event_count_from_notification)
+
+        # The state is already updated: fetch the events and forward the alert without holding the lock
+        if triggered is not None:
+            alert, context, previous_state = triggered
+            self._forward_threshold_event(alert, event_type, context, previous_state)
 
     def _handle_event_locked(
         self, alert_uuid: str, event_type: str, message: dict, event_count_from_notification: Optional[int] = None
-    ):
+    ) -> Optional[tuple[dict[str, Any], dict[str, Any], Optional[dict[str, Any]]]]:
         """
         Handle alert update with lock acquired.
         This method contains the actual logic that was previously in handle_event.
@@ -823,6 +840,9 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             event_type: Type of the event (e.g., "alert")
             message: Full notification message
             event_count_from_notification: Total event count from Kafka notification (similar field)
+
+        Returns:
+            The alert, the threshold context and the previous state if the playbook must be triggered, None otherwise
         """
         self.log(message="Processing alert event", level="debug", alert_uuid=alert_uuid)
 
@@ -858,11 +878,9 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
         # state from other concurrent notifications. Without this reload, we could read stale
         # data from the in-memory cache and trigger multiple times for the same alert.
         #
-        # Performance note: This reload adds S3 latency on every notification. This is an
-        # intentional trade-off: correctness (no duplicate triggers) over performance.
-        # In practice, alert notifications are relatively infrequent compared to event
-        # ingestion, and the S3 read latency (~50-100ms) is acceptable. For high-throughput
-        # scenarios, consider implementing a distributed lock or cache TTL mechanism.
+        # Performance note: The reload only lists the state journal and reads the segments
+        # written since the last load, the whole state file is read only after a compaction
+        # by another process.
         try:
             if self.state_manager is None:
                 self.log(message="State manager not initialized", level="error", alert_uuid=alert_uuid)
@@ -971,6 +989,26 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             self.log_exception(exp, message="Failed to cleanup old states, continuing")
             # Continue despite cleanup failure
 
+        return alert, context, previous_state
+
+    def _forward_threshold_event(
+        self,
+        alert: dict[str, Any],
+        event_type: str,
+        context: dict[str, Any],
+        previous_state: Optional[dict[str, Any]],
+    ):
+        """
+        Fetch the events of an alert, if configured, and send the threshold event to the playbook.
+
+        Args:
+            alert: Alert data dictionary
+            event_type: Type of the event
+            context: Threshold evaluation context
+            previous_state: Previous state for this alert
+        """
+        alert_uuid = alert.get("uuid")
+
         # Fetch events if configured
         events = None
         config = self.validated_config
@@ -1580,154 +1618,34 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             self.log_exception(e, message="Failed to trigger event search job", alert_short_id=alert_short_id)
             return None
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        stop=stop_after_attempt(10),
-        retry=retry_if_exception_type(requests.exceptions.Timeout)
-        | retry_if_exception_type(urllib3.exceptions.TimeoutError),
-    )
-    def _wait_for_search_job(self, job_uuid: str, timeout: int = 300) -> bool:
-        """
-        Wait for a search job to complete.
-
-        Args:
-            job_uuid: UUID of the search job
-            timeout: Maximum time to wait in seconds
-
-        Returns:
-            True if job completed successfully, False otherwise
-        """
-        if self._http_session is None:
-            self.log(message="HTTP session not initialized", level="error")
-            return False
-
-        start_time = time.time()
-
-        self.log(message=f"Waiting for search job {job_uuid} to complete", level="debug", job_uuid=job_uuid)
-
-        try:
-            # Wait for job to start (status != 0)
-            while True:
-                response = self._http_session.get(
-                    f"{self._events_api_path}/search/jobs/{job_uuid}",
-                    timeout=20,
-                )
-                response.raise_for_status()
-                status = response.json()["status"]
-
-                if status != 0:
-                    break
-
-                if time.time() - start_time > timeout:
-                    self.log(
-                        message=f"Search job {job_uuid} timed out waiting to start", level="error", job_uuid=job_uuid
-                    )
-                    return False
-
-                time.sleep(1)
-
-            # Wait for job to complete (status != 1)
-            while True:
-                response = self._http_session.get(
-                    f"{self._events_api_path}/search/jobs/{job_uuid}",
-                    timeout=20,
-                )
-                response.raise_for_status()
-                status = response.json()["status"]
-
-                if status != 1:
-                    break
-
-                if time.time() - start_time > timeout:
-                    self.log(
-                        message=f"Search job {job_uuid} timed out waiting to complete",
-                        level="error",
-                        job_uuid=job_uuid,
-                    )
-                    return False
-
-                time.sleep(1)
-
-            self.log(message=f"Search job {job_uuid} completed", level="debug", job_uuid=job_uuid)
-            return True
-
-        except Exception as e:
-            self.log_exception(e, message=f"Failed to wait for search job {job_uuid}", job_uuid=job_uuid)
-            return False
-
-    @retry(
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        stop=stop_after_attempt(10),
-        retry=retry_if_exception_type(requests.exceptions.Timeout)
-        | retry_if_exception_type(urllib3.exceptions.TimeoutError),
-    )
-    def _get_search_job_results(self, job_uuid: str, limit: int) -> Optional[list[dict[str, Any]]]:
+    def _wait_for_search_job_results(
+        self, job_uuid: str, page_size: int, all_pages: bool = True
+    ) -> Optional[SearchJobResults]:
         """
-        Retrieve results from a completed search job.
+        Wait for the shared scheduler to collect the results of a search job.
 
         Args:
             job_uuid: UUID of the search job
-            limit: Maximum number of results to retrieve per page
+            page_size: Number of events per page of results
+            all_pages: If False, only the first page of results is fetched
 
         Returns:
-            List of events, or None if failed
+            The results, or None if the job failed or timed out
         """
-        if self._http_session is None:
-            self.log(message="HTTP session not initialized", level="error")
+        if self._search_jobs is None:
+            self.log(message="Search job scheduler not initialized", level="error")
             return None
 
-        self.log(
-            message=f"Retrieving results for search job {job_uuid}",
-            level="debug",
-            job_uuid=job_uuid,
-            limit=limit,
-        )
-
-        results: list[dict[str, Any]] = []
-        offset = 0
-        total = None
-        page_size = limit
-
+        self.log(message=f"Waiting for search job {job_uuid} to complete", level="debug", job_uuid=job_uuid)
+        future = self._search_jobs.submit(job_uuid, page_size=page_size, all_pages=all_pages)
         try:
-            while total is None or offset < total:
-                response = self._http_session.get(
-                    f"{self._events_api_path}/search/jobs/{job_uuid}/events",
-                    params={"limit": page_size, "offset": offset},
-                    timeout=20,
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                items = data.get("items", [])
-
-                if not items:
-                    num_results = len(results)
-                    if num_results < data.get("total", 0):
-                        self.log(
-                            "Number of fetched results doesn't match total",
-                            level="warning",
-                            num_results=num_results,
-                            total=data.get("total", 0),
-                            job_uuid=job_uuid,
-                        )
-                    break
-
-                results.extend(items)
-                if total is None:
-                    total = data.get("total", 0)
-                offset += page_size
-
+            return future.result(timeout=self._search_jobs.timeout + self.SEARCH_JOB_RESULTS_MARGIN_SECONDS)
+        except TimeoutError:
             self.log(
-                message=f"Retrieved {len(results)} events from search job",
-                level="debug",
+                message=f"Timed out waiting for the results of search job {job_uuid}",
+                level="error",
                 job_uuid=job_uuid,
-                total_events=len(results),
             )
-
-            return results
-
-        except Exception as e:
-            self.log_exception(e, message=f"Failed to get search job results", job_uuid=job_uuid)
             return None
 
     def _fetch_alert_events(
@@ -1798,19 +1716,16 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             self.log(message="Failed to trigger search job", level="error", alert_uuid=alert_uuid)
             return None
 
-        # Step 2: Wait for the job to complete
-        if not self._wait_for_search_job(job_uuid):
-            self.log(message="Search job did not complete", level="error", alert_uuid=alert_uuid, job_uuid=job_uuid)
-            return None
-
-        # Step 3: Get the results (use 100 as page size like in get_events.py)
-        events = self._get_search_job_results(job_uuid, 100)
-        if events is None:
+        # Step 2: Wait for the scheduler to collect the results (use 100 as page size like in get_events.py)
+        results = self._wait_for_search_job_results(job_uuid, page_size=100)
+        if results is None:
             self.log(
                 message="Failed to get search job results", level="error", alert_uuid=alert_uuid, job_uuid=job_uuid
             )
             return None
 
+        events = results.events
+
         self.log(
             message=f"Fetched {len(events)} events for alert {alert_short_id}",
             level="info",
@@ -1863,8 +1778,9 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             self.log(message="Failed to trigger search job for event counting", level="error", alert_uuid=alert_uuid)
             return None
 
-        # Step 2: Wait for the job to complete
-        if not self._wait_for_search_job(job_uuid):
+        # Step 2: Wait for the job to complete and get only the first page to extract the total count
+        results = self._wait_for_search_job_results(job_uuid, page_size=1, all_pages=False)
+        if results is None:
             self.log(
                 message="Search job did not complete for event counting",
                 level="error",
@@ -1873,34 +1789,14 @@ class AlertEventsThresholdTrigger(SecurityAlertsTrigger):
             )
             return None
 
-        # Step 3: Get only the first page to extract the total count
-        try:
-            if self._http_session is None:
-                self.log(message="HTTP session not initialized", level="error")
-                return None
-
-            response = self._http_session.get(
-                f"{self._events_api_path}/search/jobs/{job_uuid}/events",
-                params={"limit": 1, "offset": 0},  # Only fetch 1 item to get the total
-                timeout=20,
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            event_count = data.get("total", 0)
-
-            self.log(
-                message=f"Successfully got total event count",
-                level="debug",
-                alert_uuid=alert_uuid,
-                event_count=event_count,
-            )
-
-            return event_count
+        self.log(
+            message=f"Successfully got total event count",
+            level="debug",
+            alert_uuid=alert_uuid,
+            event_count=results.total,
+        )
 
-        except Exception as e:
-            self.log_exception(e, message=f"Failed to get event count from search job", alert_uuid=alert_uuid)
-            return None
+        return results.total
 
     def _cleanup_old_states(self):
         """
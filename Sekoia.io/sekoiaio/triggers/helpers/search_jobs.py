@@ -0,0 +1,309 @@
+# search_jobs.py
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Optional
+
+import requests
+import urllib3
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from ..metrics import SEARCH_JOB_DURATION, SEARCH_JOBS_PENDING
+
+
+@dataclass
+class SearchJobResults:
+    """Events of a completed search job."""
+
+    events: list[dict[str, Any]]
+    total: int
+
+
+@dataclass
+class _SearchJob:
+    uuid: str
+    page_size: int
+    all_pages: bool
+    future: Future
+    submitted_at: float
+    next_poll_at: float
+    poll_interval: float
+    started: bool = field(default=False)
+
+
+class SearchJobScheduler:
+    """
+    Track the outstanding search jobs of the events API and collect their results.
+
+    A single thread polls all the outstanding jobs, each one with an interval growing
+    from `min_poll_interval` to `max_poll_interval` while the job is running.
+    Once a job is completed, the pages of its results are fetched concurrently.
+
+    Each submitted job gets a Future resolved with the results, or with None if the job failed
+    or timed out, and an optional callback called on completion.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        events_api_path: str,
+        logger: Optional[Callable] = None,
+        page_workers: int = 4,
+        min_poll_interval: float = 0.5,
+        max_poll_interval: float = 5.0,
+        timeout: float = 300,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            session: HTTP session authenticated against the events API
+            events_api_path: URL of the events API
+            logger: Optional logger callable (SDK-style)
+            page_workers: Number of result pages fetched at the same time
+            min_poll_interval: Initial interval, in seconds, between two polls of a job
+            max_poll_interval: Maximum interval, in seconds, between two polls of a job
+            timeout: Maximum time, in seconds, to wait for a job to complete
+        """
+        self.session = session
+        self.events_api_path = events_api_path
+        self.logger = logger
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+        self._jobs: dict[str, _SearchJob] = {}
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._stop_event = Event()
+        self._poller: Optional[Thread] = None
+        # results are collected in their own pool, so they never wait for their own pages
+        self._results_executor = ThreadPoolExecutor(max_workers=page_workers, thread_name_prefix="SearchJobResults")
+        self._pages_executor = ThreadPoolExecutor(max_workers=page_workers, thread_name_prefix="SearchJobPages")
+
+    def _log(self, message: str, level: str = "info", **kwargs):
+        """Helper to log using the injected logger (SDK-style)."""
+        if self.logger and callable(self.logger):
+            try:
+                self.logger(message=message, level=level, **kwargs)
+            except Exception:
+                pass
+
+    @property
+    def pending_jobs(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def submit(
+        self,
+        job_uuid: str,
+        page_size: int = 100,
+        all_pages: bool = True,
+        on_complete: Optional[Callable[[Optional[SearchJobResults]], None]] = None,
+    ) -> Future:
+        """
+        Track a search job until its results are collected.
+
+        Args:
+            job_uuid: UUID of the search job
+            page_size: Number of events per page of results
+            all_pages: If False, only the first page of results is fetched
+            on_complete: Optional callback called with the results (None if the job failed)
+
+        Returns:
+            Future resolved with the results, or with None if the job failed
+        """
+        future: Future = Future()
+        if on_complete is not None:
+            future.add_done_callback(lambda done: self._run_callback(on_complete, done, job_uuid))
+
+        now = time.monotonic()
+        job = _SearchJob(
+            uuid=job_uuid,
+            page_size=page_size,
+            all_pages=all_pages,
+            future=future,
+            submitted_at=now,
+            next_poll_at=now,
+            poll_interval=self.min_poll_interval,
+        )
+
+        with self._lock:
+            self._jobs[job_uuid] = job
+            SEARCH_JOBS_PENDING.set(len(self._jobs))
+            if self._poller is None or not self._poller.is_alive():
+                self._stop_event.clear()
+                self._poller = Thread(target=self._poll_loop, name="SearchJobPoller", daemon=True)
+                self._poller.start()
+
+        self._wakeup.set()
+        return future
+
+    def stop(self):
+        """Stop polling and fail the outstanding jobs."""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._poller is not None:
+            self._poller.join(timeout=10)
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+            SEARCH_JOBS_PENDING.set(0)
+
+        for job in jobs:
+            self._complete(job, None)
+
+        self._results_executor.shutdown(wait=False, cancel_futures=True)
+        self._pages_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_callback(self, on_complete: Callable, future: Future, job_uuid: str):
+        try:
+            on_complete(future.result())
+        except Exception as exp:
+            self._log(
+                f"Completion callback of search job {job_uuid} failed",
+                level="error",
+                job_uuid=job_uuid,
+                error=str(exp),
+                error_type=type(exp).__name__,
+            )
+
+    def _complete(self, job: _SearchJob, results: Optional[SearchJobResults]):
+        SEARCH_JOB_DURATION.labels(status="completed" if results is not None else "failed").observe(
+            time.monotonic() - job.submitted_at
+        )
+        if not job.future.done():
+            job.future.set_result(results)
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            now = time.monotonic()
+
+            with self._lock:
+                due_jobs = [job for job in self._jobs.values() if job.next_poll_at <= now]
+
+            for job in due_jobs:
+                if self._stop_event.is_set():
+                    break
+                self._poll(job)
+
+            with self._lock:
+                SEARCH_JOBS_PENDING.set(len(self._jobs))
+                next_poll_at = min((job.next_poll_at for job in self._jobs.values()), default=None)
+
+            # sleep until the next poll, or a new job
+            delay = self.max_poll_interval if next_poll_at is None else max(next_poll_at - time.monotonic(), 0)
+            self._wakeup.wait(timeout=delay)
+
+    def _forget(self, job: _SearchJob):
+        with self._lock:
+            self._jobs.pop(job.uuid, None)
+
+    def _poll(self, job: _SearchJob):
+        """Check the status of a job, then collect its results or schedule the next poll."""
+        try:
+            response = self.session.get(f"{self.events_api_path}/search/jobs/{job.uuid}", timeout=20)
+            response.raise_for_status()
+            status = response.json()["status"]
+        except (requests.exceptions.Timeout, urllib3.exceptions.TimeoutError):
+            # transient: poll again later
+            status = None
+        except Exception as exp:
+            self._log(
+                f"Failed to wait for search job {job.uuid}",
+                level="error",
+                job_uuid=job.uuid,
+                error=str(exp),
+                error_type=type(exp).__name__,
+            )
+            self._forget(job)
+            self._complete(job, None)
+            return
+
+        # Status 0: not started, status 1: in progress
+        if status is not None and status not in (0, 1):
+            self._log(f"Search job {job.uuid} completed", level="debug", job_uuid=job.uuid)
+            self._forget(job)
+            try:
+                self._results_executor.submit(self._collect_results, job)
+            except RuntimeError:
+                # the scheduler is stopped
+                self._complete(job, None)
+            return
+
+        now = time.monotonic()
+        if now - job.submitted_at > self.timeout:
+            self._log(
+                f"Search job {job.uuid} timed out waiting to {'complete' if job.started else 'start'}",
+                level="error",
+                job_uuid=job.uuid,
+            )
+            self._forget(job)
+            self._complete(job, None)
+            return
+
+        job.started = job.started or status == 1
+        job.next_poll_at = now + job.poll_interval
+        job.poll_interval = min(job.poll_interval * 2, self.max_poll_interval)
+
+    @retry(
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(10),
+        retry=retry_if_exception_type(requests.exceptions.Timeout)
+        | retry_if_exception_type(urllib3.exceptions.TimeoutError),
+    )
+    def _get_page(self, job_uuid: str, page_size: int, offset: int) -> dict[str, Any]:
+        response = self.session.get(
+            f"{self.events_api_path}/search/jobs/{job_uuid}/events",
+            params={"limit": page_size, "offset": offset},
+            timeout=20,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _collect_results(self, job: _SearchJob):
+        """Fetch the first page of results, then the other pages concurrently."""
+        try:
+            first_page = self._get_page(job.uuid, job.page_size, 0)
+            total = first_page.get("total", 0)
+            events: list[dict[str, Any]] = list(first_page.get("items", []))
+
+            if job.all_pages and events:
+                offsets = range(job.page_size, total, job.page_size)
+                pages = self._pages_executor.map(
+                    lambda offset: self._get_page(job.uuid, job.page_size, offset), offsets
+                )
+                for page in pages:
+                    items = page.get("items", [])
+                    if not items:
+                        break
+                    events.extend(items)
+
+            if job.all_pages and len(events) < total:
+                self._log(
+                    "Number of fetched results doesn't match total",
+                    level="warning",
+                    num_results=len(events),
+                    total=total,
+                    job_uuid=job.uuid,
+                )
+
+            self._log(
+                f"Retrieved {len(events)} events from search job",
+                level="debug",
+                job_uuid=job.uuid,
+                total_events=len(events),
+            )
+            self._complete(job, SearchJobResults(events=events, total=total))
+        except Exception as exp:
+            self._log(
+                "Failed to get search job results",
+                level="error",
+                job_uuid=job.uuid,
+                error=str(exp),
+                error_type=type(exp).__name__,
+            )
+            self._complete(job, None)
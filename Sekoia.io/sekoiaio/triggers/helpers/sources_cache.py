@@ -0,0 +1,118 @@
+# sources_cache.py
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class SourcesCache(MutableMapping):
+    """
+    Size-bounded LRU cache of the resolved sources, with a time to live, persisted in a JSON file.
+
+    File structure:
+    {
+        "sources": [
+            [source_id, {"name": str, "confidence": int}, expires_at (POSIX timestamp)],
+            ...  # from the least to the most recently used
+        ]
+    }
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        maxsize: int = 10000,
+        ttl: float = 86400,
+        logger: Optional[Callable] = None,
+    ):
+        """
+        Initialize the cache from its file, if any.
+
+        Args:
+            file_path: Path to the JSON file (can be S3Path or PosixPath)
+            maxsize: Maximum number of sources kept in the cache
+            ttl: Time to live of the sources, in seconds
+            logger: Optional logger callable
+        """
+        self.file_path = file_path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.logger = logger
+        self._sources: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._load()
+
+    def _log(self, message: str, level: str = "info", **kwargs):
+        if self.logger and callable(self.logger):
+            try:
+                self.logger(message=message, level=level, **kwargs)
+            except Exception:
+                pass
+
+    def _load(self):
+        try:
+            with self.file_path.open("r") as f:
+                content = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            self._log(
+                "Failed to load the sources cache, starting with an empty cache", level="warning", error=str(exc)
+            )
+            return
+
+        now = time.time()
+        for source_id, value, expires_at in content.get("sources", []):
+            if expires_at > now:
+                self._sources[source_id] = (value, expires_at)
+
+        while len(self._sources) > self.maxsize:
+            self._sources.popitem(last=False)
+
+    def save(self):
+        """Persist the unexpired sources."""
+        now = time.time()
+        sources = [
+            [source_id, value, expires_at]
+            for source_id, (value, expires_at) in self._sources.items()
+            if expires_at > now
+        ]
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.file_path.open("w") as f:
+                json.dump({"sources": sources}, f, separators=(",", ":"))
+        except Exception as exc:
+            self._log("Failed to save the sources cache", level="warning", error=str(exc))
+
+    def __getitem__(self, source_id: str) -> Any:
+        value, expires_at = self._sources[source_id]
+        if expires_at <= time.time():
+            del self._sources[source_id]
+            raise KeyError(source_id)
+
+        self._sources.move_to_end(source_id)
+        return value
+
+    def __setitem__(self, source_id: str, value: Any):
+        self._sources[source_id] = (value, time.time() + self.ttl)
+        self._sources.move_to_end(source_id)
+        while len(self._sources) > self.maxsize:
+            self._sources.popitem(last=False)
+
+    def __delitem__(self, source_id: str):
+        del self._sources[source_id]
+
+    def __contains__(self, source_id: object) -> bool:
+        try:
+            self[source_id]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        now = time.time()
+        return iter([source_id for source_id, (_, expires_at) in self._sources.items() if expires_at > now])
+
+    def __len__(self) -> int:
+        return len(self._sources)
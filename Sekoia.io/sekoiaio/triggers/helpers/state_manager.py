@@ -1,10 +1,149 @@
 # state_manager.py
+import heapq
 import json
+import time
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional, Callable
 
 
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert an ISO 8601 timestamp to a POSIX timestamp.
+
+    Args:
+        value: ISO 8601 timestamp (naive timestamps are considered as UTC)
+
+    Returns:
+        The POSIX timestamp or None if the value is not a valid timestamp
+    """
+    try:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+class AlertIndex(dict):
+    """
+    Alert states indexed by alert UUID.
+
+    Alongside the states, the index maintains a min-heap of the alerts with pending events
+    (current_event_count > last_triggered_event_count), ordered by their reference time
+    (last trigger, or creation, or last event). The alerts whose time window has elapsed
+    are then found without scanning and parsing every tracked alert.
+
+    The heap is updated when a state is set or removed: a state modified in place must be set again.
+    """
+
+    def __init__(self, *args, on_invalid_timestamp: Optional[Callable[[str, Any], None]] = None, **kwargs):
+        super().__init__()
+        self._on_invalid_timestamp = on_invalid_timestamp
+        self._heap: list[tuple[float, str]] = []
+        self._reference_times: dict[str, float] = {}
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _reference_time_str(state: dict[str, Any]) -> Optional[str]:
+        """Return the reference time of an alert with pending events, if any."""
+        if not state.get("last_event_at"):
+            return None
+
+        pending_events = state.get("current_event_count", 0) - state.get("last_triggered_event_count", 0)
+        if pending_events <= 0:
+            return None
+
+        if state.get("last_triggered_at") is not None:
+            return state["last_triggered_at"]
+        if state.get("created_at") is not None:
+            return state["created_at"]
+        return state["last_event_at"]
+
+    def _index(self, alert_uuid: str, state: dict[str, Any]):
+        self._reference_times.pop(alert_uuid, None)
+
+        reference_time_str = self._reference_time_str(state) if isinstance(state, dict) else None
+        if reference_time_str is None:
+            return
+
+        reference_time = parse_timestamp(reference_time_str)
+        if reference_time is None:
+            if self._on_invalid_timestamp is not None:
+                self._on_invalid_timestamp(alert_uuid, reference_time_str)
+            return
+
+        self._reference_times[alert_uuid] = reference_time
+        heapq.heappush(self._heap, (reference_time, alert_uuid))
+
+        # drop the outdated entries when they outnumber the live ones
+        if len(self._heap) > 2 * len(self._reference_times) + 64:
+            self._heap = [(timestamp, key) for key, timestamp in self._reference_times.items()]
+            heapq.heapify(self._heap)
+
+    def __setitem__(self, alert_uuid: str, state: dict[str, Any]):
+        super().__setitem__(alert_uuid, state)
+        self._index(alert_uuid, state)
+
+    def __delitem__(self, alert_uuid: str):
+        super().__delitem__(alert_uuid)
+        self._reference_times.pop(alert_uuid, None)
+
+    def pop(self, alert_uuid: str, *default: Any) -> Any:
+        self._reference_times.pop(alert_uuid, None)
+        return super().pop(alert_uuid, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        alert_uuid, state = super().popitem()
+        self._reference_times.pop(alert_uuid, None)
+        return alert_uuid, state
+
+    def setdefault(self, alert_uuid: str, default: Any = None) -> Any:
+        if alert_uuid not in self:
+            self[alert_uuid] = default
+        return self[alert_uuid]
+
+    def update(self, *args: Any, **kwargs: Any):
+        for alert_uuid, state in dict(*args, **kwargs).items():
+            self[alert_uuid] = state
+
+    def clear(self):
+        super().clear()
+        self._heap.clear()
+        self._reference_times.clear()
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+    def pending_since(self, until: float) -> list[str]:
+        """
+        Get the alerts with pending events whose reference time is not after the given timestamp.
+
+        Args:
+            until: POSIX timestamp
+
+        Returns:
+            The UUIDs of the alerts, from the oldest reference time to the most recent one
+        """
+        due: list[tuple[float, str]] = []
+        while self._heap and self._heap[0][0] <= until:
+            reference_time, alert_uuid = heapq.heappop(self._heap)
+            # skip outdated entries and duplicates
+            if self._reference_times.get(alert_uuid) == reference_time and (
+                not due or due[-1] != (reference_time, alert_uuid)
+            ):
+                due.append((reference_time, alert_uuid))
+
+        # the alerts stay pending until their state changes
+        for entry in due:
+            heapq.heappush(self._heap, entry)
+
+        return [alert_uuid for _, alert_uuid in due]
+
+
 class AlertStateManager:
     """
     Manages persistent state for alert event thresholds.
@@ -34,21 +173,40 @@ class AlertStateManager:
             "last_cleanup": str (ISO 8601),
         }
     }
+
+    Persistence:
+    - The state file is a snapshot of the state
+    - Each change is written as a small segment in a journal directory next to the state file,
+      instead of rewriting the whole state file (S3 objects cannot be appended to)
+    - The journal is compacted into the snapshot once it holds `compaction_threshold` segments,
+      and on cleanup
+    - The snapshot records the last compacted segment, so segments left behind by an
+      interrupted compaction are not applied twice
     """
 
     VERSION = "1.1"
 
-    def __init__(self, state_file_path: Path, logger: Optional[Callable] = None):
+    # Number of journal segments triggering the compaction of the journal into the snapshot
+    COMPACTION_THRESHOLD = 500
+
+    def __init__(
+        self, state_file_path: Path, logger: Optional[Callable] = None, compaction_threshold: Optional[int] = None
+    ):
         """
         Initialize state manager.
 
         Args:
             state_file_path: Path to the state JSON file (can be S3Path or PosixPath)
             logger: Optional logger callable (can be a function or logger object)
+            compaction_threshold: Number of journal segments triggering a compaction
         """
         # Keep the original path object (S3Path, PosixPath, etc.) to preserve S3 functionality
         self.state_file_path = state_file_path
+        self.journal_path = state_file_path.parent / f"{state_file_path.stem}.journal"
         self.logger = logger
+        self.compaction_threshold = compaction_threshold or self.COMPACTION_THRESHOLD
+        # journal segments applied to the in-memory state since the snapshot
+        self._journal_segments: list[str] = []
         self._state: dict[str, Any] = self._load_state()
 
     def _log(self, message: str, level: str = "info", **kwargs):
@@ -60,6 +218,28 @@ class AlertStateManager:
                 # Silently fail if logging doesn't work
                 pass
 
+    def _empty_state(self) -> dict[str, Any]:
+        return {
+            "alerts": {},
+            "metadata": {
+                "version": self.VERSION,
+                "last_cleanup": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+
+    def _log_invalid_timestamp(self, alert_uuid: str, reference_time: Any):
+        self._log(
+            f"Invalid reference timestamp for alert {alert_uuid}",
+            level="warning",
+            alert_uuid=alert_uuid,
+            reference_time=reference_time,
+        )
+
+    def _index_state(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Index the alerts of a loaded state."""
+        state["alerts"] = AlertIndex(state.get("alerts") or {}, on_invalid_timestamp=self._log_invalid_timestamp)
+        return state
+
     def _load_state_from_s3(self) -> dict[str, Any]:
         """Load JSON from S3 using Path.open() for SDK compatibility."""
         try:
@@ -74,13 +254,7 @@ class AlertStateManager:
                 error=str(exc),
                 file_path=str(self.state_file_path),
             )
-            return {
-                "alerts": {},
-                "metadata": {
-                    "version": self.VERSION,
-                    "last_cleanup": datetime.now(timezone.utc).isoformat(),
-                },
-            }
+            return self._empty_state()
         except (FileNotFoundError, IOError, OSError) as exc:
             # Handle both standard file errors and S3-specific errors (404, etc.)
             self._log(
@@ -89,13 +263,7 @@ class AlertStateManager:
                 error=str(exc),
                 error_type=type(exc).__name__,
             )
-            return {
-                "alerts": {},
-                "metadata": {
-                    "version": self.VERSION,
-                    "last_cleanup": datetime.now(timezone.utc).isoformat(),
-                },
-            }
+            return self._empty_state()
 
         # Ensure structure + version
         if state.get("metadata", {}).get("version") != self.VERSION:
@@ -125,9 +293,16 @@ class AlertStateManager:
             # This pattern is used in all other automation modules
             self.state_file_path.parent.mkdir(parents=True, exist_ok=True)
 
+            # Record the last journal segment included in this snapshot
+            self._state["metadata"]["journal_position"] = (
+                self._journal_segments[-1]
+                if self._journal_segments
+                else self._state["metadata"].get("journal_position")
+            )
+
             # Use Path.open() for SDK-managed S3 paths
             with self.state_file_path.open("w", encoding="utf-8") as f:
-                json.dump(self._state, f, indent=2)
+                json.dump(self._state, f, separators=(",", ":"))
             self._log("State saved successfully to S3", level="debug")
         except Exception as e:
             self._log(
@@ -139,11 +314,46 @@ class AlertStateManager:
             )
             raise
 
+    def _list_journal_segments(self) -> list[str]:
+        """List the names of the journal segments, from the oldest to the most recent."""
+        try:
+            return sorted(path.name for path in self.journal_path.iterdir() if path.name.endswith(".json"))
+        except (FileNotFoundError, IOError, OSError):
+            return []
+
+    def _apply_journal_segments(self, state: dict[str, Any], segments: list[str]):
+        """Apply journal segments to the state."""
+        for segment in segments:
+            try:
+                with (self.journal_path / segment).open("r") as f:
+                    changes = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError, IOError, OSError) as exc:
+                self._log(
+                    "Failed to read journal segment, skipping it",
+                    level="error",
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                    segment=segment,
+                )
+                continue
+
+            for alert_uuid, alert_state in changes.get("alerts", {}).items():
+                if alert_state is None:
+                    state["alerts"].pop(alert_uuid, None)
+                else:
+                    state["alerts"][alert_uuid] = alert_state
+
     def _load_state(self) -> dict[str, Any]:
-        """Load state from S3."""
+        """Load state from S3: the snapshot, then the journal segments written after it."""
         self._log("Loading state from S3", level="debug", file_path=str(self.state_file_path))
         try:
-            return self._load_state_from_s3()
+            state = self._index_state(self._load_state_from_s3())
+
+            position = state["metadata"].get("journal_position") or ""
+            segments = [segment for segment in self._list_journal_segments() if segment > position]
+            self._apply_journal_segments(state, segments)
+            self._journal_segments = segments
+            return state
         except Exception as exc:
             self._log(
                 "Failed to load state from S3, starting with fresh state",
@@ -152,13 +362,56 @@ class AlertStateManager:
                 error_type=type(exc).__name__,
                 file_path=str(self.state_file_path),
             )
-            return {
-                "alerts": {},
-                "metadata": {
-                    "version": self.VERSION,
-                    "last_cleanup": datetime.now(timezone.utc).isoformat(),
-                },
-            }
+            self._journal_segments = []
+            return self._index_state(self._empty_state())
+
+    def _write_journal_segment(self, changes: dict[str, Optional[dict[str, Any]]]):
+        """
+        Persist changes of alert states as a new journal segment.
+
+        Args:
+            changes: New states by alert UUID (None for removed alerts)
+        """
+        segment = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+        try:
+            self.journal_path.mkdir(parents=True, exist_ok=True)
+            with (self.journal_path / segment).open("w", encoding="utf-8") as f:
+                json.dump({"alerts": changes}, f, separators=(",", ":"))
+        except Exception as e:
+            self._log(
+                "Failed to write state journal to S3",
+                level="error",
+                error=str(e),
+                error_type=type(e).__name__,
+                file_path=str(self.journal_path),
+            )
+            raise
+
+        self._journal_segments.append(segment)
+        if len(self._journal_segments) >= self.compaction_threshold:
+            self.compact()
+
+    def compact(self):
+        """
+        Write the whole state as the new snapshot and remove the journal segments it includes.
+        """
+        segments = list(self._journal_segments)
+        self._save_state()
+        self._journal_segments = []
+
+        for segment in segments:
+            try:
+                (self.journal_path / segment).unlink()
+            except (FileNotFoundError, IOError, OSError) as exc:
+                # already included in the snapshot: it will be skipped when loading
+                self._log(
+                    "Failed to remove compacted journal segment",
+                    level="warning",
+                    error=str(exc),
+                    segment=segment,
+                )
+
+        self._log("State journal compacted", level="debug", segments=len(segments))
 
     def _save_state(self):
         """Save state to S3."""
@@ -273,9 +526,6 @@ class AlertStateManager:
         )
         now = datetime.now(timezone.utc).isoformat()
 
-        # Reload state from S3 to get latest version (use _load_state for consistent error handling)
-        self._state = self._load_state()
-
         existing = self._state["alerts"].get(alert_uuid)
 
         if existing:
@@ -292,6 +542,8 @@ class AlertStateManager:
                     "version": current_version + 1,
                 }
             )
+            # set the state again to update the index
+            self._state["alerts"][alert_uuid] = existing
             self._log(
                 f"Updated existing state for alert {alert_short_id}",
                 level="debug",
@@ -314,8 +566,8 @@ class AlertStateManager:
             }
             self._log(f"Created new state for alert {alert_short_id}", level="debug", alert_uuid=alert_uuid)
 
-        # Save back to S3
-        self._save_state_to_s3()
+        # Journal the change to S3
+        self._write_journal_segment({alert_uuid: self._state["alerts"][alert_uuid]})
 
     def cleanup_old_states(self, cutoff_date: datetime) -> int:
         """
@@ -359,8 +611,12 @@ class AlertStateManager:
 
             if to_remove:
                 self._state["metadata"]["last_cleanup"] = datetime.now(timezone.utc).isoformat()
-                # save back to S3
-                self._save_state_to_s3()
+
+            if to_remove or self._journal_segments:
+                # save back to S3, including the journal
+                self.compact()
+
+            if to_remove:
                 self._log(
                     f"Cleanup completed: removed {len(to_remove)} old states",
                     level="info",
@@ -403,10 +659,8 @@ class AlertStateManager:
         Update cached alert info and current event count (without triggering).
         Used to store alert data from notifications to avoid API calls.
 
-        Note: This method reloads state from S3 on each call to ensure consistency.
-        While this adds latency per notification, it ensures we don't lose updates
-        from other processes. For high-volume scenarios, consider implementing
-        a write-through cache or batching updates.
+        Note: Only the state of this alert is written to S3, as a journal segment.
+        Call `reload_state()` beforehand to get the changes made by other processes.
 
         Args:
             alert_uuid: UUID of the alert
@@ -415,10 +669,6 @@ class AlertStateManager:
         """
         now = datetime.now(timezone.utc).isoformat()
 
-        # Reload state from S3 to get latest version before updating
-        # This ensures consistency when multiple processes may be updating
-        self._state = self._load_state()
-
         existing = self._state["alerts"].get(alert_uuid)
 
         if existing:
@@ -430,6 +680,8 @@ class AlertStateManager:
                     "updated_at": now,
                 }
             )
+            # set the state again to update the index
+            self._state["alerts"][alert_uuid] = existing
             self._log(
                 f"Updated alert info cache for {alert_uuid}",
                 level="debug",
@@ -460,8 +712,8 @@ class AlertStateManager:
                 event_count=event_count,
             )
 
-        # Save back to S3
-        self._save_state_to_s3()
+        # Journal the change to S3
+        self._write_journal_segment({alert_uuid: self._state["alerts"][alert_uuid]})
 
     def get_alert_info(self, alert_uuid: str) -> Optional[dict[str, Any]]:
         """
@@ -499,75 +751,18 @@ class AlertStateManager:
         Returns:
             List of alert states that need time threshold triggering
         """
-        from datetime import timedelta
-
-        now = datetime.now(timezone.utc)
+        now = time.time()
+        alert_uuids = self._state["alerts"].pending_since(now - time_window_hours * 3600)
 
         pending_alerts = []
-        for alert_uuid, state in self._state["alerts"].items():
-            last_event_at_str = state.get("last_event_at")
-            last_triggered_at_str = state.get("last_triggered_at")
-            created_at_str = state.get("created_at")
-            current_count = state.get("current_event_count", 0)
-            last_triggered_count = state.get("last_triggered_event_count", 0)
-
-            # Skip if no events received yet
-            if not last_event_at_str:
-                continue
-
-            # Check if there are pending events (current > last triggered)
-            pending_events = current_count - last_triggered_count
-            if pending_events <= 0:
-                continue
-
-            # Determine the reference time for the time window check:
-            # - If previously triggered: use last_triggered_at
-            # - If never triggered: use created_at (first time we saw this alert)
-            if last_triggered_at_str is not None:
-                reference_time_str = last_triggered_at_str
-            elif created_at_str is not None:
-                reference_time_str = created_at_str
-            else:
-                # Fallback to last_event_at if no other timestamp available
-                reference_time_str = last_event_at_str
-
-            # Parse reference timestamp
-            try:
-                reference_time = datetime.fromisoformat(reference_time_str.replace("Z", "+00:00"))
-                if reference_time.tzinfo is None:
-                    reference_time = reference_time.replace(tzinfo=timezone.utc)
-            except (ValueError, AttributeError):
-                self._log(
-                    f"Invalid reference timestamp for alert {alert_uuid}",
-                    level="warning",
-                    alert_uuid=alert_uuid,
-                    reference_time=reference_time_str,
-                )
-                continue
-
-            # Check if time_window_hours has elapsed since reference time
-            time_since_reference = now - reference_time
-            required_duration = timedelta(hours=time_window_hours)
-
-            if time_since_reference < required_duration:
-                # Not enough time has passed yet
-                self._log(
-                    f"Alert {state.get('alert_short_id')} not ready yet (time remaining: {required_duration - time_since_reference})",
-                    level="debug",
-                    alert_uuid=alert_uuid,
-                    pending_events=pending_events,
-                    time_since_reference_hours=time_since_reference.total_seconds() / 3600,
-                    required_hours=time_window_hours,
-                )
-                continue
-
+        for alert_uuid in alert_uuids:
+            state = self._state["alerts"][alert_uuid]
             pending_alerts.append(state)
             self._log(
                 f"Alert {state.get('alert_short_id')} ready for time threshold trigger",
                 level="debug",
                 alert_uuid=alert_uuid,
-                pending_events=pending_events,
-                time_since_reference_hours=time_since_reference.total_seconds() / 3600,
+                pending_events=state.get("current_event_count", 0) - state.get("last_triggered_event_count", 0),
                 required_hours=time_window_hours,
             )
 
@@ -589,6 +784,9 @@ class AlertStateManager:
         This is useful when you need to get the latest state from storage,
         for example in periodic background tasks.
 
+        Only the journal segments written since the last load are read. The whole state
+        is loaded again if the journal was compacted by another process.
+
         Concurrency model:
         - This class uses a single-writer model: one trigger instance owns the state
         - In-memory state may become stale immediately after reload if another process
@@ -597,5 +795,21 @@ class AlertStateManager:
         - The current implementation is designed for single-instance deployments where
           one trigger process handles all notifications for a given configuration
         """
-        self._state = self._load_state()
-        self._log("State reloaded from storage", level="debug")
+        segments = self._list_journal_segments()
+        known_segments = set(self._journal_segments)
+
+        if not known_segments.issubset(segments):
+            # the journal was compacted elsewhere: load the new snapshot
+            self._state = self._load_state()
+            self._log("State reloaded from storage", level="debug")
+            return
+
+        position = (
+            self._journal_segments[-1]
+            if self._journal_segments
+            else self._state["metadata"].get("journal_position") or ""
+        )
+        new_segments = [segment for segment in segments if segment > position and segment not in known_segments]
+        self._apply_journal_segments(self._state, new_segments)
+        self._journal_segments.extend(new_segments)
+        self._log("State reloaded from storage", level="debug", new_segments=len(new_segments))
@@ -1,10 +1,15 @@
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
 from posixpath import join as urljoin
 
 import requests
 from sekoia_automation.storage import PersistentJSON, write
 from sekoia_automation.trigger import Trigger
 
+from .helpers.sources_cache import SourcesCache
+
 
 class FeedConsumptionTrigger(Trigger):
     """
@@ -13,6 +18,12 @@ class FeedConsumptionTrigger(Trigger):
 
     API_URL_ADDITIONAL_PARAMETERS = ["skip_expired=true"]
     FILE_NAME = "stix_objects.json"
+    SOURCES_CACHE_FILE_NAME = "sources_cache.json"
+    SOURCES_CACHE_SIZE = 10000
+    SOURCES_CACHE_TTL = 86400  # Time to live of the resolved sources in seconds
+    # Maximum number of objects requested at once, to keep the URL short
+    FETCH_OBJECTS_CHUNK_SIZE = 100
+    FETCH_OBJECTS_WORKERS = 4
     frequency: int = 300  # Frequency in seconds, previous value 3600
     _STOP_EVENT_WAIT = 120
 
@@ -22,7 +33,22 @@ class FeedConsumptionTrigger(Trigger):
         self.next_cursor = None
         self.resume_on_errors = False
         self.first_run = True
-        self.sources_caches = {}
+        # the next page of the feed, fetched while the current batch is sent
+        self._prefetched_page: tuple[str | None, Future] | None = None
+
+    @cached_property
+    def sources_caches(self) -> SourcesCache:
+        return SourcesCache(
+            self.data_path / Path(self.SOURCES_CACHE_FILE_NAME),
+            maxsize=self.SOURCES_CACHE_SIZE,
+            ttl=self.SOURCES_CACHE_TTL,
+            logger=self.log,
+        )
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        # one more worker than needed to fetch the objects, for the prefetch of the next page
+        return ThreadPoolExecutor(max_workers=self.FETCH_OBJECTS_WORKERS + 1)
 
     @property
     def feed_id(self) -> str:
@@ -42,6 +68,12 @@ class FeedConsumptionTrigger(Trigger):
 
     @property
     def url(self):
+        with self.context as cache:
+            cursor = cache.get("cursors", {}).get(self.feed_id)
+
+        return self.url_from_cursor(cursor)
+
+    def url_from_cursor(self, cursor: str | None) -> str:
         url = (
             urljoin(
                 self.module.configuration["base_url"],
@@ -54,14 +86,12 @@ class FeedConsumptionTrigger(Trigger):
         if len(self.API_URL_ADDITIONAL_PARAMETERS) > 0:
             url += "&" + "&".join(self.API_URL_ADDITIONAL_PARAMETERS)
 
-        with self.context as cache:
-            cursor = cache.get("cursors", {}).get(self.feed_id)
-            if cursor:
-                return f"{url}&cursor={cursor}"
-            elif self.modified_after:
-                return f"{url}&modified_after={self.modified_after}"
-            else:
-                return url
+        if cursor:
+            return f"{url}&cursor={cursor}"
+        elif self.modified_after:
+            return f"{url}&modified_after={self.modified_after}"
+        else:
+            return url
 
     def _handle_response_error(self, response: requests.Response):
         if not response.ok:
@@ -79,10 +109,14 @@ class FeedConsumptionTrigger(Trigger):
                 self._stop_event.wait(self._STOP_EVENT_WAIT)
                 response.raise_for_status()
 
-    def fetch_feed_objects(self):
-        # Request the next batch of objects from the API
+    def fetch_feed_page(self, url: str) -> tuple[list, str | None]:
+        """
+        Fetch a page of the feed
+
+        :return: The objects of the page and the cursor of the next page
+        """
         api_key = self.module.configuration["api_key"]
-        response = requests.get(self.url, headers={"Authorization": f"Bearer {api_key}"})
+        response = requests.get(url, headers={"Authorization": f"Bearer {api_key}"})
 
         # manage the response
         self._handle_response_error(response)
@@ -90,10 +124,27 @@ class FeedConsumptionTrigger(Trigger):
         # get objects from the response
         data = response.json()
 
-        # Get cursor for next API call
-        self.next_cursor = data.get("next_cursor", None)
+        return data.get("items", []), data.get("next_cursor", None)
 
-        return data.get("items", [])
+    def fetch_feed_objects(self):
+        # Request the next batch of objects from the API
+        url = self.url
+
+        # Use the page prefetched for the current cursor, if any
+        prefetched_page, self._prefetched_page = self._prefetched_page, None
+        if prefetched_page is not None and self.url_from_cursor(prefetched_page[0]) == url:
+            objects, self.next_cursor = prefetched_page[1].result()
+        else:
+            objects, self.next_cursor = self.fetch_feed_page(url)
+
+        return objects
+
+    def prefetch_next_page(self):
+        """
+        Fetch the page following the current batch in the background
+        """
+        cursor = self.next_cursor
+        self._prefetched_page = (cursor, self._executor.submit(self.fetch_feed_page, self.url_from_cursor(cursor)))
 
     def fetch_objects(self, objects_id: list[str]) -> list[dict]:
         """
@@ -120,6 +171,20 @@ class FeedConsumptionTrigger(Trigger):
 
         return data.get("items", [])
 
+    def fetch_objects_by_chunks(self, objects_id: list[str]) -> list[dict]:
+        """
+        Fetch objects from the Sekoia.io feed API, with concurrent requests on chunks of identifiers
+        """
+        chunks = [
+            objects_id[index : index + self.FETCH_OBJECTS_CHUNK_SIZE]
+            for index in range(0, len(objects_id), self.FETCH_OBJECTS_CHUNK_SIZE)
+        ]
+        if len(chunks) <= 1:
+            return self.fetch_objects(objects_id) if objects_id else []
+
+        futures = [self._executor.submit(self.fetch_objects, chunk) for chunk in chunks]
+        return [item for future in futures for item in future.result()]
+
     def resolve_sources(self, objects: list[dict]) -> list[dict]:
         """
         Resolve source references in the objects by fetching them from the Sekoia.io API.
@@ -139,7 +204,7 @@ class FeedConsumptionTrigger(Trigger):
         sources_to_fetch = sorted(list(set(sources_to_fetch)))
 
         # Adding sources to the cache
-        sources = self.fetch_objects(sources_to_fetch)
+        sources = self.fetch_objects_by_chunks(sources_to_fetch)
         for source in sources:
             self.sources_caches[source["id"]] = {
                 "name": source["name"],
@@ -152,6 +217,9 @@ class FeedConsumptionTrigger(Trigger):
                 self.sources_caches.get(ref, ref) for ref in object["x_inthreat_sources_refs"]
             ]
 
+        if sources:
+            self.sources_caches.save()
+
         return objects
 
     def next_batch(self):
@@ -173,6 +241,10 @@ class FeedConsumptionTrigger(Trigger):
             level="debug",
         )
 
+        # Fetch the next page while the current batch is sent
+        if len(objects) >= self.batch_size_limit and self.next_cursor:
+            self.prefetch_next_page()
+
         if len(objects) > 0:
             self.log(
                 message=f"Fetched {len(objects)} objects from the feed",
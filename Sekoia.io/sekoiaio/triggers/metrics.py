@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Gauge
+from prometheus_client import Counter, Gauge, Histogram
 
 # New metrics for threshold trigger
 THRESHOLD_CHECKS = Counter(
@@ -23,3 +23,15 @@ STATE_SIZE = Gauge(
     "sekoiaio_alert_threshold_state_size",
     "Number of alerts tracked in state",
 )
+
+SEARCH_JOBS_PENDING = Gauge(
+    "sekoiaio_alert_threshold_search_jobs_pending",
+    "Number of event search jobs waiting for completion",
+)
+
+SEARCH_JOB_DURATION = Histogram(
+    "sekoiaio_alert_threshold_search_job_duration_seconds",
+    "Time from the submission of an event search job to the collection of its results",
+    ["status"],  # Fixed labels: completed, failed
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -1166,113 +1167,32 @@ class TestAlertEventsThresholdTrigger_EventFetching:
         assert result is None
         assert threshold_trigger.log_exception.called
 
-    def test_wait_for_search_job_success(self, threshold_trigger, requests_mock):
-        """Test waiting for search job completion."""
+    def test_get_total_event_count_uses_first_page(self, threshold_trigger, sample_threshold_alert, requests_mock):
+        """Test that the event count only fetches the first page of results."""
         threshold_trigger._ensure_initialized()
 
         job_uuid = "job-uuid-12345"
-
-        # First call: status 0 (not started)
-        # Second call: status 1 (in progress)
-        # Third call: status 2 (completed)
-        requests_mock.get(
-            f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}",
-            [
-                {"json": {"status": 0}},
-                {"json": {"status": 1}},
-                {"json": {"status": 2}},
-            ],
-        )
-
-        result = threshold_trigger._wait_for_search_job(job_uuid, timeout=10)
-
-        assert result is True
-
-    def test_wait_for_search_job_timeout(self, threshold_trigger, requests_mock):
-        """Test search job timeout."""
-        threshold_trigger._ensure_initialized()
-
-        job_uuid = "job-uuid-12345"
-
-        # Always return status 0 (not started)
-        requests_mock.get(
-            f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}",
-            json={"status": 0},
-        )
-
-        with patch("time.time", side_effect=[0, 1, 2, 400]):  # Simulate timeout
-            result = threshold_trigger._wait_for_search_job(job_uuid, timeout=10)
-
-        assert result is False
-
-    def test_get_search_job_results_success(self, threshold_trigger, sample_events, requests_mock):
-        """Test retrieving search job results."""
-        threshold_trigger._ensure_initialized()
-
-        job_uuid = "job-uuid-12345"
-
-        # Single page results (limit=100 gets all 3 events in one page)
+        requests_mock.post("http://fake.url/api/v1/sic/conf/events/search/jobs", json={"uuid": job_uuid})
+        requests_mock.get(f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}", json={"status": 2})
         requests_mock.get(
             f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}/events",
-            json={"items": sample_events, "total": 3},
+            json={"items": [{"uuid": "event-0"}], "total": 250},
         )
 
-        results = threshold_trigger._get_search_job_results(job_uuid, limit=100)
+        assert threshold_trigger._get_total_event_count(sample_threshold_alert) == 250
+        assert requests_mock.request_history[-1].qs == {"limit": ["1"], "offset": ["0"]}
 
-        assert results is not None
-        assert len(results) == 3
-
-    def test_get_search_job_results_empty(self, threshold_trigger, requests_mock):
-        """Test retrieving empty search job results."""
+    def test_wait_for_search_job_results_timeout(self, threshold_trigger):
+        """Test the wait for the results of a search job is bounded."""
         threshold_trigger._ensure_initialized()
+        threshold_trigger.SEARCH_JOB_RESULTS_MARGIN_SECONDS = 0.01
+        threshold_trigger._search_jobs.timeout = 0
 
-        job_uuid = "job-uuid-12345"
-
-        requests_mock.get(
-            f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}/events",
-            json={"items": [], "total": 0},
-        )
-
-        results = threshold_trigger._get_search_job_results(job_uuid, limit=100)
-
-        assert results is not None
-        assert len(results) == 0
-
-    def test_get_search_job_results_pagination(self, threshold_trigger, requests_mock):
-        """Test retrieving search job results with multiple pages."""
-        threshold_trigger._ensure_initialized()
-
-        job_uuid = "job-uuid-12345"
-
-        # Create 250 events to test multi-page retrieval with page_size=100
-        page1_events = [{"uuid": f"event-{i}", "data": f"page1-{i}"} for i in range(100)]
-        page2_events = [{"uuid": f"event-{i}", "data": f"page2-{i}"} for i in range(100, 200)]
-        page3_events = [{"uuid": f"event-{i}", "data": f"page3-{i}"} for i in range(200, 250)]
-
-        # Mock paginated responses
-        requests_mock.get(
-            f"http://fake.url/api/v1/sic/conf/events/search/jobs/{job_uuid}/events",
-            [
-                {"json": {"items": page1_events, "total": 250}},
-                {"json": {"items": page2_events, "total": 250}},
-                {"json": {"items": page3_events, "total": 250}},
-            ],
-        )
+        # the job never completes
+        with patch.object(threshold_trigger._search_jobs, "submit", return_value=Future()):
+            assert threshold_trigger._wait_for_search_job_results("job-uuid-12345", page_size=100) is None
 
-        results = threshold_trigger._get_search_job_results(job_uuid, limit=100)
-
-        assert results is not None
-        assert len(results) == 250
-        assert results[0]["uuid"] == "event-0"
-        assert results[99]["uuid"] == "event-99"
-        assert results[100]["uuid"] == "event-100"
-        assert results[249]["uuid"] == "event-249"
-
-        # Verify pagination was done correctly
-        assert requests_mock.call_count == 3
-        assert requests_mock.request_history[0].qs == {"limit": ["100"], "offset": ["0"]}
-        assert requests_mock.request_history[1].qs == {"limit": ["100"], "offset": ["100"]}
-        assert requests_mock.request_history[2].qs == {"limit": ["100"], "offset": ["200"]}
+        assert any("Timed out" in call.kwargs.get("message", "") for call in threshold_trigger.log.call_args_list)
 
     def test_fetch_alert_events_all_events(
         self, threshold_trigger, sample_threshold_alert, sample_events, requests_mock
@@ -2401,6 +2321,87 @@ class TestAlertStateManager_NewMethods:
         assert len(pending) == 0
 
 
+class TestAlertStateManager_Journal:
+    """Test the journal persistence and the index of pending alerts."""
+
+    def test_updates_are_journaled_without_rewriting_state_file(self, state_manager, state_file_path):
+        """Test that updates write journal segments instead of the whole state file."""
+        state_manager.update_alert_info(alert_uuid="alert-1", alert_info={"short_id": "AL1"}, event_count=3)
+        state_manager.update_alert_state(
+            alert_uuid="alert-1", alert_short_id="AL1", rule_uuid="rule", rule_name="Rule", event_count=3
+        )
+
+        assert not state_file_path.exists()
+        assert len(list(state_manager.journal_path.iterdir())) == 2
+
+    def test_journal_compaction(self, state_file_path, mock_logger):
+        """Test that the journal is compacted into the state file once the threshold is reached."""
+        manager = AlertStateManager(state_file_path, logger=mock_logger, compaction_threshold=3)
+
+        for index in range(3):
+            manager.update_alert_info(alert_uuid=f"alert-{index}", alert_info={}, event_count=index)
+
+        assert list(manager.journal_path.iterdir()) == []
+        snapshot = json.loads(state_file_path.read_text())
+        assert set(snapshot["alerts"]) == {"alert-0", "alert-1", "alert-2"}
+
+        # a new manager loads the snapshot and the journal written after it
+        manager.update_alert_info(alert_uuid="alert-3", alert_info={}, event_count=3)
+        other_manager = AlertStateManager(state_file_path, logger=mock_logger)
+        assert set(other_manager.get_all_alerts()) == {"alert-0", "alert-1", "alert-2", "alert-3"}
+
+    def test_compacted_segments_are_not_applied_twice(self, state_file_path, mock_logger):
+        """Test that segments left behind by an interrupted compaction are skipped."""
+        manager = AlertStateManager(state_file_path, logger=mock_logger)
+        manager.update_alert_info(alert_uuid="alert-1", alert_info={}, event_count=1)
+
+        with patch.object(Path, "unlink", side_effect=OSError("unavailable")):
+            manager.compact()
+
+        # the alert is removed from the snapshot, the old segment must not restore it
+        del manager._state["alerts"]["alert-1"]
+        manager._save_state()
+
+        assert AlertStateManager(state_file_path, logger=mock_logger).get_alert_state("alert-1") is None
+
+    def test_reload_state_reads_new_segments(self, state_file_path, mock_logger):
+        """Test that reloading applies the segments written by another manager."""
+        manager = AlertStateManager(state_file_path, logger=mock_logger)
+        manager.update_alert_info(alert_uuid="alert-1", alert_info={}, event_count=1)
+
+        other_manager = AlertStateManager(state_file_path, logger=mock_logger)
+        other_manager.update_alert_info(alert_uuid="alert-2", alert_info={}, event_count=2)
+
+        with patch.object(manager, "_load_state", wraps=manager._load_state) as load_state:
+            manager.reload_state()
+            load_state.assert_not_called()
+
+        assert manager.get_alert_state("alert-2")["current_event_count"] == 2
+
+        # the journal is compacted by the other manager: the state is fully loaded
+        other_manager.compact()
+        manager.reload_state()
+        assert set(manager.get_all_alerts()) == {"alert-1", "alert-2"}
+
+    def test_pending_alerts_follow_state_changes(self, state_manager):
+        """Test that the index of pending alerts is updated with the states."""
+        state_manager.update_alert_info(alert_uuid="alert-1", alert_info={"short_id": "AL1"}, event_count=10)
+
+        # pretend the alert was seen for the first time 2 hours ago
+        state = state_manager.get_alert_state("alert-1")
+        state["created_at"] = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+        state_manager._state["alerts"]["alert-1"] = state
+
+        assert [alert["alert_uuid"] for alert in state_manager.get_alerts_pending_time_check(1)] == ["alert-1"]
+        # alerts stay pending until they are triggered
+        assert [alert["alert_uuid"] for alert in state_manager.get_alerts_pending_time_check(1)] == ["alert-1"]
+
+        state_manager.update_alert_state(
+            alert_uuid="alert-1", alert_short_id="AL1", rule_uuid="rule", rule_name="Rule", event_count=10
+        )
+        assert state_manager.get_alerts_pending_time_check(1) == []
+
+
 class TestAlertEventsThresholdTrigger_ConfigValidation:
     """Test configuration validation edge cases."""
 
@@ -6,6 +6,7 @@ import pytest
 import requests_mock
 from requests import Response
 
+from sekoiaio.triggers.helpers.sources_cache import SourcesCache
 from sekoiaio.triggers.intelligence import (
     FeedConsumptionTrigger,
     FeedIOCConsumptionTrigger,
@@ -153,6 +154,87 @@ def test_resolve_sources(trigger):
         }
 
 
+def test_resolve_sources_by_chunks(trigger):
+    trigger.FETCH_OBJECTS_CHUNK_SIZE = 2
+    sources = [object_factory(index) for index in range(5)]
+    objects = [object_factory(10, sources=[source["id"] for source in sources])]
+
+    def fetch_objects(objects_id):
+        assert len(objects_id) <= 2
+        return [source for source in sources if source["id"] in objects_id]
+
+    with patch.object(trigger, "fetch_objects", side_effect=fetch_objects) as mock_fetch_objects:
+        trigger.resolve_sources(objects)
+
+    assert mock_fetch_objects.call_count == 3
+    assert objects[0]["x_inthreat_sources"] == [
+        {"name": source["name"], "confidence": source["confidence"]} for source in sources
+    ]
+
+
+def test_resolve_sources_cache_is_persisted(trigger, data_storage):
+    sources = [object_factory(1), object_factory(2)]
+    objects = [object_factory(10, sources=[source["id"] for source in sources])]
+
+    with patch.object(trigger, "fetch_objects", return_value=sources):
+        trigger.resolve_sources(objects)
+
+    new_trigger = FeedConsumptionTrigger(data_path=data_storage)
+    new_trigger.log = trigger.log
+    with patch.object(new_trigger, "fetch_objects") as mock_fetch_objects:
+        new_trigger.resolve_sources([object_factory(11, sources=[source["id"] for source in sources])])
+
+    mock_fetch_objects.assert_not_called()
+
+
+def test_sources_cache_is_bounded(tmp_path):
+    cache = SourcesCache(tmp_path / "sources_cache.json", maxsize=2)
+    cache["source-1"] = {"name": "Source 1"}
+    cache["source-2"] = {"name": "Source 2"}
+
+    # use the first source, so the second one is the least recently used
+    assert cache["source-1"] == {"name": "Source 1"}
+    cache["source-3"] = {"name": "Source 3"}
+
+    assert set(cache) == {"source-1", "source-3"}
+
+
+def test_sources_cache_expiration(tmp_path):
+    cache = SourcesCache(tmp_path / "sources_cache.json", ttl=60)
+    cache["source-1"] = {"name": "Source 1"}
+    cache.save()
+
+    with patch("sekoiaio.triggers.helpers.sources_cache.time.time", return_value=time.time() + 120):
+        assert "source-1" not in cache
+        assert "source-1" not in SourcesCache(tmp_path / "sources_cache.json", ttl=60)
+
+
+def test_next_batch_prefetches_next_page(trigger):
+    with requests_mock.Mocker() as mock_requests:
+        first_page_url = trigger.url
+        mock_requests.get(
+            first_page_url, status_code=200, json={"items": feed_objects["items"], "next_cursor": "abcd"}
+        )
+        mock_requests.get(
+            trigger.url_from_cursor("abcd"), status_code=200, json={"items": ["STIX item"], "next_cursor": "efgh"}
+        )
+
+        trigger.next_batch()
+
+        # the next page is fetched while the first batch is sent
+        assert trigger._prefetched_page is not None
+        trigger._prefetched_page[1].result()
+        assert mock_requests.call_count == 2
+
+        with patch("time.sleep", return_value=None):
+            trigger.next_batch()
+
+        assert mock_requests.call_count == 2
+        assert trigger.send_event.call_count == 2
+        with trigger.context as cache:
+            assert cache["cursors"][trigger.feed_id] == "efgh"
+
+
 def test_next_batch_with_data(trigger):
     with requests_mock.Mocker() as mock_requests:
         mock_requests.get(
@@ -0,0 +1,134 @@
+from threading import Event
+
+import pytest
+import requests
+
+from sekoiaio.triggers.helpers.search_jobs import SearchJobResults, SearchJobScheduler
+
+EVENTS_API = "http://fake.url/api/v1/sic/conf/events"
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = SearchJobScheduler(requests.Session(), EVENTS_API, min_poll_interval=0.01, max_poll_interval=0.05)
+    yield scheduler
+    scheduler.stop()
+
+
+def test_search_job_results(scheduler, requests_mock):
+    """Test that the results are collected once the job is completed."""
+    requests_mock.get(
+        f"{EVENTS_API}/search/jobs/job-1",
+        [{"json": {"status": 0}}, {"json": {"status": 1}}, {"json": {"status": 2}}],
+    )
+    requests_mock.get(
+        f"{EVENTS_API}/search/jobs/job-1/events",
+        json={"items": [{"uuid": "event-0"}, {"uuid": "event-1"}], "total": 2},
+    )
+
+    results = scheduler.submit("job-1").result(timeout=5)
+
+    assert results == SearchJobResults(events=[{"uuid": "event-0"}, {"uuid": "event-1"}], total=2)
+    assert scheduler.pending_jobs == 0
+
+
+def test_search_job_empty_results(scheduler, requests_mock):
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 2})
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1/events", json={"items": [], "total": 0})
+
+    assert scheduler.submit("job-1").result(timeout=5) == SearchJobResults(events=[], total=0)
+
+
+def test_search_job_results_pagination(scheduler, requests_mock):
+    """Test that the pages of results are fetched and reassembled in order."""
+    events = [{"uuid": f"event-{i}"} for i in range(250)]
+
+    def get_page(request, context):
+        offset = int(request.qs["offset"][0])
+        limit = int(request.qs["limit"][0])
+        return {"items": events[offset : offset + limit], "total": len(events)}
+
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 2})
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1/events", json=get_page)
+
+    results = scheduler.submit("job-1", page_size=100).result(timeout=5)
+
+    assert results.events == events
+    offsets = sorted(
+        int(request.qs["offset"][0]) for request in requests_mock.request_history if "offset" in request.qs
+    )
+    assert offsets == [0, 100, 200]
+
+
+def test_search_job_first_page_only(scheduler, requests_mock):
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 2})
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1/events", json={"items": [{"uuid": "event-0"}], "total": 250})
+
+    results = scheduler.submit("job-1", page_size=1, all_pages=False).result(timeout=5)
+
+    assert results == SearchJobResults(events=[{"uuid": "event-0"}], total=250)
+    assert requests_mock.call_count == 2
+
+
+def test_search_jobs_are_polled_together(scheduler, requests_mock):
+    """Test that several outstanding jobs are tracked at the same time and each one completes."""
+    for index in range(5):
+        requests_mock.get(
+            f"{EVENTS_API}/search/jobs/job-{index}",
+            [{"json": {"status": 1}}] * (index + 1) + [{"json": {"status": 2}}],
+        )
+        requests_mock.get(
+            f"{EVENTS_API}/search/jobs/job-{index}/events", json={"items": [{"uuid": f"event-{index}"}], "total": 1}
+        )
+
+    futures = [scheduler.submit(f"job-{index}") for index in range(5)]
+
+    assert [future.result(timeout=5).events for future in futures] == [
+        [{"uuid": f"event-{index}"}] for index in range(5)
+    ]
+
+
+def test_search_job_completion_callback(scheduler, requests_mock):
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 2})
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1/events", json={"items": [{"uuid": "event-0"}], "total": 1})
+
+    delivered = []
+    called = Event()
+
+    def on_complete(results):
+        delivered.append(results)
+        called.set()
+
+    scheduler.submit("job-1", on_complete=on_complete)
+
+    assert called.wait(timeout=5)
+    assert delivered == [SearchJobResults(events=[{"uuid": "event-0"}], total=1)]
+
+
+def test_search_job_timeout(requests_mock):
+    scheduler = SearchJobScheduler(
+        requests.Session(), EVENTS_API, min_poll_interval=0.01, max_poll_interval=0.01, timeout=0.1
+    )
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 0})
+
+    try:
+        assert scheduler.submit("job-1").result(timeout=5) is None
+    finally:
+        scheduler.stop()
+
+
+def test_search_job_failure(scheduler, requests_mock):
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", status_code=500)
+
+    assert scheduler.submit("job-1").result(timeout=5) is None
+    assert scheduler.pending_jobs == 0
+
+
+def test_stop_fails_outstanding_jobs(requests_mock):
+    scheduler = SearchJobScheduler(requests.Session(), EVENTS_API, min_poll_interval=10)
+    requests_mock.get(f"{EVENTS_API}/search/jobs/job-1", json={"status": 1})
+
+    future = scheduler.submit("job-1")
+    scheduler.stop()
+
+    assert future.result(timeout=5) is None
@@ -1,6 +1,8 @@
+import multiprocessing
 import signal
 import time
 import zlib
+from concurrent.futures import ProcessPoolExecutor
 
 import certifi
 import orjson
@@ -17,11 +19,51 @@ class DeepVisibilityTriggerSetting(DefaultConnectorConfiguration):
     password: str
     group_id: str
     topic: str
+    batch_size: int = 1000
+    batch_timeout: float = 1.0
+    decoding_workers: int = 2
+
+
+def decode_packet(compressed_event: bytes) -> list[str]:
+    """
+    Decompress and decode the given packet, then flatten its events
+
+    Defined at the module level to be run in the decoding processes
+    """
+    raw_event = zlib.decompress(compressed_event)
+    packet = export_pb2.Packet()  # type: ignore
+    packet.ParseFromString(raw_event)
+    meta_dict = MessageToDict(packet.meta)
+
+    events_to_push: list[str] = []
+
+    for evt in packet.events:
+        event_dict = MessageToDict(evt)
+
+        event_to_push: dict = {
+            "meta": meta_dict,
+        }
+        # The event dict has only two keys:
+        #   * timestamp: the timestamp value
+        #   * {event_type}: The real event dict
+        event_to_push["timestamp"] = event_dict.pop("timestamp", None)
+        # We now have only one key in the dict, the event one.
+        event_type, event = next(iter(event_dict.items()))
+        event_to_push["event_type"] = event_type
+        # Add the real event details at the root of the event that will be pushed
+        event_to_push.update(event)
+
+        event_str = orjson.dumps(event_to_push).decode("utf-8")
+        events_to_push.append(event_str)
+
+    return events_to_push
 
 
 class DeepVisibilityTrigger(Connector):
     _consumer: Consumer
     _should_stop: bool
+    _decoding_pool: ProcessPoolExecutor | None = None
+    _last_log_at: float = 0.0
     configuration: DeepVisibilityTriggerSetting
 
     def __init__(self, *args, **kwargs) -> None:
@@ -42,6 +84,8 @@ class DeepVisibilityTrigger(Connector):
                 "sasl.password": self.configuration.password,
                 "ssl.ca.location": certifi.where(),
                 "group.id": self.configuration.group_id,
+                # The offsets are committed once the events are pushed to the intake
+                "enable.auto.commit": False,
                 # Disable TLS certificate hostname verification that
                 # is known to break authentication to SentinelOne
                 # Kafka brokers since `librdkafka2`.
@@ -69,42 +113,90 @@ class DeepVisibilityTrigger(Connector):
         self.log(message="SentineOne DeepVisibility Trigger has started.", level="info")
 
         processed_events = 0
-        last_log_at: float = 0.0
 
         self._create_kafka_consumer()
-        while not self._should_stop:
-            processed_events += self._handle_kafka_message(last_log_at)
+        if self.configuration.decoding_workers > 0:
+            # Decode the packets off the GIL. Don't fork the process running the Kafka client threads
+            self._decoding_pool = ProcessPoolExecutor(
+                max_workers=self.configuration.decoding_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        try:
+            while not self._should_stop:
+                processed_events += self._handle_kafka_messages()
+        finally:
+            if self._decoding_pool is not None:
+                self._decoding_pool.shutdown(wait=True, cancel_futures=True)
 
-        self._consumer.commit()
         self._consumer.close()
 
         self.log(message="Trigger has now completed its work.", level="info")
 
-    def _handle_kafka_message(self, last_log_at: float) -> int:
-        message = self._consumer.poll(0)
+    def _decode_packets(self, compressed_events: list[bytes]) -> list[str]:
+        """
+        Decode the packets, in the decoding processes if any, and return their events in order
+        """
+        if self._decoding_pool is None:
+            results = map(decode_packet, compressed_events)
+        else:
+            chunksize = max(1, len(compressed_events) // (self.configuration.decoding_workers * 4))
+            results = self._decoding_pool.map(decode_packet, compressed_events, chunksize=chunksize)
+
+        return [event for events in results for event in events]
+
+    def _handle_kafka_messages(self) -> int:
+        messages = self._consumer.consume(
+            num_messages=self.configuration.batch_size, timeout=self.configuration.batch_timeout
+        )
+
+        compressed_events: list[bytes] = []
+        # first offset of the batch, by partition, to consume the batch again on failure
+        first_offsets: dict[tuple[str, int], int] = {}
+        for message in messages:
+            if message.error():
+                self._logger.error(message.error())
+                continue
+
+            first_offsets.setdefault((message.topic(), message.partition()), message.offset())
+            message_value = message.value()
+            if message_value is not None:
+                compressed_events.append(message_value)
 
-        if message is None:
+        if len(compressed_events) == 0:
             return 0
 
-        if message.error():
-            self._logger.error(message.error())
+        try:
+            events = self._decode_packets(compressed_events)
+            # One push for the whole batch
+            event_ids = self.push_events_to_intakes(events=events)
+        except Exception as exp:
+            self.log_exception(exp, message="Failed to fetch events.")
+            raise exp
+
+        # The intake failures are only logged: don't commit the offsets if some events were not forwarded
+        if len(event_ids) < len(events):
+            self.log(
+                message=f"Only {len(event_ids)} of {len(events)} events were forwarded, consume the batch again",
+                level="error",
+            )
+            self._rewind(first_offsets)
             return 0
 
-        else:
-            try:
-                message_value = message.value()
-                if message_value is not None:
-                    messages = self._process_events(message_value)
-                    self.push_events_to_intakes(events=messages)
-            except Exception as exp:
-                self.log_exception(exp, message="Failed to fetch events.")
-                raise exp
-
-        if time.time() - last_log_at >= 10 * 60:
+        # Commit the offsets only once the events are pushed
+        self._consumer.commit(asynchronous=False)
+
+        if time.time() - self._last_log_at >= 10 * 60:
             self._log_current_lag()
-            last_log_at = time.time()
+            self._last_log_at = time.time()
 
-        return 1
+        return len(compressed_events)
+
+    def _rewind(self, offsets: dict[tuple[str, int], int]) -> None:
+        """
+        Move the consumer back to the given offsets, by partition
+        """
+        for (topic, partition), offset in offsets.items():
+            self._consumer.seek(TopicPartition(topic, partition, offset))
 
     def _log_current_lag(self) -> None:
         """Log the currently observed lag for the configured Kafka
@@ -125,35 +217,3 @@ class DeepVisibilityTrigger(Connector):
     def stop(self, _, __) -> None:
         self.log(message="Asking trigger to stop", level="info")
         self._should_stop = True
-
-    def _process_events(self, compressed_event: bytes) -> list[str]:
-        """
-        Process the given event
-        """
-        raw_event = zlib.decompress(compressed_event)
-        packet = export_pb2.Packet()  # type: ignore
-        packet.ParseFromString(raw_event)
-        meta_dict = MessageToDict(packet.meta)
-
-        events_to_push: list[str] = []
-
-        for evt in packet.events:
-            event_dict = MessageToDict(evt)
-
-            event_to_push: dict = {
-                "meta": meta_dict,
-            }
-            # The event dict has only two keys:
-            #   * timestamp: the timestamp value
-            #   * {event_type}: The real event dict
-            event_to_push["timestamp"] = event_dict.pop("timestamp", None)
-            # We now have only one key in the dict, the event one.
-            event_type, event = next(iter(event_dict.items()))
-            event_to_push["event_type"] = event_type
-            # Add the real event details at the root of the event that will be pushed
-            event_to_push.update(event)
-
-            event_str = orjson.dumps(event_to_push).decode("utf-8")
-            events_to_push.append(event_str)
-
-        return events_to_push
@@ -6165,5 +6165,6 @@ def mocked_kafka_consumer(packet_dict):
     event_mock.value.return_value = zlib.compress(serialized)
 
     consumer.poll.return_value = event_mock
+    consumer.consume.return_value = [event_mock]
 
     yield consumer
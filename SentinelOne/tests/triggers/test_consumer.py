@@ -1,11 +1,14 @@
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime
 from unittest.mock import Mock, patch
 
 import pytest
 from confluent_kafka import TopicPartition
+from tenacity import Retrying, stop_after_attempt
 
-from sentinelone_module.deep_visibility.consumer import DeepVisibilityTrigger
+from sentinelone_module.deep_visibility.consumer import DeepVisibilityTrigger, decode_packet
 
 
 @pytest.fixture
@@ -21,7 +24,7 @@ def trigger(symphony_storage):
         "topic": "topic",
         "intake_key": "intake",
     }
-    trigger.push_events_to_intakes = Mock()
+    trigger.push_events_to_intakes = Mock(side_effect=lambda events: [f"id{index}" for index in range(len(events))])
     trigger.trigger_activation: datetime = datetime.now(UTC)
     yield trigger
 
@@ -57,7 +60,7 @@ def test_consumer_on_revoke(trigger, fake_assignment):
 def test_process_event(trigger, mocked_kafka_consumer):
     trigger._consumer = mocked_kafka_consumer
     trigger._log_current_lag = Mock()
-    count = trigger._handle_kafka_message(last_log_at=0.0)
+    count = trigger._handle_kafka_messages()
     assert count == 1
 
     events = trigger.push_events_to_intakes.call_args.kwargs["events"]
@@ -72,3 +75,76 @@ def test_process_event(trigger, mocked_kafka_consumer):
     assert message["event_type"] == "openProcess"
     assert "source" in message
     assert "target" in message
+
+
+def test_handle_kafka_messages_pushes_batch_then_commits(trigger, mocked_kafka_consumer):
+    event_mock = mocked_kafka_consumer.consume.return_value[0]
+    error_mock = Mock()
+    error_mock.error.return_value = "partition EOF"
+    mocked_kafka_consumer.consume.return_value = [event_mock, error_mock, event_mock, event_mock]
+
+    trigger._consumer = mocked_kafka_consumer
+    trigger._log_current_lag = Mock()
+    calls = Mock()
+    calls.attach_mock(trigger.push_events_to_intakes, "push")
+    calls.attach_mock(mocked_kafka_consumer.commit, "commit")
+
+    assert trigger._handle_kafka_messages() == 3
+
+    # a single push for the whole batch, then the commit of the offsets
+    assert [call[0] for call in calls.mock_calls] == ["push", "commit"]
+    assert len(trigger.push_events_to_intakes.call_args.kwargs["events"]) == 3 * 109
+    assert mocked_kafka_consumer.consume.call_args.kwargs == {"num_messages": 1000, "timeout": 1.0}
+
+
+def test_handle_kafka_messages_does_not_commit_on_failure(trigger, mocked_kafka_consumer):
+    trigger._consumer = mocked_kafka_consumer
+    trigger.log_exception = Mock()
+    trigger.push_events_to_intakes.side_effect = Exception("intake unavailable")
+
+    with pytest.raises(Exception):
+        trigger._handle_kafka_messages()
+
+    assert mocked_kafka_consumer.commit.called is False
+
+
+def test_handle_kafka_messages_does_not_commit_on_intake_error(trigger, mocked_kafka_consumer, requests_mock):
+    # the intake errors are not raised by the connector, only logged
+    del trigger.push_events_to_intakes
+    trigger.configuration.intake_server = "https://intake.fake.url"
+    trigger._retry = lambda: Retrying(stop=stop_after_attempt(1), reraise=True)
+    requests_mock.post("https://intake.fake.url/batch", status_code=503)
+
+    event_mock = mocked_kafka_consumer.consume.return_value[0]
+    event_mock.topic.return_value = "topic"
+    event_mock.partition.return_value = 1
+    event_mock.offset.side_effect = [42, 43]
+    mocked_kafka_consumer.consume.return_value = [event_mock, event_mock]
+    trigger._consumer = mocked_kafka_consumer
+
+    assert trigger._handle_kafka_messages() == 0
+
+    assert requests_mock.called
+    assert mocked_kafka_consumer.commit.called is False
+    # the batch is consumed again
+    mocked_kafka_consumer.seek.assert_called_once_with(TopicPartition("topic", 1, 42))
+
+
+def test_handle_kafka_messages_without_messages(trigger, mocked_kafka_consumer):
+    mocked_kafka_consumer.consume.return_value = []
+    trigger._consumer = mocked_kafka_consumer
+
+    assert trigger._handle_kafka_messages() == 0
+    assert trigger.push_events_to_intakes.called is False
+    assert mocked_kafka_consumer.commit.called is False
+
+
+def test_decode_packets_in_processes(trigger, mocked_kafka_consumer):
+    compressed_event = mocked_kafka_consumer.consume.return_value[0].value()
+    expected = decode_packet(compressed_event)
+
+    trigger._decoding_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        assert trigger._decode_packets([compressed_event, compressed_event]) == expected + expected
+    finally:
+        trigger._decoding_pool.shutdown()
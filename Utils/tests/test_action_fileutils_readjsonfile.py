@@ -8,6 +8,7 @@ from tempfile import mkdtemp
 
 # third parties
 import pytest
+from sekoia_automation.exceptions import MissingActionArgumentFileError
 
 # internals
 from utils.action_fileutils_readjsonfile import FileUtilsReadJSONFile
@@ -136,3 +137,62 @@ def _test_read_json_file_match_to_file(symphony_storage, sample_object, is_json=
     with output_path.open() as fp:
         content = fp.read() if not is_json else json.load(fp)
         assert content == sample_object["a"][0]["b"]
+
+
+@pytest.mark.parametrize(
+    "jsonpath,return_list",
+    [
+        ("$.a[*].b", False),
+        ("$.a[0].b", False),
+        ("$.a[0].b", True),
+        ("$.a[?(@.b > 1)]", False),
+        ("$.a[?(@.b > 1)].c", False),
+        ("$.b", False),
+        ("$.b", True),
+        ("$", False),
+    ],
+)
+def test_readjsonfile_stream(symphony_storage, jsonpath, return_list):
+    sample_object = {"a": [{"b": 1, "c": "2"}, "d", {"b": 3, "c": 4.5}, {"b": 5}]}
+
+    filepath = symphony_storage / str(uuid.uuid4())
+
+    with filepath.open("w") as fd:
+        json.dump(sample_object, fd)
+
+    action = FileUtilsReadJSONFile(data_path=symphony_storage)
+    expected = action.run({"file_path": filepath, "jsonpath": jsonpath, "return_list": return_list})
+    results = action.run({"file_path": filepath, "jsonpath": jsonpath, "return_list": return_list, "stream": True})
+
+    assert results == expected
+
+    results = action.run(
+        {"file_path": filepath, "jsonpath": jsonpath, "return_list": return_list, "stream": True, "to_file": True}
+    )
+
+    output_path = symphony_storage / results["output_path"]
+    with output_path.open() as fp:
+        assert json.load(fp) == expected["output"]
+
+
+def test_readjsonfile_stream_string_match_to_file(symphony_storage):
+    sample_object = {"a": [{"b": "mymatch", "c": "2"}, "d"]}
+
+    filepath = symphony_storage / str(uuid.uuid4())
+
+    with filepath.open("w") as fd:
+        json.dump(sample_object, fd)
+
+    action = FileUtilsReadJSONFile(data_path=symphony_storage)
+    results = action.run({"file_path": filepath, "jsonpath": "$.a[*].b", "to_file": True, "stream": True})
+
+    output_path = symphony_storage / results["output_path"]
+    with output_path.open() as fp:
+        assert fp.read() == "mymatch"
+
+
+def test_readjsonfile_stream_missing_file(symphony_storage):
+    action = FileUtilsReadJSONFile(data_path=symphony_storage)
+
+    with pytest.raises(MissingActionArgumentFileError):
+        action.run({"file_path": str(uuid.uuid4()), "jsonpath": "$.a", "stream": True})
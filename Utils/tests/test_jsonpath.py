@@ -0,0 +1,71 @@
+import io
+
+import orjson
+import pytest
+
+from utils.jsonpath import StreamedJSONPath, compile_jsonpath, compile_streamed_jsonpath, iter_jsonpath_matches
+
+
+def test_compile_jsonpath_is_cached():
+    assert compile_jsonpath("$.a[*].b") is compile_jsonpath("$.a[*].b")
+    assert compile_streamed_jsonpath("$.a[*].b") is compile_streamed_jsonpath("$.a[*].b")
+
+
+@pytest.mark.parametrize(
+    "expression,prefix,has_remainder,filter_items",
+    [
+        ("$", "", False, False),
+        ("$.a.b[*].c", "a.b.item.c", False, False),
+        ("$.a[?(@.x == 1)]", "a.item", True, True),
+        ("$.a[?(@.x == 1)].c", "a.item", True, True),
+        ("$.a[0].b", "a", True, False),
+        ("$.a.*", "a", True, False),
+        ('$."a.b"[*]', "", True, False),
+        ("$.item", "", True, False),
+    ],
+)
+def test_compile_streamed_jsonpath(expression, prefix, has_remainder, filter_items):
+    streamed = compile_streamed_jsonpath(expression)
+
+    assert isinstance(streamed, StreamedJSONPath)
+    assert streamed.prefix == prefix
+    assert (streamed.remainder is not None) == has_remainder
+    assert streamed.filter_items == filter_items
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "$",
+        "$.events[*].id",
+        "$.events[*].tags[*]",
+        "$.events[?(@.severity >= 3)]",
+        "$.events[?(@.severity >= 3)].id",
+        "$.events[1].id",
+        "$.events[*].source.*",
+        '$."a.b"',
+        "$.missing",
+    ],
+)
+def test_iter_jsonpath_matches(expression):
+    content = {
+        "events": [
+            {"id": "1", "severity": 1, "score": 0.5, "tags": ["a", "b"], "source": {"ip": "1.2.3.4"}},
+            {"id": "2", "severity": 4, "score": 1.25, "tags": [], "source": {"ip": "5.6.7.8"}},
+            {"id": "3", "severity": 3, "tags": ["c"]},
+        ],
+        "a.b": {"c": None},
+    }
+
+    matches = list(iter_jsonpath_matches(io.BytesIO(orjson.dumps(content)), expression))
+
+    assert matches == [match.value for match in compile_jsonpath(expression).find(content)]
+
+
+def test_iter_jsonpath_matches_is_incremental():
+    content = b'{"events": [{"id": 1}, {"id": 2}, INVALID'
+
+    matches = iter_jsonpath_matches(io.BytesIO(content), "$.events[*].id")
+
+    assert next(matches) == 1
+    assert next(matches) == 2
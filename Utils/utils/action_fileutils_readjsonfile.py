@@ -1,12 +1,17 @@
 # third parties
+import itertools
+from collections.abc import Iterator
 from typing import Any
 from uuid import uuid4
 
 import orjson
-from jsonpath_ng.ext import parse
 
 # internals
-from sekoia_automation.action import Action
+from sekoia_automation.action import Action, MissingActionArgumentFileError
+
+from utils.jsonpath import compile_jsonpath, iter_jsonpath_matches
+
+_NO_MATCH = object()
 
 
 class FileUtilsReadJSONFile(Action):
@@ -16,25 +21,71 @@ class FileUtilsReadJSONFile(Action):
     If no jsonpath is specified, the file content is returned.
     If a jsonpath is specified it returns either the single object that matched with
     the jsonpath or a list with all the matches.
+
+    With `stream`, the jsonpath is evaluated while the file is read, so the file is never
+    loaded in memory, and the matches are written to the output file as they are found.
     """
 
     def run(self, arguments):
+        if arguments.get("stream", False) and arguments.get("jsonpath") is not None and arguments.get("file") is None:
+            return self._run_stream(arguments)
+
         result = None
         content = self.json_argument("file", arguments)
 
         if arguments.get("jsonpath") is not None:
-            matched_values = [match.value for match in parse(arguments["jsonpath"]).find(content)]
-
-            return_list = arguments.get("return_list", False)
-            if len(matched_values) == 1 and not return_list:
-                result = matched_values[0]
-            elif len(matched_values) > 1 or return_list:
-                result = matched_values
+            matched_values = [match.value for match in compile_jsonpath(arguments["jsonpath"]).find(content)]
+            result = self._select_result(matched_values, arguments.get("return_list", False))
         else:
             result = content
 
         return self._send_result(result, arguments)
 
+    @staticmethod
+    def _select_result(matched_values: list, return_list: bool) -> Any:
+        if len(matched_values) == 1 and not return_list:
+            return matched_values[0]
+        elif len(matched_values) > 1 or return_list:
+            return matched_values
+
+        return None
+
+    def _run_stream(self, arguments: dict):
+        filepath = self._data_path.joinpath(arguments["file_path"])
+        if not filepath.is_file():
+            raise MissingActionArgumentFileError(filepath)
+
+        return_list = arguments.get("return_list", False)
+        with filepath.open("rb") as f:
+            matches = iter_jsonpath_matches(f, arguments["jsonpath"])
+
+            if not arguments.get("to_file", False):
+                return self._send_result(self._select_result(list(matches), return_list), arguments)
+
+            first_match = next(matches, _NO_MATCH)
+            second_match = next(matches, _NO_MATCH)
+            if second_match is _NO_MATCH and not return_list:
+                # a single match is written as is
+                return self._send_result(None if first_match is _NO_MATCH else first_match, arguments)
+
+            head = [match for match in (first_match, second_match) if match is not _NO_MATCH]
+            return self._write_matches(itertools.chain(head, matches))
+
+    def _write_matches(self, matches: Iterator[Any]):
+        """
+        Write the matches to the output file as a list, one match at a time
+        """
+        filename = f"output-{uuid4()}.json"
+        with self._data_path.joinpath(filename).open("wb") as f:
+            f.write(b"[")
+            for index, match in enumerate(matches):
+                if index > 0:
+                    f.write(b",")
+                f.write(orjson.dumps(match))
+            f.write(b"]")
+
+        return {"output_path": filename}
+
     def _send_result(self, result: Any, arguments: dict):
         if not arguments.get("to_file", False):
             return {"output": result}
@@ -0,0 +1,101 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import IO, Any
+
+import ijson
+from jsonpath_ng import JSONPath
+from jsonpath_ng.ext import parse
+from jsonpath_ng.ext.filter import Filter
+from jsonpath_ng.jsonpath import Child, Fields, Root, Slice
+
+
+@lru_cache(maxsize=256)
+def compile_jsonpath(expression: str) -> JSONPath:
+    """
+    Compile the jsonpath expression, once per expression
+    """
+    return parse(expression)
+
+
+@dataclass(frozen=True)
+class StreamedJSONPath:
+    """
+    A jsonpath expression split for an incremental evaluation:
+
+    - `prefix` selects the values while the file is parsed (ijson prefix)
+    - `remainder`, if any, is evaluated against each selected value
+    - if `filter_items`, the values are the items of the selected arrays, each one filtered by the remainder
+    """
+
+    prefix: str
+    remainder: JSONPath | None
+    filter_items: bool
+
+
+def _flatten(expression: JSONPath) -> list[JSONPath]:
+    if isinstance(expression, Child):
+        return _flatten(expression.left) + _flatten(expression.right)
+
+    return [expression]
+
+
+def _prefix_part(node: JSONPath) -> str | None:
+    """
+    Return the ijson prefix part matching the node, if the node only selects a key or the items of an array
+    """
+    if isinstance(node, Slice) and node.start is None and node.end is None and node.step is None:
+        return "item"
+
+    if isinstance(node, Fields) and len(node.fields) == 1:
+        field = node.fields[0]
+        # `item` and the dots are ambiguous in the ijson prefixes
+        if field not in ("*", "item") and "." not in field:
+            return field
+
+    return None
+
+
+@lru_cache(maxsize=256)
+def compile_streamed_jsonpath(expression: str) -> StreamedJSONPath:
+    """
+    Compile the jsonpath expression for an incremental evaluation, once per expression
+
+    The leading keys and `[*]` of the expression are matched while the file is parsed.
+    Filters are evaluated on each item of the array, so only one item is kept in memory at a time.
+    """
+    nodes = _flatten(compile_jsonpath(expression))
+    if isinstance(nodes[0], Root):
+        nodes = nodes[1:]
+
+    parts: list[str] = []
+    while nodes and (part := _prefix_part(nodes[0])) is not None:
+        parts.append(part)
+        nodes = nodes[1:]
+
+    filter_items = bool(nodes) and isinstance(nodes[0], Filter)
+    if filter_items:
+        parts.append("item")
+
+    remainder: JSONPath | None = None
+    for node in nodes:
+        remainder = node if remainder is None else Child(remainder, node)
+
+    return StreamedJSONPath(prefix=".".join(parts), remainder=remainder, filter_items=filter_items)
+
+
+def iter_jsonpath_matches(file: IO[bytes], expression: str) -> Iterator[Any]:
+    """
+    Evaluate the jsonpath expression while the JSON file is parsed, and yield the matched values as they are found
+
+    Unlike the evaluation on the loaded content, `[*]` and filters only iterate over arrays.
+    """
+    streamed = compile_streamed_jsonpath(expression)
+
+    for value in ijson.items(file, streamed.prefix, use_float=True):
+        if streamed.remainder is None:
+            yield value
+        else:
+            data = [value] if streamed.filter_items else value
+            for match in streamed.remainder.find(data):
+                yield match.value
@@ -1,5 +1,8 @@
+from unittest.mock import AsyncMock
+
 import pytest
 from aioresponses import aioresponses
+from yarl import URL
 
 from wiz import WizConnectorConfig, WizModule
 from wiz.wiz_vulnerability_findings_connector import WizVulnerabilityFindingsConnector
@@ -76,3 +79,60 @@ async def test_wiz_vulnerability_findings_connector_with_duplicates(
         )
 
         await wiz_vulnerability_findings_connector._wiz_gql_client.close()
+
+
+@pytest.mark.asyncio
+async def test_wiz_vulnerability_findings_connector_page_size(
+    auth_url,
+    tenant_url,
+    wiz_vulnerability_findings_connector,
+    vulnerability_findings_response_with_next_page,
+    vulnerability_findings_response,
+    http_token,
+):
+    wiz_vulnerability_findings_connector.configuration.page_size = 500
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.post(auth_url, status=200, payload=http_token.dict())
+        mocked_responses.post(
+            tenant_url + "graphql", status=200, payload={"data": vulnerability_findings_response_with_next_page}
+        )
+        mocked_responses.post(tenant_url + "graphql", status=200, payload={"data": vulnerability_findings_response})
+
+        await wiz_vulnerability_findings_connector.single_run()
+
+        requests = mocked_responses.requests[("POST", URL(tenant_url + "graphql"))]
+        assert [request.kwargs["json"]["variables"]["limit"] for request in requests] == [500, 500]
+        assert requests[1].kwargs["json"]["variables"]["after"] == (
+            vulnerability_findings_response_with_next_page["vulnerabilityFindings"]["pageInfo"]["endCursor"]
+        )
+
+        await wiz_vulnerability_findings_connector._wiz_gql_client.close()
+
+
+@pytest.mark.asyncio
+async def test_wiz_vulnerability_findings_connector_checkpoint_after_push(
+    auth_url,
+    tenant_url,
+    wiz_vulnerability_findings_connector,
+    vulnerability_findings_response_with_next_page,
+    vulnerability_findings_response,
+    http_token,
+):
+    previous_offset = wiz_vulnerability_findings_connector.last_event_date.offset
+    wiz_vulnerability_findings_connector.push_data_to_intakes = AsyncMock(side_effect=Exception("intake error"))
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.post(auth_url, status=200, payload=http_token.dict())
+        mocked_responses.post(
+            tenant_url + "graphql", status=200, payload={"data": vulnerability_findings_response_with_next_page}
+        )
+        mocked_responses.post(tenant_url + "graphql", status=200, payload={"data": vulnerability_findings_response})
+
+        with pytest.raises(Exception, match="intake error"):
+            await wiz_vulnerability_findings_connector.single_run()
+
+        # the page was not pushed, so the checkpoint did not move
+        assert wiz_vulnerability_findings_connector.last_event_date.offset == previous_offset
+
+        await wiz_vulnerability_findings_connector._wiz_gql_client.close()
@@ -14,7 +14,7 @@ from sekoia_automation.checkpoint import CheckpointDatetime
 from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
 from sekoia_automation.module import Module
 
-from wiz.client.gql_client import WizErrors, WizGqlClient, WizResult, WizServerError
+from wiz.client.gql_client import DEFAULT_PAGE_SIZE, WizErrors, WizGqlClient, WizResult, WizServerError
 from wiz.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 
 
@@ -43,6 +43,7 @@ class WizConnectorConfig(DefaultConnectorConfiguration):
     """WizConnector configuration."""
 
     frequency: int = 60
+    page_size: int = DEFAULT_PAGE_SIZE
 
 
 class WizConnector(AsyncConnector, ABC):
@@ -99,28 +100,40 @@ class WizConnector(AsyncConnector, ABC):
         """
         _previous_last_event_date = self.last_event_date.offset
 
-        has_next_page = True
-        end_cursor: str | None = None
-
         total_events = 0
 
-        while has_next_page:
-            result = await self.get_events(start_date=_previous_last_event_date, cursor=end_cursor)
+        # The next page is requested while the current one is pushed
+        next_page: asyncio.Task[Result] | None = asyncio.create_task(
+            self.get_events(start_date=_previous_last_event_date, cursor=None)
+        )
 
-            # Push the collected events
-            pushed_events = await self.push_data_to_intakes(
-                [
-                    orjson.dumps(event).decode("utf-8")
-                    for event in filter_collected_events(result.data, lambda event: event["id"], self.events_cache)
-                ]
-            )
+        try:
+            while next_page is not None:
+                result = await next_page
+
+                next_page = None
+                if result.has_next_page:
+                    next_page = asyncio.create_task(
+                        self.get_events(start_date=_previous_last_event_date, cursor=result.end_cursor)
+                    )
+
+                # Push the collected events
+                pushed_events = await self.push_data_to_intakes(
+                    [
+                        orjson.dumps(event).decode("utf-8")
+                        for event in filter_collected_events(result.data, lambda event: event["id"], self.events_cache)
+                    ]
+                )
 
-            self.last_event_date.offset = result.new_last_event_date
+                # Only move the checkpoint once the page was pushed
+                self.last_event_date.offset = result.new_last_event_date
 
-            total_events += len(pushed_events)
+                total_events += len(pushed_events)
 
-            has_next_page = result.has_next_page
-            end_cursor = result.end_cursor
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
 
         return total_events
 
@@ -12,6 +12,8 @@ from pydantic import BaseModel
 
 from wiz.client.token_refresher import WizTokenRefresher
 
+DEFAULT_PAGE_SIZE = 100
+
 
 class WizResult(BaseModel):
     end_cursor: str | None
@@ -122,7 +124,7 @@ class WizGqlClient(object):
 
                 yield Client(transport=transport, execute_timeout=self.timeout)
 
-    async def request(self, query: str, variable_values: dict[str, str | None] | None = None) -> dict[str, Any]:
+    async def request(self, query: str, variable_values: dict[str, Any] | None = None) -> dict[str, Any]:
         async with self._session() as session:
             try:
                 result: dict[str, Any] = await session.execute_async(gql(query), variable_values=variable_values)
@@ -144,7 +146,9 @@ class WizGqlClient(object):
 
             return result
 
-    async def get_audit_logs(self, start_date: datetime, after: str | None = None) -> WizResult:
+    async def get_audit_logs(
+        self, start_date: datetime, after: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> WizResult:
         query = """
             query AuditLogTable($after: String, $startDateTime: DateTime, $limit: Int = 100) {
                 auditLogEntries(
@@ -185,6 +189,7 @@ class WizGqlClient(object):
         variable_values = {
             "after": after,
             "startDateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "limit": limit,
         }
 
         response = await self.request(query, variable_values=variable_values)
@@ -194,7 +199,9 @@ class WizGqlClient(object):
 
         return WizResult.from_audit_logs_response(response)
 
-    async def get_alerts(self, start_date: datetime, after: str | None = None) -> WizResult:
+    async def get_alerts(
+        self, start_date: datetime, after: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> WizResult:
         query = """
             query ListIssues($after: String, $startDateTime: DateTime, $limit: Int = 100) {
               issuesV2(
@@ -287,6 +294,7 @@ class WizGqlClient(object):
         variable_values = {
             "after": after,
             "startDateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "limit": limit,
         }
 
         response = await self.request(query, variable_values=variable_values)
@@ -296,7 +304,9 @@ class WizGqlClient(object):
 
         return WizResult.from_alerts_response(response)
 
-    async def get_cloud_configuration_findings(self, start_date: datetime, after: str | None = None) -> WizResult:
+    async def get_cloud_configuration_findings(
+        self, start_date: datetime, after: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> WizResult:
         query = """
               query ListCloudConfigurationFindings(
                 $after: String,
@@ -388,6 +398,7 @@ class WizGqlClient(object):
         variable_values = {
             "after": after,
             "startDateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "limit": limit,
         }
 
         response = await self.request(query, variable_values=variable_values)
@@ -397,7 +408,9 @@ class WizGqlClient(object):
 
         return WizResult.from_cloud_configuration_findings_response(response)
 
-    async def get_vulnerability_findings(self, start_date: datetime, after: str | None = None) -> WizResult:
+    async def get_vulnerability_findings(
+        self, start_date: datetime, after: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> WizResult:
         query = """
             query ListVulnerabilityFindings(
                 $after: String,
@@ -576,6 +589,7 @@ class WizGqlClient(object):
         variable_values = {
             "after": after,
             "startDateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "limit": limit,
         }
 
         response = await self.request(query, variable_values=variable_values)
@@ -585,7 +599,9 @@ class WizGqlClient(object):
 
         return WizResult.from_vulnerability_findings_response(response)
 
-    async def get_threat_detections(self, start_date: datetime, after: str | None = None) -> WizResult:
+    async def get_threat_detections(
+        self, start_date: datetime, after: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> WizResult:
         query = """
             query ListDetection(
                 $after: String,
@@ -727,6 +743,7 @@ class WizGqlClient(object):
         variable_values = {
             "after": after,
             "startDateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "limit": limit,
         }
 
         response = await self.request(query, variable_values=variable_values)
@@ -17,6 +17,7 @@ class WizAuditLogsConnector(WizConnector):
         response = await self.wiz_gql_client.get_audit_logs(
             start_date=start_date,
             after=cursor,
+            limit=self.configuration.page_size,
         )
 
         audit_logs: list[dict[str, Any]] = response.result
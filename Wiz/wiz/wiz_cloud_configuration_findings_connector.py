@@ -17,6 +17,7 @@ class WizCloudConfigurationFindingsConnector(WizConnector):
         response = await self.wiz_gql_client.get_cloud_configuration_findings(
             start_date=start_date,
             after=cursor,
+            limit=self.configuration.page_size,
         )
 
         findings: list[dict[str, Any]] = response.result
@@ -17,6 +17,7 @@ class WizIssuesConnector(WizConnector):
         response = await self.wiz_gql_client.get_alerts(
             start_date=start_date,
             after=cursor,
+            limit=self.configuration.page_size,
         )
 
         alerts: list[dict[str, Any]] = response.result
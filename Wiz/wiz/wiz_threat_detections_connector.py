@@ -17,6 +17,7 @@ class WizThreatDetectionsConnector(WizConnector):
         response = await self.wiz_gql_client.get_threat_detections(
             start_date=start_date,
             after=cursor,
+            limit=self.configuration.page_size,
         )
 
         threat_detections: list[dict[str, Any]] = response.result
@@ -17,6 +17,7 @@ class WizVulnerabilityFindingsConnector(WizConnector):
         response = await self.wiz_gql_client.get_vulnerability_findings(
             start_date=start_date,
             after=cursor,
+            limit=self.configuration.page_size,
         )
 
         findings: list[dict[str, Any]] = response.result